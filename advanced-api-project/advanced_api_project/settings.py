@@ -10,11 +10,18 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
+import sys
+from importlib.util import find_spec
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# the shared apps at the repository root (request_metrics)
+if str(BASE_DIR.parent) not in sys.path:
+    sys.path.append(str(BASE_DIR.parent))
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
@@ -40,25 +47,55 @@ INSTALLED_APPS = [
     'rest_framework',
     'api',
     'rest_framework.authtoken',
+    'request_metrics',
 ]
 
 REST_FRAMEWORK = {
+    # session first so unauthenticated requests keep getting 403, not 401
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
-    ]
-
-}
-
-REST_FRAMEWORK = {
+        'rest_framework.authentication.SessionAuthentication',
+        'api.authentication.CachingTokenAuthentication',
+        'rest_framework.authentication.BasicAuthentication',
+    ],
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
         'rest_framework.filters.SearchFilter',
         'rest_framework.filters.OrderingFilter',
-    ]
+    ],
+    # picked by the Accept header (or ?format=json|msgpack)
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.OrJSONRenderer',
+        'api.renderers.MessagePackRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    # sliding-window limits for views with a throttle_scope (api/throttling.py);
+    # rates are '<scope>_token' (per token/user) and '<scope>_ip' (per client IP)
+    'DEFAULT_THROTTLE_CLASSES': [
+        'api.throttling.TokenRateThrottle',
+        'api.throttling.IPRateThrottle',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'write_token': '120/min',
+        'write_ip': '600/min',
+        'register_ip': '20/hour',
+        'login_ip': '30/min',
+    },
 }
 
+# where the throttle counters live: api.throttling.LocalCounters (this process)
+# or api.throttling.CacheCounters (the API_THROTTLE_CACHE cache, shared when it
+# is redis/memcached)
+API_THROTTLE_BACKEND = 'api.throttling.LocalCounters'
+API_THROTTLE_CACHE = 'default'
+
+# token -> user lookups cached per process (see api/authentication.py)
+TOKEN_AUTH_CACHE_SIZE = 10000
+TOKEN_AUTH_CACHE_TTL = 60
+
 
 MIDDLEWARE = [
+    # first, so its timings cover every other middleware too
+    'request_metrics.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -95,13 +132,77 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # a file rather than sqlite's shared in-memory database, so the
+        # concurrency tests' threads wait for the write lock instead of
+        # failing with "database table is locked"
+        'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
     }
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# locmem is per process; in production point this at redis so every
+# worker shares the book list cache and its version counters, e.g.
+#   'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+#   'LOCATION': 'redis://127.0.0.1:6379',
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# seconds a cached book list response may live; writes invalidate it earlier
+BOOK_LIST_CACHE_TIMEOUT = 300
+
+# paginated book list counts: exact up to this many rows...
+BOOK_LIST_EXACT_COUNT_LIMIT = 10000
+# ...estimated from database statistics above this many...
+BOOK_LIST_ESTIMATE_COUNT_OVER = 1000000
+# ...and counted once, then cached until a book or author changes, in between
+BOOK_LIST_COUNT_CACHE_TIMEOUT = 300
+
+# also treat titles that differ only in case, spacing or unicode form as
+# duplicates (unique Book.title_key); run `manage.py sync_book_title_keys`
+# after changing it
+BOOK_UNIQUE_NORMALIZED_TITLE = False
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
+# Password hashing
+# one list of hashers per profile; the first one hashes new passwords,
+# the rest can still check older hashes (and get rehashed on login).
+# 'prod' needs argon2-cffi and falls back to PBKDF2 without it;
+# 'fast' is plain MD5, for the test suite and the benchmarks only.
+PASSWORD_HASHER_PROFILES = {
+    'prod': [
+        'api.hashers.TunedArgon2PasswordHasher',
+        'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+        'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+        'django.contrib.auth.hashers.ScryptPasswordHasher',
+    ],
+    'fast': [
+        'django.contrib.auth.hashers.MD5PasswordHasher',
+    ],
+}
+if find_spec('argon2') is None:
+    PASSWORD_HASHER_PROFILES['prod'].remove('api.hashers.TunedArgon2PasswordHasher')
+
+# PASSWORD_HASHER_PROFILE=fast|prod in the environment, else fast for `manage.py test`
+PASSWORD_HASHER_PROFILE = os.environ.get('PASSWORD_HASHER_PROFILE') or (
+    'fast' if sys.argv[1:2] == ['test'] else 'prod'
+)
+PASSWORD_HASHERS = PASSWORD_HASHER_PROFILES[PASSWORD_HASHER_PROFILE]
+
+# Argon2 cost for the prod profile: ~46 MiB and one pass (OWASP's baseline);
+# raising them rehashes each password on its owner's next login
+ARGON2_TIME_COST = 1
+ARGON2_MEMORY_COST = 47104
+ARGON2_PARALLELISM = 1
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -21,4 +21,5 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path("api/", include("api.urls")),
     path('api/auth/', include("api.urls")),
+    path('metrics/', include('request_metrics.urls')),
 ]
@@ -0,0 +1,87 @@
+import json
+
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from .models import Book
+
+# same shape as BookSerializer: author is the author's id
+FIELDS = ('id', 'title', 'publication_year', 'author_id')
+KEYS = ('id', 'title', 'publication_year', 'author')
+ORDERINGS = {'title', '-title', 'publication_year', '-publication_year'}
+MAX_LIMIT = getattr(settings, 'BOOK_LIST_MAX_PAGE_SIZE', 1000)
+ROWS_PER_CHUNK = 500
+
+
+def filtered_books(params):
+    '''
+    the filters BookListView takes (title, author, publication_year, the
+    legacy year, ordering) plus ?limit=. raises ValueError on a bad number.
+    '''
+    queryset = Book.objects.all()
+    if params.get('title'):
+        queryset = queryset.filter(title=params['title'])
+    if params.get('author'):
+        queryset = queryset.filter(author_id=int(params['author']))
+    for param in ('publication_year', 'year'):
+        if params.get(param):
+            queryset = queryset.filter(publication_year=int(params[param]))
+
+    ordering = params.get('ordering')
+    if ordering in ORDERINGS:
+        prefix = '-' if ordering.startswith('-') else ''
+        queryset = queryset.order_by(ordering, prefix + 'id')
+    else:
+        queryset = queryset.order_by('id')
+
+    if params.get('limit'):
+        limit = int(params['limit'])
+        if limit <= 0:
+            raise ValueError(limit)
+        queryset = queryset[:min(limit, MAX_LIMIT)]
+    return queryset
+
+
+async def stream_json_array(queryset):
+    '''
+    yields a JSON array a few hundred rows at a time while aiterator()
+    fetches them, so the event loop is free between chunks.
+    values() rather than values_list(): its iterable only touches the
+    database once iterated, which aiterator() does in a worker thread
+    '''
+    chunk, first = ['['], True
+    async for row in queryset.values(*FIELDS).aiterator(chunk_size=2000):
+        book = dict(zip(KEYS, (row[field] for field in FIELDS)))
+        chunk.append(('' if first else ',') + json.dumps(book))
+        first = False
+        if len(chunk) >= ROWS_PER_CHUNK:
+            yield ''.join(chunk)
+            chunk = []
+    chunk.append(']')
+    yield ''.join(chunk)
+
+
+@require_GET
+async def book_list(request):
+    '''
+    async, read-only book list for the ASGI app. streams the JSON array
+    instead of building it in memory, and never holds a worker thread
+    while a slow client reads it.
+    '''
+    try:
+        queryset = filtered_books(request.GET)
+    except ValueError:
+        return JsonResponse({'detail': 'author, publication_year, year and limit must be positive numbers.'}, status=400)
+    return StreamingHttpResponse(stream_json_array(queryset), content_type='application/json')
+
+
+@require_GET
+async def book_detail(request, pk):
+    '''
+    async, read-only single book
+    '''
+    try:
+        row = await Book.objects.values_list(*FIELDS).aget(pk=pk)
+    except Book.DoesNotExist:
+        return JsonResponse({'detail': 'No Book matches the given query.'}, status=404)
+    return JsonResponse(dict(zip(KEYS, row)))
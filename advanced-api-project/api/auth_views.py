@@ -5,6 +5,7 @@ from rest_framework.response import Response
 from rest_framework.exceptions import ValidationError
 from rest_framework.views import APIView
 from rest_framework.authtoken.views import ObtainAuthToken
+from rest_framework.settings import api_settings
 from .serializers import UserSerializer
 
 
@@ -17,6 +18,7 @@ class RegisterView(generics.CreateAPIView):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [permissions.AllowAny]
+    throttle_scope = 'register'
 
     def perform_create(self, serializer):
         # save user
@@ -30,6 +32,10 @@ class RegisterView(generics.CreateAPIView):
 class LoginView(ObtainAuthToken):
     '''returns user token wheb correct userame and password are provides
     '''
+    throttle_scope = 'login'
+    # ObtainAuthToken turns throttling off
+    throttle_classes = api_settings.DEFAULT_THROTTLE_CLASSES
+
     def post(self,request, *args, **kwargs):
         response = super().post(request, *args, **kwargs)
         token = Token.objects.get(key=response.data['token'])
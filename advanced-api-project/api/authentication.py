@@ -0,0 +1,93 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework.authentication import TokenAuthentication
+
+
+class TokenCache:
+    '''
+    bounded, thread-safe LRU of token key -> (user, token) with a TTL.
+
+    it lives in process memory, so an eviction in one worker does not reach
+    the others: the TTL is what bounds staleness across processes.
+    '''
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        # bumped by every invalidation, so a lookup that raced with one
+        # doesn't put the stale row back
+        self.generation = 0
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires, user, token = entry
+            if expires < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return user, token
+
+    def set(self, key, user, token, generation):
+        if self.maxsize <= 0:
+            return
+        with self.lock:
+            if generation != self.generation:
+                return
+            self.entries[key] = (time.monotonic() + self.ttl, user, token)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, key):
+        with self.lock:
+            self.generation += 1
+            self.entries.pop(key, None)
+
+    def invalidate_user(self, user_id):
+        with self.lock:
+            self.generation += 1
+            for key in [k for k, (_, user, _) in self.entries.items() if user.pk == user_id]:
+                del self.entries[key]
+
+    def clear(self):
+        with self.lock:
+            self.generation += 1
+            self.entries.clear()
+
+
+token_cache = TokenCache(
+    maxsize=getattr(settings, 'TOKEN_AUTH_CACHE_SIZE', 10000),
+    ttl=getattr(settings, 'TOKEN_AUTH_CACHE_TTL', 60),
+)
+
+
+class CachingTokenAuthentication(TokenAuthentication):
+    '''
+    TokenAuthentication that remembers token -> user lookups in `token_cache`,
+    so repeat requests with the same token skip the authtoken_token/auth_user
+    query. entries are dropped when the token is deleted (logout) or the
+    user is saved or deleted, see api/signals.py.
+    '''
+
+    def authenticate_credentials(self, key):
+        cached = token_cache.get(key)
+        if cached is not None:
+            user, token = cached
+        else:
+            generation = token_cache.generation
+            user, token = super().authenticate_credentials(key)
+            token_cache.set(key, user, token, generation)
+
+        # hand each request its own copies so nothing leaks between requests
+        user, token = copy.copy(user), copy.copy(token)
+        token.user = user
+        return user, token
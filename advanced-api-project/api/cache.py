@@ -0,0 +1,145 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.response import Response
+
+from .conditional import not_modified, set_validators
+
+VERSION_KEY = 'api:version:%s'
+STATS_KEY = 'api:books:list:%s'
+
+
+def get_version(model_name):
+    '''
+    the current version of `model_name`'s cached rows.
+    a missing counter (never bumped, or evicted) is seeded from the clock,
+    so it never restarts at a number older entries were cached under
+    '''
+    key = VERSION_KEY % model_name
+    version = cache.get(key)
+    if version is None:
+        seed = time.time_ns()
+        cache.add(key, seed, timeout=None)
+        version = cache.get(key, seed)
+    return version
+
+
+def _incr(key):
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # first bump (or the counter was evicted)
+        if cache.add(key, 1, timeout=None):
+            return 1
+        return cache.incr(key)
+
+
+def _bump(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        # evicted: the clock is past every version handed out so far
+        if not cache.add(key, time.time_ns(), timeout=None):
+            cache.incr(key)
+
+
+def bump_version(model_name):
+    '''
+    invalidate every cached response built from `model_name` rows.
+    bumped now and again on commit, so a reader that cached the old rows
+    while our transaction was still open doesn't keep serving them.
+    '''
+    key = VERSION_KEY % model_name
+    _bump(key)
+    transaction.on_commit(lambda: _bump(key))
+
+
+def record(outcome):
+    _incr(STATS_KEY % outcome)
+
+
+def get_stats():
+    return {
+        'hits': cache.get(STATS_KEY % 'hit', 0),
+        'misses': cache.get(STATS_KEY % 'miss', 0),
+        'versions': {name: get_version(name) for name in ('book', 'author')},
+    }
+
+
+def normalized_params(request, exclude=()):
+    '''
+    the query params sorted, with blank values and `exclude`d names dropped
+    '''
+    params = sorted(
+        (key, sorted(value.strip() for value in values if value.strip()))
+        for key, values in request.query_params.lists()
+        if key not in exclude
+    )
+    return [(key, values) for key, values in params if values]
+
+
+# params that change the page, not which rows are in the list
+PAGE_PARAMS = ('cursor', 'page_size', 'ordering', 'fields', 'expand', 'format')
+
+
+def rows_cache_key(request, name):
+    '''
+    one key per set of rows (the params minus PAGE_PARAMS), under the
+    current book and author versions: every page of a list shares it
+    '''
+    raw = str(normalized_params(request, exclude=PAGE_PARAMS))
+    digest = hashlib.md5(raw.encode('utf-8')).hexdigest()
+    return f'api:books:{name}:{get_version("book")}:{get_version("author")}:{digest}'
+
+
+def list_cache_key(request):
+    '''
+    one key per normalized query (sorted params, blank values dropped),
+    media type and host, under the current book and author versions
+    '''
+    params = normalized_params(request)
+    raw = f'{request.get_host()}:{params}:{getattr(request, "accepted_media_type", "")}'
+    digest = hashlib.md5(raw.encode('utf-8')).hexdigest()
+    return f'api:books:list:{get_version("book")}:{get_version("author")}:{digest}'
+
+
+class CachedListMixin:
+    '''
+    caches list responses (ETag + data) in the default cache.
+
+    entries are never deleted: a Book or Author write bumps that model's
+    version, which changes every key, so stale entries just stop being
+    read and expire after BOOK_LIST_CACHE_TIMEOUT.
+    sends X-Cache: HIT / MISS.
+    the ETag aggregate of a miss (ConditionalListMixin.get_list_state) is
+    cached too, shared by every page of the same filtered list.
+    '''
+
+    def get_list_state(self, queryset):
+        # the ETag aggregate scans every matching row, so it's run once per
+        # set of rows and version, not once per page; kept like the count
+        key = rows_cache_key(self.request, 'state')
+        state = cache.get(key)
+        if state is None:
+            state = super().get_list_state(queryset)
+            cache.set(key, state, getattr(settings, 'BOOK_LIST_COUNT_CACHE_TIMEOUT', 300))
+        return state
+
+    def list(self, request, *args, **kwargs):
+        key = list_cache_key(request)
+        entry = cache.get(key)
+        if entry is not None:
+            record('hit')
+            etag, data = entry
+            response = not_modified(request, etag) or set_validators(Response(data), etag)
+        else:
+            record('miss')
+            response = super().list(request, *args, **kwargs)
+            if response.status_code == 200:
+                timeout = getattr(settings, 'BOOK_LIST_CACHE_TIMEOUT', 300)
+                cache.set(key, (response['ETag'], response.data), timeout)
+        response['X-Cache'] = 'HIT' if entry is not None else 'MISS'
+        return response
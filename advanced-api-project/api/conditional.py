@@ -0,0 +1,110 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+
+def make_etag(*parts):
+    '''
+    weak ETag: the payload is the same data, not necessarily the same bytes
+    '''
+    digest = hashlib.md5(':'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+    return 'W/' + quote_etag(digest)
+
+
+def representation_key(request):
+    '''
+    everything besides the data that changes the response body:
+    the query string (filters, search, ordering, cursor) and the media type
+    '''
+    params = sorted((key, sorted(values)) for key, values in request.query_params.lists())
+    return f'{params}:{getattr(request, "accepted_media_type", "")}'
+
+
+def not_modified(request, etag, last_modified=None):
+    '''
+    returns a 304 response if the client's If-None-Match / If-Modified-Since
+    still match, else None
+    '''
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response, etag, last_modified=None):
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    return response
+
+
+class ConditionalListMixin:
+    '''
+    answers conditional GETs on a list view with 304 before serializing.
+
+    the ETag comes from one aggregate query over the filtered queryset:
+    row count + newest updated_at of the books and of their authors.
+    no Last-Modified is sent for lists, because a deleted row lowers the
+    count but can't move max(updated_at) forward.
+    '''
+
+    def get_list_state(self, queryset):
+        '''
+        (count, newest book updated_at, newest author updated_at)
+        '''
+        state = queryset.order_by().aggregate(
+            count=Count('id'),
+            last=Max('updated_at'),
+            author_last=Max('author__updated_at'),
+        )
+        return state['count'], state['last'], state['author_last']
+
+    def get_list_etag(self, queryset):
+        return make_etag(*self.get_list_state(queryset), representation_key(self.request))
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        etag = self.get_list_etag(queryset)
+        response = not_modified(request, etag)
+        if response is not None:
+            return response
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            response = self.get_paginated_response(serializer.data)
+        else:
+            serializer = self.get_serializer(queryset, many=True)
+            response = Response(serializer.data)
+        return set_validators(response, etag)
+
+
+class ConditionalRetrieveMixin:
+    '''
+    answers conditional GETs on a detail view with 304 before serializing,
+    using get_last_modified() (the object's updated_at by default)
+    for both ETag and Last-Modified
+    '''
+
+    def get_last_modified(self, instance):
+        '''
+        newest updated_at of everything in the representation
+        '''
+        return instance.updated_at
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        last_modified = self.get_last_modified(instance)
+        etag = make_etag(instance.pk, last_modified.isoformat(), representation_key(request))
+
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+
+        response = Response(self.get_serializer(instance).data)
+        return set_validators(response, etag, last_modified)
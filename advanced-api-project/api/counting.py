@@ -0,0 +1,75 @@
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+from .cache import rows_cache_key
+
+EXACT = 'exact'
+CACHED = 'cached'
+ESTIMATED = 'estimated'
+
+
+def estimate_count(queryset):
+    '''
+    row estimate from the database's own statistics, or None if it has none.
+    postgres: the planner's row estimate for the query (EXPLAIN).
+    sqlite: only for the unfiltered table, from sqlite_stat1 (run ANALYZE).
+    '''
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        plan = json.loads(queryset.order_by().explain(format='json'))
+        return int(plan[0]['Plan']['Plan Rows'])
+    if connection.vendor == 'sqlite' and not queryset.query.where:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+            )
+            if cursor.fetchone() is None:
+                return None
+            cursor.execute('SELECT stat FROM sqlite_stat1 WHERE tbl = %s', [queryset.model._meta.db_table])
+            row = cursor.fetchone()
+        return int(row[0].split()[0]) if row else None
+    return None
+
+
+class BookListCounter:
+    '''
+    picks how to count a (filtered) book list for the paginator:
+
+    cached     an earlier full COUNT for the same filters, kept until
+               a book or author changes (the cache versions in cache.py)
+    exact      a bounded COUNT finds at most `exact_limit` rows
+    estimated  the database statistics put it above `estimate_over` rows
+
+    anything in between is counted in full, cached, and reported as exact.
+    returns (count, strategy).
+    '''
+    exact_limit = getattr(settings, 'BOOK_LIST_EXACT_COUNT_LIMIT', 10000)
+    estimate_over = getattr(settings, 'BOOK_LIST_ESTIMATE_COUNT_OVER', 1000000)
+    cache_timeout = getattr(settings, 'BOOK_LIST_COUNT_CACHE_TIMEOUT', 300)
+    def get_cache_key(self, request):
+        return rows_cache_key(request, 'count')
+
+    def count(self, queryset, request):
+        queryset = queryset.order_by()
+
+        # only big counts are cached, so a miss is the usual case for small lists
+        key = self.get_cache_key(request)
+        count = cache.get(key)
+        if count is not None:
+            return count, CACHED
+
+        # counts at most exact_limit + 1 rows
+        count = queryset[:self.exact_limit + 1].count()
+        if count <= self.exact_limit:
+            return count, EXACT
+
+        estimate = estimate_count(queryset)
+        if estimate is not None and estimate > self.estimate_over:
+            return estimate, ESTIMATED
+
+        count = queryset.count()
+        cache.set(key, count, self.cache_timeout)
+        return count, EXACT
@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    '''
+    Argon2 with its cost parameters taken from settings (ARGON2_TIME_COST,
+    ARGON2_MEMORY_COST in KiB, ARGON2_PARALLELISM) instead of Django's
+    fixed defaults.
+
+    they are read on every call, and must_update() compares them with the
+    ones stored in the hash, so after changing them each user's password is
+    rehashed with the new ones the next time they log in
+    (User.check_password does the rehash).
+    '''
+
+    @property
+    def time_cost(self):
+        return getattr(settings, 'ARGON2_TIME_COST', 2)
+
+    @property
+    def memory_cost(self):
+        return getattr(settings, 'ARGON2_MEMORY_COST', 102400)
+
+    @property
+    def parallelism(self):
+        return getattr(settings, 'ARGON2_PARALLELISM', 8)
@@ -0,0 +1,72 @@
+from itertools import combinations
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+from api.models import Book
+
+FILTERS = {
+    'title': 'Some Title',
+    'author': 1,
+    'publication_year': 2000,
+}
+
+# (field, id) is what the keyset pagination orders by; plain lists are by id
+ORDERINGS = [
+    ('id',),
+    ('publication_year', 'id'),
+    ('-publication_year', '-id'),
+    ('title', 'id'),
+    ('-title', '-id'),
+]
+
+# plan fragments that mean the database had to read or sort the whole table
+BAD_PLAN_STEPS = ('SCAN api_book', 'USE TEMP B-TREE', 'Seq Scan on api_book', 'Sort')
+
+
+class Command(BaseCommand):
+    help = 'Run EXPLAIN for every filter/ordering combination BookListView supports'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fail', action='store_true', help='exit with an error if a query is not index backed')
+
+    def queries(self):
+        fields = list(FILTERS)
+        for size in range(len(fields) + 1):
+            for combo in combinations(fields, size):
+                for ordering in ORDERINGS:
+                    if not combo and ordering == ('id',):
+                        # listing the whole table is a scan by definition
+                        continue
+                    queryset = Book.objects.filter(**{field: FILTERS[field] for field in combo}).order_by(*ordering)
+                    label = 'filter(%s) order_by(%s)' % (', '.join(combo), ', '.join(ordering))
+                    yield label, queryset
+        for field, value in (('publication_year', 2000), ('title', 'Some Title')):
+            keyset = Q(**{f'{field}__gte': value}) & (Q(**{f'{field}__gt': value}) | Q(id__gt=1))
+            yield f'keyset page after ({field}, id)', Book.objects.filter(keyset).order_by(field, 'id')
+        yield 'duplicate title check', Book.objects.filter(title=FILTERS['title'])
+        yield 'author books prefetch', Book.objects.filter(author__in=[1, 2]).order_by('author', 'id')
+
+    def handle(self, *args, **options):
+        unindexed = []
+        for label, queryset in self.queries():
+            plan = queryset.explain()
+            ok = not any(step in line for line in plan.splitlines() for step in BAD_PLAN_STEPS
+                         if not self.uses_index(line))
+            status = self.style.SUCCESS('index') if ok else self.style.ERROR('NO INDEX')
+            self.stdout.write(f'[{status}] {label}')
+            for line in plan.splitlines():
+                self.stdout.write(f'        {line}')
+            if not ok:
+                unindexed.append(label)
+
+        if unindexed:
+            message = f'{len(unindexed)} quer{"y" if len(unindexed) == 1 else "ies"} not index backed'
+            if options['fail']:
+                raise CommandError(message)
+            self.stdout.write(self.style.WARNING(message))
+        else:
+            self.stdout.write(self.style.SUCCESS('All book queries use an index'))
+
+    @staticmethod
+    def uses_index(line):
+        return 'USING' in line and 'INDEX' in line or 'Index' in line
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from api.stats import rebuild_stats
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute the AuthorStats / YearStats summary tables from the books '
+        '(needed after writes that skip signals, e.g. queryset.update())'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        authors, years = rebuild_stats(options['database'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt book stats: {authors} authors, {years} years'))
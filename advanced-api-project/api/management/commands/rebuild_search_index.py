@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from api.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the book search index (needed after bulk_create/update, which skip signals)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        backend = get_search_backend(options['database'])
+        backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt search index with {type(backend).__name__}'))
@@ -0,0 +1,36 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from api.models import Book, normalize_title
+
+
+class Command(BaseCommand):
+    help = (
+        'Fill (or clear) Book.title_key to match BOOK_UNIQUE_NORMALIZED_TITLE. '
+        'Run it after turning the setting on or off.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if not getattr(settings, 'BOOK_UNIQUE_NORMALIZED_TITLE', False):
+            cleared = Book.objects.exclude(title_key=None).update(title_key=None)
+            self.stdout.write(self.style.SUCCESS(f'Cleared title_key on {cleared} books'))
+            return
+
+        groups = defaultdict(list)
+        for pk, title in Book.objects.values_list('id', 'title').iterator():
+            groups[normalize_title(title)].append(pk)
+        clashes = {key: ids for key, ids in groups.items() if len(ids) > 1}
+        if clashes:
+            for key, ids in sorted(clashes.items())[:20]:
+                self.stderr.write(f'{key!r}: books {ids}')
+            raise CommandError(f'{len(clashes)} normalized titles are used by more than one book; rename them first')
+
+        books = [Book(id=ids[0], title_key=key) for key, ids in groups.items()]
+        with transaction.atomic():
+            Book.objects.bulk_update(books, ['title_key'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Set title_key on {len(books)} books'))
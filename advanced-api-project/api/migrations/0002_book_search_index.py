@@ -0,0 +1,44 @@
+from django.db import migrations
+
+FTS_TABLE = 'api_book_fts'
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            try:
+                cursor.execute(
+                    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(title, author_name, tokenize='trigram')"
+                )
+            except Exception:
+                # sqlite built without FTS5 / trigram (< 3.34): search falls back to icontains
+                return
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, author_name) '
+                'SELECT b.id, b.title, a.name FROM api_book b JOIN api_author a ON a.id = b.author_id'
+            )
+    elif connection.vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS api_book_title_trgm ON api_book USING gin (title gin_trgm_ops)'
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+    elif connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS api_book_title_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
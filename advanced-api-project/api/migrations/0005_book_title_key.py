@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='book',
+            name='title_key',
+            field=models.CharField(blank=True, editable=False, max_length=200, null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_stats(apps, schema_editor):
+    Book = apps.get_model('api', 'Book')
+    AuthorStats = apps.get_model('api', 'AuthorStats')
+    YearStats = apps.get_model('api', 'YearStats')
+    using = schema_editor.connection.alias
+    books = Book.objects.using(using).order_by()
+    AuthorStats.objects.using(using).bulk_create(
+        AuthorStats(author_id=row['author'], book_count=row['count'])
+        for row in books.values('author').annotate(count=Count('id'))
+    )
+    YearStats.objects.using(using).bulk_create(
+        YearStats(year=row['publication_year'], book_count=row['count'])
+        for row in books.values('publication_year').annotate(count=Count('id'))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_book_title_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthorStats',
+            fields=[
+                ('author', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='api.author')),
+                ('book_count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='YearStats',
+            fields=[
+                ('year', models.IntegerField(primary_key=True, serialize=False)),
+                ('book_count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(fill_stats, migrations.RunPython.noop),
+    ]
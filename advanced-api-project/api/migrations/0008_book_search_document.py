@@ -0,0 +1,39 @@
+from django.db import migrations
+
+DOCUMENT_SQL = (
+    "setweight(to_tsvector(coalesce(b.title, '')), 'A') || "
+    "setweight(to_tsvector(coalesce(a.name, '')), 'B')"
+)
+
+
+def create_search_document(apps, schema_editor):
+    # postgres only: the tsvector PostgresSearchBackend matches against.
+    # it isn't a model field, so sqlite (which has its FTS table) skips it
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('ALTER TABLE api_book ADD COLUMN IF NOT EXISTS search_document tsvector')
+    schema_editor.execute(
+        f'UPDATE api_book AS b SET search_document = {DOCUMENT_SQL} '
+        'FROM api_author AS a WHERE a.id = b.author_id'
+    )
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS api_book_search_document ON api_book USING gin (search_document)'
+    )
+
+
+def drop_search_document(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS api_book_search_document')
+    schema_editor.execute('ALTER TABLE api_book DROP COLUMN IF EXISTS search_document')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_book_author_year_title_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_document, drop_search_document),
+    ]
@@ -1,5 +1,19 @@
+import unicodedata
+
+from django.conf import settings
 from django.db import models
 
+DUPLICATE_TITLE_MESSAGE = 'A book with this title already exists.'
+
+
+def normalize_title(title):
+    '''
+    the form two titles are compared in when BOOK_UNIQUE_NORMALIZED_TITLE
+    is on: unicode-normalized, case-folded, whitespace collapsed
+    '''
+    return ' '.join(unicodedata.normalize('NFKC', title).casefold().split())
+
+
 # Create your models here.
 class Author(models.Model):
     '''
@@ -7,6 +21,8 @@ class Author(models.Model):
     one author can have many books.
     '''
     name = models.CharField(max_length=100)
+    # bumped on every save, used for ETag / Last-Modified
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
@@ -18,10 +34,79 @@ class Book(models.Model):
     forming a one-to-many relationship: one Author -> Many Books.
 
     '''
-    title = models.CharField(max_length=200)
+    title = models.CharField(
+        max_length=200,
+        unique=True,
+        error_messages={'unique': DUPLICATE_TITLE_MESSAGE},
+    )
+    # normalize_title(title) when settings.BOOK_UNIQUE_NORMALIZED_TITLE is on,
+    # so "Dune" and " dune" collide too; NULL (never collides) when it's off
+    title_key = models.CharField(max_length=200, unique=True, null=True, blank=True, editable=False)
     publication_year = models.IntegerField()
 
     author = models.ForeignKey(Author, related_name='books', on_delete=models.CASCADE)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        # one index per filter/ordering combination BookListView supports,
+        # see `python manage.py explain_book_queries`.
+        # title is covered by its unique index, author alone by the FK index.
+        indexes = [
+            models.Index(fields=['publication_year', 'id'], name='api_book_year_id_idx'),
+            models.Index(fields=['author', 'publication_year', 'id'], name='api_book_author_year_idx'),
+            models.Index(fields=['author', 'title'], name='api_book_author_title_idx'),
+            models.Index(fields=['publication_year', 'title'], name='api_book_year_title_idx'),
+            models.Index(fields=['author', 'publication_year', 'title'], name='api_book_author_year_title_idx'),
+        ]
+
+    # (author_id, publication_year) as last saved, counted in the summary
+    # tables; None until the book is loaded from or written to the database
+    _stats_key = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        book = super().from_db(db, field_names, values)
+        if 'author_id' in book.__dict__ and 'publication_year' in book.__dict__:
+            book._stats_key = (book.author_id, book.publication_year)
+        return book
+
+    def set_title_key(self):
+        if getattr(settings, 'BOOK_UNIQUE_NORMALIZED_TITLE', False):
+            self.title_key = normalize_title(self.title)
+        else:
+            self.title_key = None
+
+    def save(self, *args, **kwargs):
+        self.set_title_key()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'title' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'title_key'}
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.title
+
+
+# <-----------summary tables, kept in sync by api/signals.py------------->
+class AuthorStats(models.Model):
+    '''
+    how many books an author has, precomputed so dashboards read one row
+    instead of running GROUP BY over every book.
+    rebuild with `python manage.py rebuild_book_stats`.
+    '''
+    author = models.OneToOneField(Author, primary_key=True, related_name='stats', on_delete=models.CASCADE)
+    book_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.author_id}: {self.book_count}'
+
+
+class YearStats(models.Model):
+    '''
+    how many books were published in a year, one row per year
+    '''
+    year = models.IntegerField(primary_key=True)
+    book_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.year}: {self.book_count}'
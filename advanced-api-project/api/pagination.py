@@ -0,0 +1,224 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .counting import BookListCounter
+
+
+class BookKeysetPagination(BasePagination):
+    '''
+    keyset (cursor) pagination for the book list.
+
+    rows are ordered by (field, id) where field is one of `keyset_fields`,
+    and each page continues from the last (field, id) pair seen instead of
+    using OFFSET, so page N+1 costs the same as page 1.
+
+    the ordering is taken from the same `?ordering=` param the
+    OrderingFilter reads; only its first term is used for the keyset.
+    pagination is opt-in: it only kicks in when the client sends
+    `?cursor=` or `?page_size=`, so the plain list response is unchanged.
+
+    a `?search=` without `?ordering=` keeps the search backend's ranking:
+    rank isn't a column to continue from, so those pages are read by
+    offset instead (see paginate_by_rank).
+
+    pages also carry the total `count` of the filtered list, and which
+    `count_strategy` (exact / cached / estimated) produced it.
+    '''
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    page_size = getattr(settings, 'BOOK_LIST_PAGE_SIZE', 100)
+    max_page_size = getattr(settings, 'BOOK_LIST_MAX_PAGE_SIZE', 1000)
+    keyset_fields = ['publication_year', 'title']
+    default_field = 'publication_year'
+    invalid_cursor_message = 'Invalid cursor'
+    counter_class = BookListCounter
+
+    def is_requested(self, request):
+        params = request.query_params
+        return self.cursor_query_param in params or self.page_size_query_param in params
+
+    def get_keyset_columns(self, request):
+        '''
+        the columns every row needs for the cursors, even under ?fields=
+        '''
+        if not self.is_requested(request):
+            return []
+        if self.is_ranked(request):
+            return ['id']
+        return ['id', self.get_ordering(request)[0]]
+
+    def is_ranked(self, request):
+        '''
+        a search with no explicit ordering comes back best match first
+        '''
+        params = request.query_params
+        return bool(params.get(api_settings.SEARCH_PARAM, '').strip()) and \
+            not params.get(api_settings.ORDERING_PARAM, '').strip()
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_requested(request):
+            return None
+
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.field, self.descending = self.get_ordering(request)
+        self.ranked = self.is_ranked(request)
+        if self.ranked:
+            self.field = 'rank'
+
+        cursor = self.decode_cursor(request)
+        self.reverse = cursor is not None and cursor['r']
+        self.count, self.count_strategy = self.counter_class().count(queryset, request)
+        if self.ranked:
+            return self.paginate_by_rank(queryset, cursor)
+
+        # walking backwards means reading the index the other way round
+        descending = self.descending != self.reverse
+        prefix = '-' if descending else ''
+        queryset = queryset.order_by(prefix + self.field, prefix + 'id')
+
+        if cursor is not None:
+            queryset = queryset.filter(self.get_keyset_filter(cursor, descending))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if self.reverse:
+            rows.reverse()
+
+        if self.reverse:
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+
+        self.first = rows[0] if rows else None
+        self.last = rows[-1] if rows else None
+        return rows
+
+    def paginate_by_rank(self, queryset, cursor):
+        '''
+        search results in the backend's rank order, paged by OFFSET.
+        a search matches few enough rows for that to stay cheap;
+        id breaks rank ties so pages neither overlap nor skip rows.
+        '''
+        if queryset.query.extra_order_by:
+            queryset = queryset.extra(order_by=[*queryset.query.extra_order_by, 'id'])
+        else:
+            queryset = queryset.order_by(*queryset.query.order_by, 'id')
+        self.offset = cursor['o'] if cursor is not None else 0
+
+        rows = list(queryset[self.offset:self.offset + self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        self.has_previous = self.offset > 0
+        rows = rows[:self.page_size]
+        self.first = rows[0] if rows else None
+        self.last = rows[-1] if rows else None
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, request):
+        '''
+        returns (field, descending) from the first `?ordering=` term,
+        falling back to the default field for anything that has no keyset.
+        '''
+        ordering = request.query_params.get(api_settings.ORDERING_PARAM, '')
+        term = ordering.split(',')[0].strip()
+        field = term.lstrip('-')
+        if field not in self.keyset_fields:
+            return self.default_field, False
+        return field, term.startswith('-')
+
+    def get_keyset_filter(self, cursor, descending):
+        '''
+        (field, id) > (value, pk), written so the leading `field >= value`
+        can be served as a range scan on a (field, id) index.
+        '''
+        value, pk = cursor['v'], cursor['id']
+        op = 'lt' if descending else 'gt'
+        op_or_equal = op + 'e'
+        return Q(**{f'{self.field}__{op_or_equal}': value}) & (
+            Q(**{f'{self.field}__{op}': value}) | Q(**{f'id__{op}': pk})
+        )
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            cursor = json.loads(urlsafe_b64decode(padded.encode('ascii')))
+            if cursor['f'] != self.field:
+                raise ValueError
+            if self.ranked:
+                if not isinstance(cursor['o'], int) or cursor['o'] < 0:
+                    raise ValueError
+            elif not isinstance(cursor['id'], int) or not isinstance(cursor['v'], (int, str)):
+                raise ValueError
+            cursor['r'] = bool(cursor.get('r'))
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    def encode_cursor(self, book, reverse):
+        # rows are Book instances, or dicts when the view reads values()
+        if isinstance(book, dict):
+            cursor = {'f': self.field, 'v': book[self.field], 'id': book['id']}
+        else:
+            cursor = {'f': self.field, 'v': getattr(book, self.field), 'id': book.pk}
+        if reverse:
+            cursor['r'] = 1
+        return self.cursor_link(cursor)
+
+    def encode_offset(self, offset):
+        if offset <= 0:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.cursor_link({'f': self.field, 'o': offset})
+
+    def cursor_link(self, cursor):
+        raw = json.dumps(cursor, separators=(',', ':')).encode('utf-8')
+        encoded = urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or self.last is None:
+            return None
+        if self.ranked:
+            return self.encode_offset(self.offset + self.page_size)
+        return self.encode_cursor(self.last, reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if self.ranked:
+            return self.encode_offset(self.offset - self.page_size)
+        if self.first is None:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.first, reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'count': self.count,
+            'count_strategy': self.count_strategy,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
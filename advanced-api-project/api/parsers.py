@@ -0,0 +1,32 @@
+import json
+
+from rest_framework.parsers import BaseParser
+
+
+class NDJSONParser(BaseParser):
+    '''
+    newline delimited JSON: one object per line.
+
+    returns a generator, so a big upload is decoded line by line while the
+    view consumes it in batches instead of being loaded all at once.
+    a line that isn't valid JSON is passed through as a string so the
+    serializer reports it as an error for that item only.
+    '''
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', 'utf-8')
+        return self.iter_items(stream, encoding)
+
+    def iter_items(self, stream, encoding):
+        if stream is None:
+            return
+        for raw in stream:
+            line = raw.decode(encoding, errors='replace').strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield line
@@ -0,0 +1,223 @@
+from django.conf import settings
+from django.db import connections
+from django.utils.module_loading import import_string
+from rest_framework import filters
+
+FTS_TABLE = 'api_book_fts'
+
+
+class BasicSearchBackend:
+    '''
+    no search index at all: BookSearchFilter falls back to DRF's
+    SearchFilter (icontains on every search field).
+    '''
+
+    def __init__(self, alias='default'):
+        self.alias = alias
+
+    def search(self, queryset, terms):
+        '''
+        returns the matching queryset ordered by relevance,
+        or None if the plain SearchFilter should handle the query.
+        '''
+        return None
+
+    def index_book(self, book_id):
+        self.index_books([book_id])
+
+    def index_books(self, book_ids):
+        pass
+
+    def remove_book(self, book_id):
+        pass
+
+    def index_author(self, author_id):
+        pass
+
+    def rebuild(self):
+        pass
+
+
+class SQLiteFTSBackend(BasicSearchBackend):
+    '''
+    sqlite FTS5 table (created by migration 0002) holding one row per book,
+    keyed by book id, with the book title and the author name.
+    the trigram tokenizer keeps the same substring semantics as icontains,
+    but terms shorter than three characters can't use it.
+    '''
+    min_term_length = 3
+
+    def __init__(self, alias='default'):
+        super().__init__(alias)
+        self._available = None
+
+    @property
+    def connection(self):
+        return connections[self.alias]
+
+    def is_available(self):
+        if self._available is None:
+            with self.connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE]
+                )
+                self._available = cursor.fetchone() is not None
+        return self._available
+
+    def build_query(self, terms):
+        # every term has to match somewhere, like SearchFilter
+        return ' AND '.join('"%s"' % term.replace('"', '""') for term in terms)
+
+    def search(self, queryset, terms):
+        if any(len(term) < self.min_term_length for term in terms) or not self.is_available():
+            return None
+        return queryset.extra(
+            select={'search_rank': f'{FTS_TABLE}.rank'},
+            tables=[FTS_TABLE],
+            where=[f'{FTS_TABLE}.rowid = api_book.id', f'{FTS_TABLE} MATCH %s'],
+            params=[self.build_query(terms)],
+            order_by=['search_rank'],
+        )
+
+    def execute(self, sql, params=()):
+        if not self.is_available():
+            return
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, params)
+
+    def index_books(self, book_ids):
+        book_ids = list(book_ids)
+        if not book_ids:
+            return
+        placeholders = ', '.join(['%s'] * len(book_ids))
+        self.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})', book_ids)
+        self.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, author_name) '
+            'SELECT b.id, b.title, a.name FROM api_book b '
+            f'JOIN api_author a ON a.id = b.author_id WHERE b.id IN ({placeholders})',
+            book_ids,
+        )
+
+    def remove_book(self, book_id):
+        self.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [book_id])
+
+    def index_author(self, author_id):
+        self.execute(
+            f'UPDATE {FTS_TABLE} SET author_name = (SELECT name FROM api_author WHERE id = %s) '
+            'WHERE rowid IN (SELECT id FROM api_book WHERE author_id = %s)',
+            [author_id, author_id],
+        )
+
+    def rebuild(self):
+        self.execute(f'DELETE FROM {FTS_TABLE}')
+        self.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, author_name) '
+            'SELECT b.id, b.title, a.name FROM api_book b JOIN api_author a ON a.id = b.author_id'
+        )
+
+
+class PostgresSearchBackend(BasicSearchBackend):
+    '''
+    postgres full-text search over title and author name, plus trigram
+    similarity on the title (pg_trgm) so typos and partial words still match.
+
+    the tsvector lives in api_book.search_document (title weighted A,
+    author name B), added with its GIN index by migration 0008 and kept in
+    sync by the same signals as the sqlite FTS table; the model doesn't
+    declare it, so sqlite installs never see it. the trigram side uses the
+    `%` operator, which the api_book_title_trgm GIN index (migration 0002)
+    serves; its cut-off is pg_trgm.similarity_threshold (0.3 by default).
+    so both halves of the WHERE are index scans, and the rank is only
+    computed for the rows they return.
+    '''
+    document_sql = (
+        "setweight(to_tsvector(coalesce(b.title, '')), 'A') || "
+        "setweight(to_tsvector(coalesce(a.name, '')), 'B')"
+    )
+
+    @property
+    def connection(self):
+        return connections[self.alias]
+
+    def search(self, queryset, terms):
+        # imported here so sqlite installs don't need psycopg
+        from django.contrib.postgres.lookups import TrigramSimilar
+        from django.contrib.postgres.search import (
+            SearchQuery, SearchRank, SearchVectorExact, SearchVectorField, TrigramSimilarity,
+        )
+        from django.db.models import F, Q
+        from django.db.models.expressions import RawSQL
+
+        text = ' '.join(terms)
+        document = RawSQL('api_book.search_document', [], output_field=SearchVectorField())
+        query = SearchQuery(text, search_type='plain')
+        # lookup objects rather than `title__trigram_similar`: that lookup is
+        # only registered when django.contrib.postgres is installed
+        return queryset.filter(
+            Q(SearchVectorExact(document, query)) | Q(TrigramSimilar(F('title'), text))
+        ).annotate(
+            search_rank=SearchRank(document, query) + TrigramSimilarity('title', text),
+        ).order_by('-search_rank')
+
+    def execute(self, sql, params=()):
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, params)
+
+    def update_documents(self, where='', params=()):
+        self.execute(
+            f'UPDATE api_book AS b SET search_document = {self.document_sql} '
+            f'FROM api_author AS a WHERE a.id = b.author_id {where}',
+            params,
+        )
+
+    def index_books(self, book_ids):
+        book_ids = list(book_ids)
+        if not book_ids:
+            return
+        placeholders = ', '.join(['%s'] * len(book_ids))
+        self.update_documents(f'AND b.id IN ({placeholders})', book_ids)
+
+    def index_author(self, author_id):
+        self.update_documents('AND b.author_id = %s', [author_id])
+
+    def rebuild(self):
+        self.update_documents()
+
+
+_backends = {}
+
+
+def get_search_backend(alias='default'):
+    '''
+    returns the search backend for a database alias.
+    settings.BOOK_SEARCH_BACKEND can name a backend class by dotted path;
+    otherwise it is picked from the database vendor.
+    '''
+    if alias not in _backends:
+        path = getattr(settings, 'BOOK_SEARCH_BACKEND', None)
+        if path:
+            backend_class = import_string(path)
+        else:
+            backend_class = {
+                'sqlite': SQLiteFTSBackend,
+                'postgresql': PostgresSearchBackend,
+            }.get(connections[alias].vendor, BasicSearchBackend)
+        _backends[alias] = backend_class(alias)
+    return _backends[alias]
+
+
+class BookSearchFilter(filters.SearchFilter):
+    '''
+    SearchFilter that asks the search backend first and only falls back to
+    icontains scans when the backend can't answer the query.
+    results come back ranked best match first, unless ?ordering= is given;
+    BookKeysetPagination keeps that order when it pages a ranked search.
+    '''
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if terms:
+            results = get_search_backend(queryset.db).search(queryset, terms)
+            if results is not None:
+                return results
+        return super().filter_queryset(request, queryset, view)
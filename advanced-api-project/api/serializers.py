@@ -1,16 +1,67 @@
 from rest_framework import serializers
-from .models import Author, Book
+from .models import Author, AuthorStats, Book, YearStats, DUPLICATE_TITLE_MESSAGE, normalize_title
 from datetime import datetime
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
 
-class BookSerializer(serializers.ModelSerializer):
+def title_taken(title, exclude_pk=None):
+    '''
+    whether a book other than `exclude_pk` holds `title` (or, with
+    BOOK_UNIQUE_NORMALIZED_TITLE, its normalized form).
+    asked after an IntegrityError, so a title clash can be told from any
+    other violation (e.g. the author deleted since validation) without
+    depending on how each backend words its error messages.
+    '''
+    lookup = Q(title=title)
+    if getattr(settings, 'BOOK_UNIQUE_NORMALIZED_TITLE', False):
+        lookup |= Q(title_key=normalize_title(title))
+    return Book.objects.filter(lookup).exclude(pk=exclude_pk).exists()
+
+
+class DynamicFieldsMixin:
+    '''
+    lets the caller trim and expand the output:
+    Serializer(obj, fields=['id', 'title'], expand=['author'])
+    `fields` keeps only those fields; `expand` swaps a field for the
+    nested serializer named in `expandable_fields`.
+    '''
+    expandable_fields = {}
+
+    def __init__(self, *args, fields=None, expand=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        for name in expand:
+            if name in self.expandable_fields:
+                self.fields[name] = self.expandable_fields[name]()
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class AuthorSummarySerializer(serializers.ModelSerializer):
+    '''
+    the author inlined into a book by ?expand=author
+    '''
+    class Meta:
+        model = Author
+        fields = ['id', 'name']
+        read_only_fields = fields
+
+
+class BookSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     '''
     serializes book objects
     include custom validation to ensure that publication_year is not in the future
     '''
+    expandable_fields = {'author': AuthorSummarySerializer}
+
     class Meta:
         model = Book
         fields = ['id', 'title', 'publication_year', 'author']
+        # no UniqueValidator query: the unique index decides, see save_unique()
+        extra_kwargs = {'title': {'validators': []}}
 
 
         def validate_publication_year(self,value):
@@ -21,8 +72,91 @@ class BookSerializer(serializers.ModelSerializer):
             if value > current_year:
                 raise serializers.ValidationError('Publicatoin year cannot be in the future')
             return value
-        
-class AuthorSerializer(serializers.ModelSerializer):
+
+    def save_unique(self, save, *args):
+        '''
+        the unique index on title (and title_key) is the duplicate check:
+        one INSERT/UPDATE and no SELECT first, so two requests with the
+        same title can't both get in. the loser gets the usual 400;
+        any other integrity error is re-raised.
+        '''
+        try:
+            with transaction.atomic():
+                return save(*args)
+        except IntegrityError:
+            instance = self.instance
+            title = self.validated_data.get('title', getattr(instance, 'title', None))
+            if title is None or not title_taken(title, getattr(instance, 'pk', None)):
+                raise
+            raise serializers.ValidationError({'title': [DUPLICATE_TITLE_MESSAGE]})
+
+    def create(self, validated_data):
+        return self.save_unique(super().create, validated_data)
+
+    def update(self, instance, validated_data):
+        return self.save_unique(super().update, instance, validated_data)
+
+
+class BookValuesSerializer:
+    '''
+    read-only fast path for BookSerializer.
+    builds the same output (same keys, same order) straight from values()
+    rows, so no Book instances and no per-field to_representation calls.
+    takes the same `fields` / `expand` options as BookSerializer.
+    read the rows with values() first, then pass them in like any
+    serializer: BookValuesSerializer(rows, many=True).data
+    '''
+    # output key -> values() column
+    columns = {
+        'id': 'id',
+        'title': 'title',
+        'publication_year': 'publication_year',
+        'author': 'author_id',
+    }
+    # expanded output key -> {nested key -> values() column}, as AuthorSummarySerializer
+    expanded_columns = {
+        'author': {'id': 'author__id', 'name': 'author__name'},
+    }
+
+    def __init__(self, instance=None, many=False, fields=None, expand=(), **kwargs):
+        self.instance = instance
+        self.many = many
+        self.layout = self.get_layout(fields, expand)
+
+    @classmethod
+    def get_layout(cls, fields=None, expand=()):
+        layout = {}
+        for key, column in cls.columns.items():
+            if fields is None or key in fields:
+                layout[key] = cls.expanded_columns[key] if key in expand else column
+        return layout
+
+    @classmethod
+    def values(cls, queryset, fields=None, expand=(), extra=()):
+        '''
+        the values() queryset for these options. `extra` columns are read
+        too (e.g. for the paginator) but left out of the output.
+        '''
+        columns = []
+        for column in cls.get_layout(fields, expand).values():
+            columns += column.values() if isinstance(column, dict) else [column]
+        columns += [column for column in extra if column not in columns]
+        return queryset.values(*columns)
+
+    def to_representation(self, row):
+        return {
+            key: {name: row[nested] for name, nested in column.items()} if isinstance(column, dict) else row[column]
+            for key, column in self.layout.items()
+        }
+
+    @property
+    def data(self):
+        if self.many:
+            return serializers.ReturnList([self.to_representation(row) for row in self.instance], serializer=self)
+        return serializers.ReturnDict(self.to_representation(self.instance), serializer=self)
+
+
+class AuthorSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     '''
     serializes author objects
     includes nested serialization of all related books using BookSerialization
@@ -35,6 +169,188 @@ class AuthorSerializer(serializers.ModelSerializer):
         model = Author
         fields = ['id', 'name', 'books']
 
+# <---------Bulk Book Serializers-------------->
+
+class BulkAuthorField(serializers.PrimaryKeyRelatedField):
+    '''
+    author pk field that reads from the authors the list serializer
+    loaded for the whole batch, instead of one query per item
+    '''
+
+    def to_internal_value(self, data):
+        authors = self.context.get('bulk_authors')
+        if authors is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool) or not isinstance(data, (int, str)):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            return authors[int(data)]
+        except (KeyError, ValueError):
+            self.fail('does_not_exist', pk_value=data)
+
+
+class BookListSerializer(serializers.ListSerializer):
+    '''
+    validates a batch of books and saves it with bulk_create / bulk_update.
+
+    unlike the default ListSerializer an invalid item does not fail the
+    batch: its errors are kept in `item_errors` (item index -> errors) and
+    only the valid items are saved. authors and duplicate titles are
+    checked with one query each for the whole batch.
+
+    for updates, pass `instance` as a dict of {id: Book} and give every
+    item an `id`.
+    '''
+    duplicate_title_message = DUPLICATE_TITLE_MESSAGE
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list):
+            raise serializers.ValidationError('Expected a list of books.')
+
+        self.item_errors = {}
+        self.valid_indexes = []
+        author_ids = set()
+        for item in data:
+            try:
+                author_ids.add(int(item['author']))
+            except (TypeError, KeyError, ValueError):
+                pass
+        self.context['bulk_authors'] = Author.objects.in_bulk(author_ids)
+
+        validated = []
+        for index, item in enumerate(data):
+            try:
+                attrs = self.run_child_validation(item)
+            except serializers.ValidationError as exc:
+                self.item_errors[index] = exc.detail
+            else:
+                validated.append(attrs)
+                self.valid_indexes.append(index)
+
+        return self.reject_duplicate_titles(validated)
+
+    def run_child_validation(self, data):
+        if self.instance is None:
+            return super().run_child_validation(data)
+        pk = data.get('id') if isinstance(data, dict) else None
+        if pk not in self.instance:
+            raise serializers.ValidationError({'id': ['Book not found.']})
+        self.child.instance = self.instance[pk]
+        self.child.initial_data = data
+        attrs = super().run_child_validation(data)
+        attrs['id'] = pk
+        return attrs
+
+    def reject_duplicate_titles(self, validated):
+        '''
+        one IN query for titles already taken by other books,
+        plus titles repeated inside the batch itself.
+        compares normalized titles when BOOK_UNIQUE_NORMALIZED_TITLE is on.
+        '''
+        if getattr(settings, 'BOOK_UNIQUE_NORMALIZED_TITLE', False):
+            column, key = 'title_key', normalize_title
+        else:
+            column, key = 'title', str
+        titles = [key(attrs['title']) for attrs in validated if 'title' in attrs]
+        taken = dict(Book.objects.filter(**{f'{column}__in': titles}).values_list(column, 'id'))
+
+        kept, kept_indexes, seen = [], [], set()
+        for attrs, index in zip(validated, self.valid_indexes):
+            if 'title' in attrs:
+                title = key(attrs['title'])
+                owner = taken.get(title)
+                if title in seen or (owner is not None and owner != attrs.get('id')):
+                    self.item_errors[index] = {'title': [self.duplicate_title_message]}
+                    continue
+                seen.add(title)
+            kept.append(attrs)
+            kept_indexes.append(index)
+        self.valid_indexes = kept_indexes
+        return kept
+
+    def create(self, validated_data):
+        books = [Book(**attrs) for attrs in validated_data]
+        # bulk_create skips Book.save()
+        for book in books:
+            book.set_title_key()
+        try:
+            with transaction.atomic():
+                return Book.objects.bulk_create(books)
+        except IntegrityError:
+            # someone inserted one of our titles since we checked; find it row by row
+            return self.save_one_by_one(books)
+
+    def update(self, instance, validated_data):
+        books, fields = [], set()
+        now = timezone.now()
+        for attrs in validated_data:
+            book = instance[attrs.pop('id')]
+            for attr, value in attrs.items():
+                setattr(book, attr, value)
+            fields.update(attrs)
+            books.append(book)
+        if not fields:
+            return books
+        # bulk_update skips auto_now and Book.save()
+        for book in books:
+            book.updated_at = now
+            book.set_title_key()
+        fields.add('updated_at')
+        if 'title' in fields:
+            fields.add('title_key')
+        try:
+            with transaction.atomic():
+                Book.objects.bulk_update(books, sorted(fields))
+        except IntegrityError:
+            return self.save_one_by_one(books)
+        return books
+
+    def save_one_by_one(self, books):
+        saved, indexes = [], []
+        for book, index in zip(books, self.valid_indexes):
+            try:
+                with transaction.atomic():
+                    book.save()
+            except IntegrityError:
+                if not title_taken(book.title, book.pk):
+                    raise
+                self.item_errors[index] = {'title': [self.duplicate_title_message]}
+            else:
+                saved.append(book)
+                indexes.append(index)
+        self.valid_indexes = indexes
+        return saved
+
+
+class BookBulkSerializer(BookSerializer):
+    '''
+    BookSerializer for the bulk endpoints: use with many=True.
+    the per-item unique title check is left to BookListSerializer.
+    '''
+    author = BulkAuthorField(queryset=Author.objects.all())
+
+    class Meta(BookSerializer.Meta):
+        list_serializer_class = BookListSerializer
+        extra_kwargs = {'title': {'validators': []}}
+
+# <---------Stats Serializers-------------->
+
+class AuthorStatsSerializer(serializers.ModelSerializer):
+    '''books per author, from the AuthorStats summary table'''
+    author_name = serializers.CharField(source='author.name', read_only=True)
+
+    class Meta:
+        model = AuthorStats
+        fields = ['author', 'author_name', 'book_count']
+
+
+class YearStatsSerializer(serializers.ModelSerializer):
+    '''books per publication year, from the YearStats summary table'''
+
+    class Meta:
+        model = YearStats
+        fields = ['year', 'book_count']
+
 # <---------User Serializer-------------->
 
 class UserSerializer(serializers.ModelSerializer):
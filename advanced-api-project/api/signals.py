@@ -0,0 +1,100 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import Signal, receiver
+from rest_framework.authtoken.models import Token
+from .authentication import token_cache
+from .models import Author, Book
+from .search import get_search_backend
+from .cache import bump_version
+from .stats import record_moves
+
+
+# sent by the bulk endpoints after bulk_create / bulk_update, which skip
+# post_save. kwargs: books, book_ids, using
+books_bulk_saved = Signal()
+
+
+# <-----------keep the search index in sync------------->
+@receiver(post_save, sender=Book)
+def index_book(sender, instance, using, **kwargs):
+    get_search_backend(using).index_book(instance.pk)
+
+
+@receiver(post_delete, sender=Book)
+def unindex_book(sender, instance, using, **kwargs):
+    get_search_backend(using).remove_book(instance.pk)
+
+
+@receiver(post_save, sender=Author)
+def index_author(sender, instance, using, created, **kwargs):
+    # a new author has no books yet
+    if not created:
+        get_search_backend(using).index_author(instance.pk)
+
+
+@receiver(books_bulk_saved)
+def index_bulk_books(sender, book_ids, using, **kwargs):
+    get_search_backend(using).index_books(book_ids)
+
+
+# <-----------keep the book stats tables in sync------------->
+@receiver(pre_save, sender=Book)
+def load_stats_key(sender, instance, using, **kwargs):
+    # a Book built by hand with the id of an existing row
+    if instance._stats_key is None and instance.pk is not None:
+        instance._stats_key = (
+            Book.objects.using(using).filter(pk=instance.pk)
+            .values_list('author_id', 'publication_year').first()
+        )
+
+
+@receiver(post_save, sender=Book)
+def count_saved_book(sender, instance, using, **kwargs):
+    key = (instance.author_id, instance.publication_year)
+    record_moves([(instance._stats_key, key)], using)
+    instance._stats_key = key
+
+
+@receiver(post_delete, sender=Book)
+def uncount_deleted_book(sender, instance, using, **kwargs):
+    key = instance._stats_key or (instance.author_id, instance.publication_year)
+    record_moves([(key, None)], using)
+    instance._stats_key = None
+
+
+@receiver(books_bulk_saved)
+def count_bulk_books(sender, books, using, **kwargs):
+    # created books have no _stats_key yet, updated ones hold their old key
+    moves = []
+    for book in books:
+        key = (book.author_id, book.publication_year)
+        moves.append((book._stats_key, key))
+        book._stats_key = key
+    record_moves(moves, using)
+
+
+# <-----------invalidate cached book lists------------->
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Book)
+@receiver(books_bulk_saved)
+def bump_book_version(sender, **kwargs):
+    bump_version('book')
+
+
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Author)
+def bump_author_version(sender, **kwargs):
+    bump_version('author')
+
+
+# <-----------drop cached token lookups------------->
+@receiver(post_delete, sender=Token)
+def forget_token(sender, instance, **kwargs):
+    # LogoutView deletes the token
+    token_cache.invalidate(instance.key)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_user_tokens(sender, instance, **kwargs):
+    token_cache.invalidate_user(instance.pk)
@@ -0,0 +1,82 @@
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Case, Count, F, IntegerField, Value, When
+from django.db.models.functions import Greatest
+from .models import AuthorStats, Book, YearStats
+
+# keys per UPDATE, so the CASE stays under sqlite's 999 parameters
+UPDATE_BATCH_SIZE = 300
+
+
+def count_changes(moves):
+    '''
+    moves: (old, new) pairs of (author_id, publication_year) keys, old is
+    None for a new book and new is None for a deleted one.
+    returns the non-zero ({author_id: delta}, {year: delta})
+    '''
+    authors, years = Counter(), Counter()
+    for old, new in moves:
+        if old == new:
+            continue
+        if old is not None:
+            authors[old[0]] -= 1
+            years[old[1]] -= 1
+        if new is not None:
+            authors[new[0]] += 1
+            years[new[1]] += 1
+    return (
+        {key: delta for key, delta in authors.items() if delta},
+        {key: delta for key, delta in years.items() if delta},
+    )
+
+
+def apply_deltas(model, deltas, using):
+    '''
+    adds each delta to its row's book_count, one UPDATE per batch of keys
+    however many books moved. only increments create missing rows: a
+    decrement's row exists already, unless its author is being deleted.
+    '''
+    manager = model.objects.using(using)
+    created = [model(pk=key) for key, delta in deltas.items() if delta > 0]
+    if created:
+        manager.bulk_create(created, ignore_conflicts=True)
+    keys = list(deltas)
+    for start in range(0, len(keys), UPDATE_BATCH_SIZE):
+        batch = keys[start:start + UPDATE_BATCH_SIZE]
+        delta = Case(
+            *[When(pk=key, then=Value(deltas[key])) for key in batch],
+            default=Value(0), output_field=IntegerField(),
+        )
+        # never below zero, even if the table drifted before a rebuild
+        manager.filter(pk__in=batch).update(book_count=Greatest(F('book_count') + delta, Value(0)))
+
+
+def record_moves(moves, using='default'):
+    authors, years = count_changes(moves)
+    if not authors and not years:
+        return
+    with transaction.atomic(using=using, savepoint=False):
+        apply_deltas(AuthorStats, authors, using)
+        apply_deltas(YearStats, years, using)
+
+
+def rebuild_stats(using='default'):
+    '''
+    recomputes both tables from the books with one GROUP BY each.
+    writes made while it runs can be lost, so run it when they are paused.
+    returns (authors, years) row counts
+    '''
+    books = Book.objects.using(using).order_by()
+    with transaction.atomic(using=using):
+        AuthorStats.objects.using(using).all().delete()
+        YearStats.objects.using(using).all().delete()
+        authors = AuthorStats.objects.using(using).bulk_create(
+            AuthorStats(author_id=row['author'], book_count=row['count'])
+            for row in books.values('author').annotate(count=Count('id'))
+        )
+        years = YearStats.objects.using(using).bulk_create(
+            YearStats(year=row['publication_year'], book_count=row['count'])
+            for row in books.values('publication_year').annotate(count=Count('id'))
+        )
+    return len(authors), len(years)
@@ -0,0 +1,47 @@
+import json
+from django.test import TestCase
+from django.urls import reverse
+from .models import Book, Author
+
+
+class AsyncBookViewsTestCase(TestCase):
+
+    def setUp(self):
+        self.author1 = Author.objects.create(name='Author One')
+        self.author2 = Author.objects.create(name='Author Two')
+        self.book1 = Book.objects.create(title='Book One', publication_year=2020, author=self.author1)
+        self.book2 = Book.objects.create(title='Book Two', publication_year=2021, author=self.author2)
+
+    async def get_json(self, url, **params):
+        response = await self.async_client.get(url, params)
+        content = b''.join([chunk async for chunk in response.streaming_content]) if response.streaming else response.content
+        return response, json.loads(content)
+
+    async def test_list_matches_sync_view(self):
+        _, data = await self.get_json(reverse('book-list-async'))
+        sync = await self.async_client.get(reverse('book-list'))
+        self.assertEqual(data, json.loads(sync.content))
+
+    async def test_filters_ordering_and_limit(self):
+        _, data = await self.get_json(reverse('book-list-async'), author=self.author2.id)
+        self.assertEqual([b['title'] for b in data], ['Book Two'])
+        _, data = await self.get_json(reverse('book-list-async'), ordering='-publication_year', limit=1)
+        self.assertEqual([b['title'] for b in data], ['Book Two'])
+        _, data = await self.get_json(reverse('book-list-async'), year=2020)
+        self.assertEqual([b['title'] for b in data], ['Book One'])
+
+    async def test_bad_filter_value(self):
+        response, _ = await self.get_json(reverse('book-list-async'), publication_year='abc')
+        self.assertEqual(response.status_code, 400)
+
+    async def test_detail(self):
+        response, data = await self.get_json(reverse('book-detail-async', kwargs={'pk': self.book1.id}))
+        self.assertEqual(data, {
+            'id': self.book1.id, 'title': 'Book One', 'publication_year': 2020, 'author': self.author1.id,
+        })
+        response, _ = await self.get_json(reverse('book-detail-async', kwargs={'pk': 9999}))
+        self.assertEqual(response.status_code, 404)
+
+    async def test_read_only(self):
+        response = await self.async_client.post(reverse('book-list-async'))
+        self.assertEqual(response.status_code, 405)
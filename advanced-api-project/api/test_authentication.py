@@ -0,0 +1,80 @@
+from unittest import mock
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+from rest_framework import status
+from .authentication import TokenCache, token_cache
+from .models import Book, Author
+
+
+class CachingTokenAuthenticationTestCase(APITestCase):
+
+    def setUp(self):
+        token_cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.token = Token.objects.create(user=self.user)
+        author = Author.objects.create(name='Author One')
+        self.book = Book.objects.create(title='Book One', publication_year=2020, author=author)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def update(self, title):
+        url = reverse('book-update', kwargs={'pk': self.book.id})
+        return self.client.patch(url, {'title': title}, format='json')
+
+    def token_queries(self, ctx):
+        return [q for q in ctx.captured_queries if 'authtoken_token' in q['sql']]
+
+    def test_second_request_skips_token_query(self):
+        with CaptureQueriesContext(connection) as first:
+            self.assertEqual(self.update('A').status_code, status.HTTP_200_OK)
+        with CaptureQueriesContext(connection) as second:
+            self.assertEqual(self.update('B').status_code, status.HTTP_200_OK)
+        self.assertEqual(len(self.token_queries(first)), 1)
+        self.assertEqual(len(self.token_queries(second)), 0)
+        self.assertEqual(len(second.captured_queries), len(first.captured_queries) - 1)
+
+    def test_logout_evicts_token(self):
+        self.update('A')
+        response = self.client.post(reverse('logout'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(token_cache.get(self.token.key))
+        self.assertNotEqual(self.update('B').status_code, status.HTTP_200_OK)
+
+    def test_deactivated_user_is_rejected(self):
+        self.update('A')
+        self.user.is_active = False
+        self.user.save()
+        self.assertNotEqual(self.update('B').status_code, status.HTTP_200_OK)
+
+    def test_invalid_token(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Token nope')
+        self.assertEqual(self.update('A').status_code, status.HTTP_403_FORBIDDEN)
+
+
+class TokenCacheTestCase(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='u')
+
+    def test_lru_is_bounded(self):
+        cache = TokenCache(maxsize=2, ttl=60)
+        for key in 'abc':
+            cache.set(key, self.user, None, cache.generation)
+        self.assertIsNone(cache.get('a'))
+        self.assertIsNotNone(cache.get('c'))
+
+    def test_entries_expire(self):
+        cache = TokenCache(maxsize=2, ttl=60)
+        cache.set('a', self.user, None, cache.generation)
+        with mock.patch('api.authentication.time.monotonic', return_value=10**9):
+            self.assertIsNone(cache.get('a'))
+
+    def test_stale_lookup_is_not_stored(self):
+        cache = TokenCache(maxsize=2, ttl=60)
+        generation = cache.generation
+        cache.invalidate('a')
+        cache.set('a', self.user, None, generation)
+        self.assertIsNone(cache.get('a'))
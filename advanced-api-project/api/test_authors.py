@@ -0,0 +1,51 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+from .models import Book, Author
+
+
+class AuthorAPITestCase(APITestCase):
+
+    def setUp(self):
+        self.author1 = Author.objects.create(name='Author One')
+        self.author2 = Author.objects.create(name='Author Two')
+        Book.objects.create(title='Book One', publication_year=2020, author=self.author1)
+        Book.objects.create(title='Book Two', publication_year=2021, author=self.author1)
+        Book.objects.create(title='Book Three', publication_year=2021, author=self.author2)
+
+    def count_list_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(ctx.captured_queries)
+
+    def test_list_authors_with_books(self):
+        response = self.client.get(reverse('author-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 2)
+        self.assertEqual([b['title'] for b in response.data[0]['books']], ['Book One', 'Book Two'])
+
+    def test_retrieve_author(self):
+        response = self.client.get(reverse('author-detail', kwargs={'pk': self.author2.id}))
+        self.assertEqual(response.data['name'], 'Author Two')
+        self.assertEqual(len(response.data['books']), 1)
+
+    def test_books_year_prefetch_filter(self):
+        response = self.client.get(reverse('author-list') + '?books_year=2021')
+        self.assertEqual([b['title'] for b in response.data[0]['books']], ['Book Two'])
+        self.assertEqual(len(response.data), 2)
+
+    def test_books_year_must_be_a_number(self):
+        response = self.client.get(reverse('author-list') + '?books_year=abc')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_query_count_does_not_grow_with_authors(self):
+        url = reverse('author-list')
+        baseline = self.count_list_queries(url)
+        for i in range(10):
+            author = Author.objects.create(name=f'Extra {i}')
+            Book.objects.create(title=f'Extra Book {i}', publication_year=2019, author=author)
+        self.assertEqual(self.count_list_queries(url), baseline)
+        self.assertEqual(baseline, 2)
@@ -0,0 +1,97 @@
+import json
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+from .models import Book, Author
+
+
+class BookBulkAPITestCase(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.author = Author.objects.create(name='Author One')
+        self.existing = Book.objects.create(title='Existing', publication_year=2000, author=self.author)
+        self.url = reverse('book-bulk')
+        self.client.force_authenticate(user=self.user)
+
+    def books(self, count, start=0):
+        return [
+            {'title': f'Bulk {i}', 'publication_year': 2001, 'author': self.author.id}
+            for i in range(start, start + count)
+        ]
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(user=None)
+        response = self.client.post(self.url, self.books(1), format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_bulk_create(self):
+        response = self.client.post(self.url, self.books(5), format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data, {'created': 5, 'errors': []})
+        self.assertEqual(Book.objects.count(), 6)
+
+    def test_bad_items_do_not_abort_batch(self):
+        items = self.books(3)
+        items[0]['title'] = 'Existing'          # taken in the database
+        items[1]['author'] = 9999               # unknown author
+        items.append({'title': 'Bulk 2', 'publication_year': 2001, 'author': self.author.id})  # repeated in batch
+        response = self.client.post(self.url, items, format='json')
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual([e['index'] for e in response.data['errors']], [0, 1, 3])
+        self.assertIn('title', response.data['errors'][0]['errors'])
+        self.assertIn('author', response.data['errors'][1]['errors'])
+        self.assertTrue(Book.objects.filter(title='Bulk 2').exists())
+
+    def test_query_count_does_not_grow_with_batch(self):
+        with CaptureQueriesContext(connection) as small:
+            self.client.post(self.url, self.books(2), format='json')
+        # 150 rows x 5 columns stays under sqlite's 999 parameters per INSERT
+        with CaptureQueriesContext(connection) as large:
+            self.client.post(self.url, self.books(150, start=100), format='json')
+        self.assertEqual(len(large.captured_queries), len(small.captured_queries))
+
+    def test_ndjson_stream(self):
+        body = '\n'.join(json.dumps(item) for item in self.books(3)) + '\nnot json\n'
+        response = self.client.generic('POST', self.url, body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(response.data['created'], 3)
+        self.assertEqual(response.data['errors'][0]['index'], 3)
+
+    def test_bulk_update(self):
+        other = Book.objects.create(title='Other', publication_year=2000, author=self.author)
+        items = [
+            {'id': self.existing.id, 'publication_year': 1999},
+            {'id': other.id, 'title': 'Existing'},   # would duplicate
+            {'id': 9999, 'title': 'Ghost'},
+        ]
+        response = self.client.patch(self.url, items, format='json')
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(response.data['updated'], 1)
+        self.assertEqual([e['index'] for e in response.data['errors']], [1, 2])
+        self.existing.refresh_from_db()
+        self.assertEqual(self.existing.publication_year, 1999)
+
+    def test_bulk_update_keeps_own_title(self):
+        items = [{'id': self.existing.id, 'title': 'Existing', 'publication_year': 1998}]
+        response = self.client.patch(self.url, items, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_bulk_delete(self):
+        response = self.client.delete(self.url, [self.existing.id, 9999], format='json')
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(response.data['deleted'], 1)
+        self.assertFalse(Book.objects.exists())
+
+    def test_bulk_created_books_are_searchable(self):
+        self.client.post(self.url, self.books(3), format='json')
+        response = self.client.get(reverse('book-list'), {'search': 'Bulk 1'})
+        self.assertEqual([b['title'] for b in response.data], ['Bulk 1'])
+
+    def test_rejects_non_list(self):
+        response = self.client.post(self.url, {'title': 'x'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
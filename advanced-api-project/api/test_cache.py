@@ -0,0 +1,93 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+from .models import Book, Author
+
+
+class BookListCacheTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.author = Author.objects.create(name='Author One')
+        self.book = Book.objects.create(title='Book One', publication_year=2020, author=self.author)
+        self.url = reverse('book-list')
+
+    def test_second_request_is_a_hit_without_queries(self):
+        first = self.client.get(self.url, {'publication_year': 2020})
+        self.assertEqual(first['X-Cache'], 'MISS')
+        with CaptureQueriesContext(connection) as ctx:
+            second = self.client.get(self.url, {'publication_year': 2020})
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(len(ctx.captured_queries), 0)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_pages_share_the_etag_aggregate(self):
+        for i in range(4):
+            Book.objects.create(title=f'Book {i + 2}', publication_year=2020, author=self.author)
+        first = self.client.get(self.url, {'page_size': 2})
+        with CaptureQueriesContext(connection) as ctx:
+            second = self.client.get(first.data['next'])
+        self.assertEqual(second['X-Cache'], 'MISS')
+        self.assertFalse(any('MAX(' in query['sql'] for query in ctx.captured_queries))
+        self.assertNotEqual(second['ETag'], first['ETag'])
+        # a write still changes every page's ETag
+        Book.objects.create(title='Book 9', publication_year=2020, author=self.author)
+        self.assertEqual(self.client.get(first.data['next'], HTTP_IF_NONE_MATCH=second['ETag']).status_code,
+                         status.HTTP_200_OK)
+
+    def test_key_is_normalized(self):
+        self.client.get(self.url + '?ordering=title&search=Book&author=')
+        response = self.client.get(self.url + '?search=Book&ordering=title')
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+    def test_different_queries_do_not_share_entries(self):
+        self.client.get(self.url, {'year': 2020})
+        response = self.client.get(self.url, {'year': 2021})
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data, [])
+
+    def test_book_write_invalidates(self):
+        self.client.get(self.url)
+        Book.objects.create(title='Book Two', publication_year=2021, author=self.author)
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(len(response.data), 2)
+
+    def test_author_write_invalidates(self):
+        self.client.get(self.url, {'search': 'Author One'})
+        self.author.name = 'Renamed'
+        self.author.save()
+        response = self.client.get(self.url, {'search': 'Author One'})
+        self.assertEqual(response.data, [])
+
+    def test_evicted_version_does_not_revive_old_entries(self):
+        cache.delete('api:version:book')
+        self.client.get(self.url)
+        Book.objects.create(title='Book Two', publication_year=2021, author=self.author)
+        self.assertEqual(len(self.client.get(self.url).data), 2)
+        # evicted, then read: must not go back to the version the first list used
+        cache.delete('api:version:book')
+        self.assertEqual(len(self.client.get(self.url).data), 2)
+        # evicted, then bumped: must not land on a version already used either
+        cache.delete('api:version:book')
+        Book.objects.create(title='Book Three', publication_year=2022, author=self.author)
+        self.assertEqual(len(self.client.get(self.url).data), 3)
+
+    def test_cached_etag_answers_304(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+    def test_stats_for_admins(self):
+        self.client.get(self.url)
+        self.client.get(self.url)
+        self.assertEqual(self.client.get(reverse('book-cache-stats')).status_code, status.HTTP_403_FORBIDDEN)
+        self.client.force_authenticate(User.objects.create_superuser('admin', password='pw'))
+        stats = self.client.get(reverse('book-cache-stats')).data
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
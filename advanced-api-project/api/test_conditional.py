@@ -0,0 +1,87 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.http import http_date
+from rest_framework.test import APITestCase
+from rest_framework import status
+from .models import Book, Author
+
+
+class ConditionalGetTestCase(APITestCase):
+
+    def setUp(self):
+        self.author = Author.objects.create(name='Author One')
+        self.book1 = Book.objects.create(title='Book One', publication_year=2020, author=self.author)
+        self.book2 = Book.objects.create(title='Book Two', publication_year=2021, author=self.author)
+        self.list_url = reverse('book-list')
+        self.detail_url = reverse('book-detail', kwargs={'pk': self.book1.id})
+
+    def test_list_304_when_unchanged(self):
+        etag = self.client.get(self.list_url)['ETag']
+        self.assertTrue(etag.startswith('W/'))
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        # one aggregate query at most (none if the list cache has it)
+        self.assertLessEqual(len(ctx.captured_queries), 1)
+
+    def test_list_etag_changes_on_update_and_delete(self):
+        etag = self.client.get(self.list_url)['ETag']
+        self.book2.title = 'Book Two Revised'
+        self.book2.save()
+        updated = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(updated.status_code, status.HTTP_200_OK)
+
+        self.book1.delete()
+        deleted = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=updated['ETag'])
+        self.assertEqual(deleted.status_code, status.HTTP_200_OK)
+
+    def test_list_etag_depends_on_query(self):
+        etag = self.client.get(self.list_url)['ETag']
+        response = self.client.get(self.list_url + '?ordering=-title', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_etag_changes_on_author_rename(self):
+        url = self.list_url + '?search=Author One'
+        etag = self.client.get(url)['ETag']
+        self.author.name = 'Someone Else'
+        self.author.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
+    def test_detail_if_none_match(self):
+        etag = self.client.get(self.detail_url)['ETag']
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_detail_etag_changes_on_expanded_author_rename(self):
+        url = self.detail_url + '?expand=author'
+        etag = self.client.get(url)['ETag']
+        self.author.name = 'Someone Else'
+        self.author.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['author']['name'], 'Someone Else')
+        # without the expansion the representation didn't change
+        etag = self.client.get(self.detail_url)['ETag']
+        self.author.save()
+        self.assertEqual(self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag).status_code,
+                         status.HTTP_304_NOT_MODIFIED)
+
+    def test_detail_if_modified_since(self):
+        first = self.client.get(self.detail_url)
+        self.assertIn('Last-Modified', first)
+        response = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        older = http_date(self.book1.updated_at.timestamp() - 60)
+        response = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=older)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_bulk_update_moves_etag(self):
+        etag = self.client.get(self.detail_url)['ETag']
+        self.client.force_authenticate(User.objects.create_user('u', password='p'))
+        self.client.patch(reverse('book-bulk'), [{'id': self.book1.id, 'publication_year': 1999}], format='json')
+        self.client.force_authenticate(None)
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -0,0 +1,53 @@
+from unittest import mock
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from .counting import BookListCounter
+from .models import Book, Author
+
+
+class BookListCountTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.author = Author.objects.create(name='Author One')
+        for i in range(8):
+            Book.objects.create(title=f'Book {i}', publication_year=2000 + i % 2, author=self.author)
+        self.url = reverse('book-list')
+
+    def test_small_lists_are_counted_exactly(self):
+        response = self.client.get(self.url + '?page_size=3&publication_year=2001')
+        self.assertEqual(response.data['count'], 4)
+        self.assertEqual(response.data['count_strategy'], 'exact')
+
+    @mock.patch.object(BookListCounter, 'exact_limit', 3)
+    def test_big_counts_are_cached_until_a_write(self):
+        first = self.client.get(self.url + '?page_size=3')
+        self.assertEqual((first.data['count'], first.data['count_strategy']), (8, 'exact'))
+
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get(first.data['next'])
+        self.assertEqual((second.data['count'], second.data['count_strategy']), (8, 'cached'))
+        self.assertFalse(any('COUNT(*)' in query['sql'] for query in queries.captured_queries))
+
+        # other filters get their own count
+        filtered = self.client.get(self.url + '?page_size=3&publication_year=2000')
+        self.assertEqual((filtered.data['count'], filtered.data['count_strategy']), (4, 'exact'))
+
+        Book.objects.create(title='Book 8', publication_year=2000, author=self.author)
+        third = self.client.get(first.data['next'])
+        self.assertEqual((third.data['count'], third.data['count_strategy']), (9, 'exact'))
+
+    @mock.patch.object(BookListCounter, 'exact_limit', 3)
+    @mock.patch.object(BookListCounter, 'estimate_over', 5)
+    def test_huge_unfiltered_list_is_estimated(self):
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        response = self.client.get(self.url + '?page_size=3')
+        self.assertEqual((response.data['count'], response.data['count_strategy']), (8, 'estimated'))
+
+        # sqlite has no estimate for a filtered list, so it is counted
+        response = self.client.get(self.url + '?page_size=3&search=Book')
+        self.assertEqual((response.data['count'], response.data['count_strategy']), (8, 'exact'))
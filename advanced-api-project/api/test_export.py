@@ -0,0 +1,70 @@
+import csv
+import io
+import json
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+from .models import Book, Author
+
+
+class BookExportTestCase(APITestCase):
+
+    def setUp(self):
+        self.author1 = Author.objects.create(name='Author One')
+        self.author2 = Author.objects.create(name='Author, Two')
+        Book.objects.create(title='Book One', publication_year=2020, author=self.author1)
+        Book.objects.create(title='Book "Two"', publication_year=2021, author=self.author2)
+        Book.objects.create(title='Book Three', publication_year=2021, author=self.author1)
+        self.url = reverse('book-export')
+
+    def content(self, response):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def test_ndjson_is_default(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in self.content(response).splitlines()]
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0], {
+            'id': rows[0]['id'], 'title': 'Book One', 'publication_year': 2020,
+            'author': self.author1.id, 'author_name': 'Author One',
+        })
+
+    def test_csv_via_accept_header(self):
+        response = self.client.get(self.url, HTTP_ACCEPT='text/csv')
+        self.assertIn('books.csv', response['Content-Disposition'])
+        rows = list(csv.reader(io.StringIO(self.content(response))))
+        self.assertEqual(rows[0], ['id', 'title', 'publication_year', 'author', 'author_name'])
+        self.assertEqual(rows[2][1:], ['Book "Two"', '2021', str(self.author2.id), 'Author, Two'])
+
+    def test_same_filters_as_list(self):
+        response = self.client.get(self.url, {'format': 'csv', 'publication_year': 2021, 'ordering': '-title'})
+        rows = list(csv.reader(io.StringIO(self.content(response))))[1:]
+        self.assertEqual([row[1] for row in rows], ['Book Three', 'Book "Two"'])
+
+    def test_search(self):
+        response = self.client.get(self.url, {'search': 'Three'})
+        rows = self.content(response).splitlines()
+        self.assertEqual([json.loads(line)['title'] for line in rows], ['Book Three'])
+
+    def test_rows_are_chunked(self):
+        Book.objects.bulk_create(
+            Book(title=f'Extra {i}', publication_year=2000, author=self.author1) for i in range(1200)
+        )
+        response = self.client.get(self.url)
+        chunks = list(response.streaming_content)
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(sum(chunk.count(b'\n') for chunk in chunks), 1203)
+
+    def test_invalid_filter_is_a_400_in_both_formats(self):
+        response = self.client.get(self.url + '?author=abc')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('author', json.loads(response.content))
+
+        response = self.client.get(self.url + '?format=csv&publication_year=x')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        rows = list(csv.reader(io.StringIO(response.content.decode('utf-8'))))
+        self.assertEqual(rows[0], ['publication_year'])
+        self.assertEqual(len(rows), 2)
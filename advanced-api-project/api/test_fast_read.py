@@ -0,0 +1,67 @@
+from unittest import mock
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+from .models import Book, Author
+from .search import get_search_backend
+from .serializers import BookSerializer, BookValuesSerializer
+from .views import BookListView
+
+
+class BookValuesSerializerTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.author1 = Author.objects.create(name='Author One')
+        self.author2 = Author.objects.create(name='Author Two')
+        for i in range(12):
+            Book.objects.create(
+                title=f'Book "{i:02d}" é', publication_year=1990 + i % 4,
+                author=self.author1 if i % 2 else self.author2,
+            )
+        get_search_backend().rebuild()
+        self.url = reverse('book-list')
+
+    def test_serializer_output_is_byte_identical(self):
+        books = Book.objects.order_by('id')
+        slow = JSONRenderer().render(BookSerializer(books, many=True).data)
+        fast = JSONRenderer().render(BookValuesSerializer(BookValuesSerializer.values(books), many=True).data)
+        self.assertEqual(fast, slow)
+
+        book = books.first()
+        slow = JSONRenderer().render(BookSerializer(book).data)
+        fast = JSONRenderer().render(BookValuesSerializer(BookValuesSerializer.values(books).first()).data)
+        self.assertEqual(fast, slow)
+
+    def get_both(self, query):
+        responses = []
+        for fast_read in (False, True):
+            cache.clear()
+            with mock.patch.object(BookListView, 'fast_read', fast_read):
+                responses.append(self.client.get(self.url + query))
+        return responses
+
+    def test_list_responses_are_byte_identical(self):
+        for query in ('', '?ordering=-title', '?author=%d' % self.author1.id, '?search=Book',
+                      '?page_size=5', '?page_size=5&ordering=title'):
+            with self.subTest(query=query):
+                slow, fast = self.get_both(query)
+                self.assertEqual(fast.status_code, 200)
+                self.assertEqual(fast.content, slow.content)
+                self.assertEqual(fast['ETag'], slow['ETag'])
+
+    def test_cursor_from_values_rows(self):
+        first = self.client.get(self.url + '?page_size=5')
+        second = self.client.get(first.data['next'])
+        with mock.patch.object(BookListView, 'fast_read', False):
+            cache.clear()
+            first_slow = self.client.get(self.url + '?page_size=5')
+        self.assertEqual(first.data['next'], first_slow.data['next'])
+        self.assertEqual([b['id'] for b in second.data['results']],
+                         list(Book.objects.order_by('publication_year', 'id').values_list('id', flat=True)[5:10]))
+
+    def test_skips_model_instances(self):
+        with mock.patch.object(Book, '__init__', side_effect=AssertionError('Book built')):
+            response = self.client.get(self.url + '?page_size=5')
+        self.assertEqual(response.status_code, 200)
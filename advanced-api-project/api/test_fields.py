@@ -0,0 +1,89 @@
+from unittest import mock
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from .models import Book, Author
+from .views import BookListView
+
+
+class SparseFieldsTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.author1 = Author.objects.create(name='Author One')
+        self.author2 = Author.objects.create(name='Author Two')
+        for i in range(6):
+            Book.objects.create(
+                title=f'Book {i}', publication_year=2000 + i % 3,
+                author=self.author1 if i % 2 else self.author2,
+            )
+        self.book = Book.objects.order_by('id').first()
+        self.url = reverse('book-list')
+
+    def get_both(self, url):
+        responses = []
+        for fast_read in (False, True):
+            cache.clear()
+            with mock.patch.object(BookListView, 'fast_read', fast_read), \
+                    CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            responses.append((response, queries))
+        return responses
+
+    def test_fields_trims_output_and_select(self):
+        for response, queries in self.get_both(self.url + '?fields=id,title'):
+            self.assertEqual(list(response.data[0]), ['id', 'title'])
+            select = queries.captured_queries[-1]['sql']
+            self.assertNotIn('publication_year', select)
+            self.assertNotIn('author_id', select)
+
+    def test_expand_author_in_one_query(self):
+        (slow, slow_queries), (fast, fast_queries) = self.get_both(self.url + '?expand=author')
+        self.assertEqual(fast.content, slow.content)
+        self.assertEqual(fast.data[0]['author'], {'id': self.author2.id, 'name': 'Author Two'})
+        # the ETag aggregate + one joined SELECT, however many books there are
+        self.assertEqual(len(slow_queries), 2)
+        self.assertEqual(len(fast_queries), 2)
+        self.assertIn('JOIN', slow_queries.captured_queries[-1]['sql'])
+
+    def test_fields_and_expand_are_byte_identical(self):
+        for query in ('?fields=title,author&expand=author', '?fields=title&expand=author',
+                      '?fields=id&page_size=2&ordering=-title'):
+            with self.subTest(query=query):
+                (slow, _), (fast, _) = self.get_both(self.url + query)
+                self.assertEqual(fast.content, slow.content)
+
+    def test_pagination_with_fields(self):
+        titles, url = [], self.url + '?fields=title&page_size=4&ordering=publication_year'
+        while url:
+            response = self.client.get(url)
+            titles += [book['title'] for book in response.data['results']]
+            self.assertEqual(list(response.data['results'][0]), ['title'])
+            url = response.data['next']
+        expected = list(Book.objects.order_by('publication_year', 'id').values_list('title', flat=True))
+        self.assertEqual(titles, expected)
+
+    def test_unknown_field(self):
+        response = self.client.get(self.url + '?fields=id,isbn')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('isbn', response.data['fields'])
+        response = self.client.get(self.url + '?expand=publisher')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_detail(self):
+        url = reverse('book-detail', kwargs={'pk': self.book.id})
+        response = self.client.get(url + '?fields=title,author&expand=author')
+        self.assertEqual(response.data, {'title': 'Book 0', 'author': {'id': self.author2.id, 'name': 'Author Two'}})
+        self.assertIn('ETag', response)
+
+    def test_author_fields_skip_prefetch(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('author-list') + '?fields=id,name')
+        self.assertEqual(response.data[0], {'id': self.author1.id, 'name': 'Author One'})
+        self.assertEqual(len(queries), 1)
+        response = self.client.get(reverse('author-list') + '?fields=id,books')
+        self.assertEqual(list(response.data[0]), ['id', 'books'])
@@ -0,0 +1,54 @@
+from unittest import skipUnless
+from importlib.util import find_spec
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+PROD = [
+    'api.hashers.TunedArgon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+]
+
+
+class HasherProfileTestCase(APITestCase):
+
+    def login(self):
+        return self.client.post(reverse('login'), {'username': 'reader', 'password': 'pass1234'})
+
+    def test_suite_uses_the_fast_profile(self):
+        self.assertEqual(settings.PASSWORD_HASHER_PROFILE, 'fast')
+        user = User.objects.create_user(username='reader', password='pass1234')
+        self.assertTrue(user.password.startswith('md5$'))
+
+    @skipUnless(find_spec('argon2'), 'argon2-cffi is not installed')
+    @override_settings(PASSWORD_HASHERS=PROD, ARGON2_TIME_COST=1, ARGON2_MEMORY_COST=8192, ARGON2_PARALLELISM=1)
+    def test_rehash_on_login_when_parameters_change(self):
+        user = User.objects.create_user(username='reader', password='pass1234')
+        self.assertIn('m=8192,t=1,p=1', user.password)
+
+        with self.settings(ARGON2_TIME_COST=2):
+            self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+        user.refresh_from_db()
+        self.assertIn('m=8192,t=2,p=1', user.password)
+
+        # unchanged parameters: no new hash
+        password = user.password
+        with self.settings(ARGON2_TIME_COST=2):
+            self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+        user.refresh_from_db()
+        self.assertEqual(user.password, password)
+
+    @skipUnless(find_spec('argon2'), 'argon2-cffi is not installed')
+    @override_settings(ARGON2_TIME_COST=1, ARGON2_MEMORY_COST=8192, ARGON2_PARALLELISM=1)
+    def test_older_hashes_are_upgraded_on_login(self):
+        with self.settings(PASSWORD_HASHERS=PROD[1:]):
+            user = User.objects.create_user(username='reader', password='pass1234')
+        self.assertTrue(user.password.startswith('pbkdf2_sha256$'))
+
+        with self.settings(PASSWORD_HASHERS=PROD):
+            self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('argon2$'))
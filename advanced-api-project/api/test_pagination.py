@@ -0,0 +1,56 @@
+from unittest import mock
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+from .models import Book, Author
+from .pagination import BookKeysetPagination
+
+
+class BookKeysetPaginationTestCase(APITestCase):
+
+    def setUp(self):
+        self.author = Author.objects.create(name='Author One')
+        # several books share a year so the id tie-breaker is exercised
+        for i in range(10):
+            Book.objects.create(title=f'Book {i:02d}', publication_year=2000 + i % 3, author=self.author)
+        self.url = reverse('book-list')
+
+    def walk(self, url):
+        titles = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            titles += [book['title'] for book in response.data['results']]
+            url = response.data['next']
+        return titles
+
+    def test_unpaginated_by_default(self):
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.data), 10)
+
+    def test_walk_by_year_matches_full_ordering(self):
+        expected = list(Book.objects.order_by('publication_year', 'id').values_list('title', flat=True))
+        self.assertEqual(self.walk(self.url + '?page_size=3'), expected)
+
+    def test_walk_by_title_desc(self):
+        expected = list(Book.objects.order_by('-title', '-id').values_list('title', flat=True))
+        self.assertEqual(self.walk(self.url + '?page_size=4&ordering=-title'), expected)
+
+    def test_previous_link_returns_prior_page(self):
+        first = self.client.get(self.url + '?page_size=3')
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+        self.assertEqual(back.data['results'], first.data['results'])
+
+    def test_works_with_filters(self):
+        titles = self.walk(self.url + '?page_size=2&publication_year=2001')
+        self.assertEqual(titles, ['Book 01', 'Book 04', 'Book 07'])
+
+    def test_page_size_is_capped(self):
+        with mock.patch.object(BookKeysetPagination, 'max_page_size', 4):
+            response = self.client.get(self.url + '?page_size=50')
+        self.assertEqual(len(response.data['results']), 4)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url + '?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,62 @@
+import datetime
+import decimal
+import json
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+from .models import Book, Author
+from .renderers import MessagePackRenderer, OrJSONRenderer
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class RendererTestCase(APITestCase):
+
+    data = {
+        'title': 'Caf\u00e9 \u2028 Book',
+        'published': datetime.date(2020, 1, 2),
+        'updated_at': datetime.datetime(2020, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc),
+        'naive': datetime.datetime(2020, 1, 2, 3, 4, 5),
+        'offset': datetime.datetime(2020, 1, 2, 3, 4, 5, tzinfo=datetime.timezone(datetime.timedelta(hours=2))),
+        'at': datetime.time(9, 30),
+        'price': decimal.Decimal('19.99'),
+        'ids': (1, 2, 3),
+        'nested': [{'year': 2020, 'none': None}],
+    }
+
+    def setUp(self):
+        cache.clear()
+        self.author = Author.objects.create(name='Author One')
+        Book.objects.create(title='Book One', publication_year=2020, author=self.author)
+        Book.objects.create(title='Book Two', publication_year=2021, author=self.author)
+
+    def test_orjson_matches_json_renderer(self):
+        self.assertEqual(OrJSONRenderer().render(self.data), JSONRenderer().render(self.data))
+
+    def test_orjson_indent_falls_back(self):
+        media_type = 'application/json; indent=4'
+        self.assertEqual(OrJSONRenderer().render(self.data, media_type), JSONRenderer().render(self.data, media_type))
+
+    def test_json_is_the_default(self):
+        response = self.client.get(reverse('book-list'))
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual([b['title'] for b in json.loads(response.content)], ['Book One', 'Book Two'])
+
+    def test_msgpack_by_accept_header(self):
+        if msgpack is None:
+            self.skipTest('msgpack is not installed')
+        response = self.client.get(reverse('book-list'), HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        json_response = self.client.get(reverse('book-list'))
+        self.assertEqual(msgpack.unpackb(response.content), json.loads(json_response.content))
+        self.assertNotEqual(response['ETag'], json_response['ETag'])
+
+    def test_msgpack_encodes_dates_and_decimals(self):
+        if msgpack is None:
+            self.skipTest('msgpack is not installed')
+        data = msgpack.unpackb(MessagePackRenderer().render(self.data))
+        self.assertEqual(data, json.loads(JSONRenderer().render(self.data)))
@@ -0,0 +1,73 @@
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from .models import Book, Author
+from .search import SQLiteFTSBackend, get_search_backend
+
+
+class BookSearchTestCase(APITestCase):
+
+    def setUp(self):
+        self.tolkien = Author.objects.create(name='J. R. R. Tolkien')
+        self.herbert = Author.objects.create(name='Frank Herbert')
+        self.hobbit = Book.objects.create(title='The Hobbit', publication_year=1937, author=self.tolkien)
+        self.rings = Book.objects.create(title='The Fellowship of the Ring', publication_year=1954, author=self.tolkien)
+        self.dune = Book.objects.create(title='Dune', publication_year=1965, author=self.herbert)
+        self.url = reverse('book-list')
+
+    def search(self, term):
+        response = self.client.get(self.url, {'search': term})
+        return [book['title'] for book in response.data]
+
+    def test_uses_fts_backend_on_sqlite(self):
+        self.assertIsInstance(get_search_backend(), SQLiteFTSBackend)
+        self.assertTrue(get_search_backend().is_available())
+
+    def test_substring_and_author_match(self):
+        self.assertEqual(self.search('obbi'), ['The Hobbit'])
+        self.assertCountEqual(self.search('tolkien'), ['The Hobbit', 'The Fellowship of the Ring'])
+
+    def test_all_terms_must_match(self):
+        self.assertEqual(self.search('ring tolkien'), ['The Fellowship of the Ring'])
+
+    def test_ranked_best_match_first(self):
+        Book.objects.create(title='Dune Messiah', publication_year=1969, author=self.herbert)
+        self.assertEqual(self.search('dune'), ['Dune', 'Dune Messiah'])
+
+    def test_short_terms_fall_back_to_icontains(self):
+        self.assertEqual(self.search('du'), ['Dune'])
+
+    def test_index_follows_author_rename_and_deletes(self):
+        self.herbert.name = 'Brian Herbert'
+        self.herbert.save()
+        self.assertEqual(self.search('brian'), ['Dune'])
+        self.dune.delete()
+        self.assertEqual(self.search('brian'), [])
+
+    def test_index_follows_title_update(self):
+        self.hobbit.title = 'There and Back Again'
+        self.hobbit.save()
+        self.assertEqual(self.search('hobbit'), [])
+        self.assertEqual(self.search('back again'), ['There and Back Again'])
+
+    def test_ordering_param_overrides_rank(self):
+        response = self.client.get(self.url, {'search': 'the', 'ordering': '-publication_year'})
+        self.assertEqual([b['title'] for b in response.data], ['The Fellowship of the Ring', 'The Hobbit'])
+
+    def test_paginated_search_keeps_rank(self):
+        Book.objects.create(title='Dune Messiah', publication_year=1969, author=self.herbert)
+        # published first, ranked last: year order would put it first
+        Book.objects.create(title='Children of Dune', publication_year=1900, author=self.herbert)
+        ranked = self.search('dune')
+        self.assertEqual(ranked[-1], 'Children of Dune')
+        titles, url = [], self.url + '?search=dune&page_size=1'
+        while url:
+            response = self.client.get(url)
+            titles += [book['title'] for book in response.data['results']]
+            url = response.data['next']
+        self.assertEqual(titles, ranked)
+        # and back again from the last page
+        previous = self.client.get(response.data['previous'])
+        self.assertEqual([b['title'] for b in previous.data['results']], ranked[1:2])
+        first = self.client.get(previous.data['previous'])
+        self.assertEqual([b['title'] for b in first.data['results']], ranked[:1])
+        self.assertIsNone(first.data['previous'])
@@ -0,0 +1,89 @@
+from io import StringIO
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+from .models import Author, AuthorStats, Book, YearStats
+
+
+class BookStatsTestCase(APITestCase):
+
+    def setUp(self):
+        self.one = Author.objects.create(name='Author One')
+        self.two = Author.objects.create(name='Author Two')
+        for i in range(3):
+            Book.objects.create(title=f'One {i}', publication_year=2000 + i % 2, author=self.one)
+        Book.objects.create(title='Two 0', publication_year=2001, author=self.two)
+
+    def author_counts(self):
+        return dict(AuthorStats.objects.filter(book_count__gt=0).values_list('author_id', 'book_count'))
+
+    def year_counts(self):
+        return dict(YearStats.objects.filter(book_count__gt=0).values_list('year', 'book_count'))
+
+    def assertMatchesBooks(self):
+        books = Book.objects.order_by()
+        self.assertEqual(self.author_counts(), {
+            author: books.filter(author=author).count() for author in books.values_list('author', flat=True)
+        })
+        self.assertEqual(self.year_counts(), {
+            year: books.filter(publication_year=year).count() for year in books.values_list('publication_year', flat=True)
+        })
+
+    def test_counts_follow_creates(self):
+        self.assertEqual(self.author_counts(), {self.one.id: 3, self.two.id: 1})
+        self.assertEqual(self.year_counts(), {2000: 2, 2001: 2})
+
+    def test_counts_follow_updates_and_deletes(self):
+        book = Book.objects.get(title='One 0')
+        book.author, book.publication_year = self.two, 1999
+        book.save()
+        # a book built by hand with an existing id is looked up first
+        Book(id=book.id, title='One 0', publication_year=2005, author=self.two).save()
+        Book.objects.get(title='One 1').delete()
+        self.assertEqual(self.author_counts(), {self.one.id: 1, self.two.id: 2})
+        self.assertMatchesBooks()
+
+    def test_deleting_an_author(self):
+        self.one.delete()
+        self.assertEqual(self.author_counts(), {self.two.id: 1})
+        self.assertEqual(self.year_counts(), {2001: 1})
+
+    def test_bulk_endpoint_keeps_counts(self):
+        self.client.force_authenticate(user=User.objects.create_user(username='testuser', password='testpass'))
+        url = reverse('book-bulk')
+        items = [{'title': f'Bulk {i}', 'publication_year': 2010, 'author': self.two.id} for i in range(5)]
+        self.client.post(url, items, format='json')
+        ids = list(Book.objects.filter(title__startswith='Bulk').values_list('id', flat=True))
+        self.client.patch(url, [{'id': pk, 'author': self.one.id} for pk in ids[:2]], format='json')
+        self.client.delete(url, ids[2:4], format='json')
+        self.assertEqual(self.year_counts()[2010], 3)
+        self.assertMatchesBooks()
+
+    def test_rebuild_command(self):
+        Book.objects.filter(author=self.one).update(publication_year=1990)  # skips signals
+        call_command('rebuild_book_stats', stdout=StringIO())
+        self.assertEqual(self.year_counts(), {1990: 3, 2001: 1})
+        self.assertMatchesBooks()
+
+    def test_endpoints_read_the_summary_tables(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('author-stats-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0], {'author': self.one.id, 'author_name': 'Author One', 'book_count': 3})
+        self.assertFalse(any('api_book' in query['sql'] for query in ctx.captured_queries))
+
+        response = self.client.get(reverse('year-stats'))
+        self.assertEqual(response.data, [{'year': 2000, 'book_count': 2}, {'year': 2001, 'book_count': 2}])
+
+    def test_author_detail(self):
+        response = self.client.get(reverse('author-stats-detail', args=[self.two.id]))
+        self.assertEqual(response.data['book_count'], 1)
+        empty = Author.objects.create(name='No Books')
+        response = self.client.get(reverse('author-stats-detail', args=[empty.id]))
+        self.assertEqual(response.data['book_count'], 0)
+        response = self.client.get(reverse('author-stats-detail', args=[9999]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,94 @@
+from unittest import mock
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+from . import throttling
+from .models import Author
+
+
+def rates(**rates):
+    return override_settings(REST_FRAMEWORK=dict(settings.REST_FRAMEWORK, DEFAULT_THROTTLE_RATES=rates))
+
+
+class ThrottlingTestCase(APITestCase):
+
+    def setUp(self):
+        throttling.get_counter_backend().clear()
+        cache.clear()
+        self.author = Author.objects.create(name='Author One')
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.token = Token.objects.create(user=self.user)
+        self.other_token = Token.objects.create(user=User.objects.create_user(username='other', password='testpass'))
+
+    def create(self, token, n):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+        return self.client.post(reverse('book-create'), {
+            'title': f'Book {token.key[:6]} {n}', 'publication_year': 2000, 'author': self.author.id,
+        }, format='json')
+
+    @rates(login_ip='3/min')
+    def test_login_is_limited_per_ip(self):
+        data = {'username': 'testuser', 'password': 'testpass'}
+        for _ in range(3):
+            self.assertEqual(self.client.post(reverse('login'), data).status_code, status.HTTP_200_OK)
+        response = self.client.post(reverse('login'), data)
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertGreaterEqual(int(response['Retry-After']), 1)
+        # another address has its own budget
+        response = self.client.post(reverse('login'), data, REMOTE_ADDR='10.0.0.2')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @rates(write_token='2/min', write_ip='5/min')
+    def test_writes_are_limited_per_token_and_per_ip(self):
+        self.assertEqual([self.create(self.token, n).status_code for n in range(3)], [201, 201, 429])
+        self.assertEqual([self.create(self.other_token, n).status_code for n in range(3)], [201, 201, 429])
+        # the IP budget (5) was spent by the two tokens' attempts
+        third = Token.objects.create(user=User.objects.create_user(username='third', password='testpass'))
+        self.assertEqual(self.create(third, 0).status_code, 429)
+
+    @rates(login_ip='0/min')
+    def test_zero_rate_blocks_the_scope(self):
+        response = self.client.post(reverse('login'), {'username': 'testuser', 'password': 'testpass'})
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response['Retry-After'], '60')
+
+    @rates(login_ip='3/min')
+    def test_reads_and_unscoped_views_are_not_limited(self):
+        for _ in range(5):
+            self.assertEqual(self.client.get(reverse('book-list')).status_code, status.HTTP_200_OK)
+
+    @rates(write_token='10/min')
+    def test_sliding_window(self):
+        start = 6000.0  # the start of a 60s window
+        with mock.patch('api.throttling.time.time', return_value=start + 50):
+            self.assertEqual({self.create(self.token, n).status_code for n in range(10)}, {201})
+            self.assertEqual(self.create(self.token, 10).status_code, 429)
+        # 30s into the next window half of the last one still counts: room for 5
+        with mock.patch('api.throttling.time.time', return_value=start + 90):
+            codes = [self.create(self.token, n).status_code for n in range(20, 26)]
+        self.assertEqual(codes, [201] * 5 + [429])
+
+    @rates(login_ip='1/min')
+    def test_metrics(self):
+        data = {'username': 'testuser', 'password': 'testpass'}
+        self.client.post(reverse('login'), data)
+        self.client.post(reverse('login'), data)
+        self.client.post(reverse('login'), data)
+        admin = User.objects.create_superuser(username='admin', password='adminpass')
+        self.client.force_authenticate(user=admin)
+        response = self.client.get(reverse('throttle-stats'))
+        self.assertEqual(response.data['login_ip'], {'rate': '1/min', 'allowed': 1, 'throttled': 2})
+
+    @rates(login_ip='2/min')
+    @override_settings(API_THROTTLE_BACKEND='api.throttling.CacheCounters')
+    def test_cache_backend(self):
+        with mock.patch.object(throttling, '_backend', None):
+            self.assertIsInstance(throttling.get_counter_backend(), throttling.CacheCounters)
+            data = {'username': 'testuser', 'password': 'testpass'}
+            codes = [self.client.post(reverse('login'), data).status_code for _ in range(3)]
+        self.assertEqual(codes, [200, 200, 429])
@@ -0,0 +1,114 @@
+import threading
+from unittest import mock
+from django.contrib.auth.models import User
+from django.db import IntegrityError, connection
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from .models import Book, Author
+
+
+class UniqueTitleTestCase(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.author = Author.objects.create(name='Author One')
+        self.book = Book.objects.create(title='Dune', publication_year=1965, author=self.author)
+        self.client.force_authenticate(user=self.user)
+
+    def post(self, title):
+        return self.client.post(reverse('book-create'), {
+            'title': title, 'publication_year': 2000, 'author': self.author.id,
+        }, format='json')
+
+    def test_duplicate_is_a_400_without_a_lookup_first(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post('Dune')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {'title': ['A book with this title already exists.']})
+        sql = [query['sql'] for query in queries.captured_queries]
+        insert = next(i for i, query in enumerate(sql) if query.startswith('INSERT INTO "api_book"'))
+        # the title is only looked up after the INSERT failed, to confirm the clash
+        self.assertFalse(any('"api_book"."title" = ' in query for query in sql[:insert]))
+        self.assertTrue(any('"api_book"."title" = ' in query for query in sql[insert:]))
+
+    def test_duplicate_on_update(self):
+        other = Book.objects.create(title='Emma', publication_year=1815, author=self.author)
+        response = self.client.patch(reverse('book-update', kwargs={'pk': other.id}), {'title': 'Dune'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('title', response.data)
+
+    def test_titles_differing_in_case_are_allowed_by_default(self):
+        self.assertEqual(self.post('dune').status_code, status.HTTP_201_CREATED)
+
+    @override_settings(BOOK_UNIQUE_NORMALIZED_TITLE=True)
+    def test_normalized_titles(self):
+        self.book.save()
+        self.assertEqual(Book.objects.get(pk=self.book.pk).title_key, 'dune')
+        for title in ('dune', '  DUNE ', 'Ｄｕｎｅ'):
+            with self.subTest(title=title):
+                response = self.post(title)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertEqual(response.data, {'title': ['A book with this title already exists.']})
+        self.assertEqual(self.post('Dune Messiah').status_code, status.HTTP_201_CREATED)
+
+    @override_settings(BOOK_UNIQUE_NORMALIZED_TITLE=True)
+    def test_normalized_titles_in_bulk(self):
+        self.book.save()
+        response = self.client.post(reverse('book-bulk'), [
+            {'title': 'DUNE', 'publication_year': 2000, 'author': self.author.id},
+            {'title': 'Emma', 'publication_year': 2000, 'author': self.author.id},
+            {'title': 'emma', 'publication_year': 2000, 'author': self.author.id},
+        ], format='json')
+        self.assertEqual([error['index'] for error in response.data['errors']], [0, 2])
+        self.assertEqual(Book.objects.get(title='Emma').title_key, 'emma')
+
+
+    def test_other_integrity_errors_are_not_title_clashes(self):
+        # the message mentions the title, but no other book holds it
+        error = IntegrityError('NOT NULL constraint failed: api_book.title')
+        with mock.patch.object(Book, 'save', side_effect=error), self.assertRaises(IntegrityError):
+            self.post('Emma')
+
+    def test_other_integrity_errors_in_bulk_are_not_title_clashes(self):
+        # e.g. the author was deleted between validation and the insert
+        with mock.patch.object(Book.objects, 'bulk_create', side_effect=IntegrityError('bulk')), \
+                mock.patch.object(Book, 'save', side_effect=IntegrityError('FOREIGN KEY constraint failed')), \
+                self.assertRaises(IntegrityError):
+            self.client.post(reverse('book-bulk'), [
+                {'title': 'Emma', 'publication_year': 2000, 'author': self.author.id},
+            ], format='json')
+
+
+class ConcurrentUniqueTitleTestCase(TransactionTestCase):
+    threads = 16
+
+    def test_many_threads_posting_the_same_title(self):
+        user = User.objects.create_user(username='testuser', password='testpass')
+        author = Author.objects.create(name='Author One')
+        barrier = threading.Barrier(self.threads)
+        statuses, lock = [], threading.Lock()
+
+        def post():
+            client = APIClient()
+            client.force_authenticate(user=user)
+            barrier.wait()
+            try:
+                response = client.post(reverse('book-create'), {
+                    'title': 'Same Title', 'publication_year': 2000, 'author': author.id,
+                }, format='json')
+                with lock:
+                    statuses.append(response.status_code)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=post) for _ in range(self.threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(statuses), [201] + [400] * (self.threads - 1))
+        self.assertEqual(Book.objects.filter(title='Same Title').count(), 1)
@@ -0,0 +1,216 @@
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+from rest_framework.authtoken.models import Token
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+class LocalCounters:
+    '''
+    counters in process memory: key -> (count, expires).
+    each worker process limits on its own, so with N workers a client
+    gets up to N times the rate; use CacheCounters to share them.
+    '''
+    sweep_every = 1000
+
+    def __init__(self):
+        self.counters = {}
+        self.lock = threading.Lock()
+        self.writes = 0
+
+    def get_many(self, keys):
+        now = time.monotonic()
+        with self.lock:
+            entries = [(key, self.counters.get(key)) for key in keys]
+        return {key: entry[0] for key, entry in entries if entry is not None and entry[1] > now}
+
+    def incr(self, key, ttl=None):
+        now = time.monotonic()
+        expires = now + ttl if ttl else math.inf
+        with self.lock:
+            count, old_expires = self.counters.get(key, (0, expires))
+            if old_expires <= now:
+                count, old_expires = 0, expires
+            self.counters[key] = (count + 1, old_expires)
+            # expired windows are dropped every `sweep_every` writes,
+            # so the cost per request stays constant
+            self.writes += 1
+            if self.writes % self.sweep_every == 0:
+                self.counters = {k: v for k, v in self.counters.items() if v[1] > now}
+            return count + 1
+
+    def clear(self):
+        with self.lock:
+            self.counters.clear()
+
+
+class CacheCounters:
+    '''
+    counters in a django cache (settings.API_THROTTLE_CACHE, default
+    'default'), shared by every process using it when it's redis or
+    memcached. add() + incr() are atomic there.
+    '''
+
+    def __init__(self):
+        self.cache = caches[getattr(settings, 'API_THROTTLE_CACHE', 'default')]
+
+    def get_many(self, keys):
+        return self.cache.get_many(keys)
+
+    def incr(self, key, ttl=None):
+        if self.cache.add(key, 1, ttl):
+            return 1
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            # expired between add() and incr()
+            self.cache.add(key, 1, ttl)
+            return 1
+
+    def clear(self):
+        pass
+
+
+_backend = None
+
+
+def get_counter_backend():
+    '''
+    the counter backend named by settings.API_THROTTLE_BACKEND
+    (dotted path), LocalCounters by default
+    '''
+    global _backend
+    if _backend is None:
+        path = getattr(settings, 'API_THROTTLE_BACKEND', 'api.throttling.LocalCounters')
+        _backend = import_string(path)()
+    return _backend
+
+
+def record(rate_key, outcome):
+    get_counter_backend().incr(f'throttle:metrics:{rate_key}:{outcome}')
+
+
+def get_stats():
+    '''
+    allowed / throttled requests per configured rate, since the counters started
+    '''
+    rates = api_settings.DEFAULT_THROTTLE_RATES or {}
+    keys = [f'throttle:metrics:{rate_key}:{outcome}' for rate_key in rates for outcome in ('allowed', 'throttled')]
+    counts = get_counter_backend().get_many(keys)
+    return {
+        rate_key: {
+            'rate': rate,
+            'allowed': counts.get(f'throttle:metrics:{rate_key}:allowed', 0),
+            'throttled': counts.get(f'throttle:metrics:{rate_key}:throttled', 0),
+        }
+        for rate_key, rate in rates.items()
+    }
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    '''
+    sliding-window rate limit, scoped by the view's `throttle_scope`.
+    the rate comes from DEFAULT_THROTTLE_RATES['<scope>_<kind>'], e.g.
+    'write_token': '120/min'; a view without a scope, or a scope without
+    a rate, isn't limited.
+
+    instead of a timestamp per request (SimpleRateThrottle) it keeps two
+    counters per client, this window and the last one, and weighs the last
+    by how much of it still overlaps the sliding window. that's two reads
+    and one increment per request, whatever the rate.
+    '''
+    kind = None
+
+    def get_client_id(self, request):
+        '''
+        who is being limited, or None to skip this throttle
+        '''
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        scope = getattr(view, 'throttle_scope', None)
+        if scope is None:
+            return True
+        self.rate_key = f'{scope}_{self.kind}'
+        rate = (api_settings.DEFAULT_THROTTLE_RATES or {}).get(self.rate_key)
+        client_id = self.get_client_id(request)
+        if rate is None or client_id is None:
+            return True
+
+        self.limit, self.window = self.parse_rate(rate)
+        now = time.time()
+        current = int(now // self.window)
+        self.elapsed = now - current * self.window
+        key = f'throttle:{self.rate_key}:{client_id}:'
+        counts = get_counter_backend().get_many([key + str(current - 1), key + str(current)])
+        self.previous = counts.get(key + str(current - 1), 0)
+        self.current = counts.get(key + str(current), 0)
+
+        if self.estimate(self.elapsed) >= self.limit:
+            record(self.rate_key, 'throttled')
+            return False
+        get_counter_backend().incr(key + str(current), ttl=2 * self.window)
+        record(self.rate_key, 'allowed')
+        return True
+
+    def parse_rate(self, rate):
+        '''
+        '120/min' -> (120, 60)
+        '''
+        num, period = rate.split('/')
+        return int(num), PERIODS[period[0]]
+
+    def estimate(self, elapsed):
+        weight = 1 - elapsed / self.window
+        return self.previous * weight + self.current
+
+    def wait(self):
+        '''
+        seconds until the estimate drops below the limit again
+        '''
+        if self.limit <= 0:
+            # a '0/min' rate blocks the scope outright; waiting won't help
+            return self.window
+        room = self.limit - 1
+        if self.current <= room:
+            # the last window's share has to shrink enough
+            seconds = self.window * (1 - (room - self.current) / self.previous) - self.elapsed
+        else:
+            # wait for this window to become the last one, then for it to shrink
+            # (current > room >= 0 here, so current is never 0)
+            seconds = self.window - self.elapsed + self.window * (1 - room / self.current)
+        return max(1, math.ceil(seconds))
+
+
+class TokenRateThrottle(SlidingWindowThrottle):
+    '''
+    limits each API token (or, for session/basic auth, each user)
+    '''
+    kind = 'token'
+
+    def get_client_id(self, request):
+        if isinstance(request.auth, Token):
+            # don't keep raw tokens in cache keys
+            return 't' + hashlib.md5(request.auth.key.encode('ascii')).hexdigest()
+        if request.user and request.user.is_authenticated:
+            return f'u{request.user.pk}'
+        return None
+
+
+class IPRateThrottle(SlidingWindowThrottle):
+    '''
+    limits each client IP (REMOTE_ADDR, or X-Forwarded-For behind
+    NUM_PROXIES proxies)
+    '''
+    kind = 'ip'
+
+    def get_client_id(self, request):
+        return self.get_ident(request)
@@ -5,8 +5,18 @@ from .views import (
     BookCreateView,
     BookDeleteView,
     BookUpdateView,
+    BookBulkView,
+    BookExportView,
+    BookListCacheStatsView,
+    ThrottleStatsView,
+    AuthorListView,
+    AuthorDetailView,
+    AuthorStatsListView,
+    AuthorStatsDetailView,
+    YearStatsView,
 )
 from .auth_views import RegisterView, LoginView,LogoutView
+from . import async_views
 
 urlpatterns = [
     path("books/", BookListView.as_view(), name="book-list"),
@@ -14,8 +24,19 @@ urlpatterns = [
     path("books/create/", BookCreateView.as_view(), name="book-create"),
     path("books/update/<int:pk>/", BookUpdateView.as_view(), name="book-update"),
     path("books/delete/<int:pk>/", BookDeleteView.as_view(), name='book-delete'),
+    path("books/cache-stats/", BookListCacheStatsView.as_view(), name="book-cache-stats"),
+    path("books/async/", async_views.book_list, name="book-list-async"),
+    path("books/async/<int:pk>/", async_views.book_detail, name="book-detail-async"),
+    path("books/export/", BookExportView.as_view(), name="book-export"),
+    path("books/bulk/", BookBulkView.as_view(), name="book-bulk"),
+    path("authors/", AuthorListView.as_view(), name="author-list"),
+    path("authors/<int:pk>/", AuthorDetailView.as_view(), name="author-detail"),
+    path("stats/authors/", AuthorStatsListView.as_view(), name="author-stats-list"),
+    path("stats/authors/<int:pk>/", AuthorStatsDetailView.as_view(), name="author-stats-detail"),
+    path("stats/years/", YearStatsView.as_view(), name="year-stats"),
     path("register/", RegisterView.as_view(), name='register'),
     path('login/', LoginView.as_view(), name='login'),
     path('logout/', LogoutView.as_view(), name='logout'),
+    path('throttle-stats/', ThrottleStatsView.as_view(), name='throttle-stats'),
 ]
 
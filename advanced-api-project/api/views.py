@@ -1,27 +1,45 @@
 from django.shortcuts import render
 from rest_framework import generics,permissions,filters
-from .models import Book,Author
-from .serializers import BookSerializer
+from itertools import islice
+from django.db import router
+from django.db.models import Prefetch
+from rest_framework import status
+from rest_framework.parsers import JSONParser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from .models import Book,Author,AuthorStats,YearStats
+from .serializers import (
+    BookSerializer, AuthorSerializer, BookBulkSerializer, BookValuesSerializer,
+    AuthorStatsSerializer, YearStatsSerializer,
+)
+from .parsers import NDJSONParser
+from .signals import books_bulk_saved
+from .conditional import ConditionalListMixin, ConditionalRetrieveMixin
+from .cache import CachedListMixin, get_stats
+from . import throttling
+from .pagination import BookKeysetPagination
+from .search import BookSearchFilter
+from .renderers import CSVRenderer, NDJSONRenderer
+from django.http import StreamingHttpResponse
 from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated 
 from django_filters.rest_framework import DjangoFilterBackend
 from django_filters import rest_framework
 
-# List View
-class BookListView(generics.ListAPIView):
+class BookFilterMixin:
     '''
-    returns a list of all books.
-    this view is read-only, so permissions allow anyone to access it.
+    the book queryset plus the filtering/search/ordering setup,
+    shared by the list and export views so both accept the same params
     '''
     queryset = Book.objects.all()
-    serializer_class = BookSerializer
-    permission_classes = [permissions.AllowAny] #everyone can read
 
     def get_queryset(self):
         '''
-        allow filtering by year
+        allow filtering by year.
+        ordered by id unless ?ordering=, search or the paginator say otherwise,
+        so which index the database happens to scan can't reorder the list
         '''
-        queryset=Book.objects.all()
+        queryset=Book.objects.order_by('id')
         year = self.request.query_params.get("year")
         if year:
             queryset = queryset.filter(publication_year=year)
@@ -30,7 +48,7 @@ class BookListView(generics.ListAPIView):
     # Enable filtering,searching,ordering
     filter_backends = [
         DjangoFilterBackend,
-        filters.SearchFilter,
+        BookSearchFilter,
         filters.OrderingFilter,
     ]
 
@@ -44,16 +62,162 @@ class BookListView(generics.ListAPIView):
     ordering_fields = ['title', 'publication_year']
 
 
+class SparseFieldsMixin:
+    '''
+    ?fields=id,title  only returns those fields
+    ?expand=author    inlines a related object instead of its id
+    the names are checked against serializer_class; anything else is a 400.
+    views narrow their queryset to match in filter_queryset / get_queryset.
+    '''
+    fields_param = 'fields'
+    expand_param = 'expand'
+    expandable = []
+
+    def get_field_options(self):
+        if not hasattr(self, '_field_options'):
+            known = list(self.serializer_class().fields)
+            self._field_options = {
+                'fields': self.parse_names(self.fields_param, known),
+                'expand': self.parse_names(self.expand_param, self.expandable) or [],
+            }
+        return self._field_options
+
+    def parse_names(self, param, allowed):
+        names = [name.strip() for name in self.request.query_params.get(param, '').split(',') if name.strip()]
+        unknown = [name for name in names if name not in allowed]
+        if unknown:
+            raise ValidationError({param: f'Unknown field(s): {", ".join(unknown)}. Choose from: {", ".join(allowed)}.'})
+        return names or None
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.update(self.get_field_options())
+        return super().get_serializer(*args, **kwargs)
+
+
+class BookFieldsMixin(SparseFieldsMixin):
+    '''
+    sparse fieldsets for books: only() the requested columns, and
+    select_related the author when it is expanded.
+    `required_columns` are always read (e.g. updated_at for the ETag).
+    '''
+    expandable = ['author']
+    required_columns = []
+
+    def get_required_columns(self):
+        columns = list(self.required_columns)
+        if hasattr(self.paginator, 'get_keyset_columns'):
+            columns += self.paginator.get_keyset_columns(self.request)
+        return columns
+
+    def expands_author(self):
+        fields, expand = self.get_field_options()['fields'], self.get_field_options()['expand']
+        return 'author' in expand and (fields is None or 'author' in fields)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        fields = self.get_field_options()['fields']
+        expand_author = self.expands_author()
+        if expand_author:
+            queryset = queryset.select_related('author')
+        if fields is None and not expand_author:
+            return queryset
+
+        columns = list(fields or BookSerializer.Meta.fields)
+        if expand_author:
+            # updated_at: an expanded author is part of the ETag too
+            columns += ['author__id', 'author__name', 'author__updated_at']
+        return queryset.only(*columns, *self.get_required_columns())
+
+
+class FastReadMixin(BookFieldsMixin):
+    '''
+    serves GET requests from values() rows through BookValuesSerializer
+    instead of building Book instances for BookSerializer.
+    set fast_read = False on a view to go back to the model serializer.
+    '''
+    fast_read = True
+    fast_serializer_class = BookValuesSerializer
+
+    def use_fast_read(self):
+        return self.fast_read and self.request.method in permissions.SAFE_METHODS
+
+    def get_serializer_class(self):
+        if self.use_fast_read():
+            return self.fast_serializer_class
+        return super().get_serializer_class()
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.use_fast_read():
+            # values() drops the only() / select_related above and joins the author itself
+            queryset = self.fast_serializer_class.values(
+                queryset, extra=self.get_required_columns(), **self.get_field_options()
+            )
+        return queryset
+
+
+# List View
+class BookListView(FastReadMixin, CachedListMixin, ConditionalListMixin, BookFilterMixin, generics.ListAPIView):
+    '''
+    returns a list of all books.
+    this view is read-only, so permissions allow anyone to access it.
+    pass ?page_size= or ?cursor= to get keyset pages instead of the full list.
+    sends an ETag and answers If-None-Match with 304.
+    responses are cached per normalized query until a book or author changes.
+    rows are read with values() and serialized by BookValuesSerializer.
+    ?fields= and ?expand=author trim or widen each book.
+    '''
+    serializer_class = BookSerializer
+    permission_classes = [permissions.AllowAny] #everyone can read
+    pagination_class = BookKeysetPagination
+
+
+# Export View
+class BookExportView(BookFilterMixin, generics.GenericAPIView):
+    '''
+    streams the whole (filtered) catalogue as NDJSON or CSV.
+    pick the format with the Accept header or ?format=ndjson|csv.
+    rows are read with values_list().iterator(), so memory use stays the
+    same however many books there are.
+    '''
+    permission_classes = [permissions.AllowAny]
+    renderer_classes = [NDJSONRenderer, CSVRenderer]
+    pagination_class = None
+    chunk_size = 2000
+    columns = ['id', 'title', 'publication_year', 'author', 'author__name']
+
+    def get(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = queryset.values_list(*self.columns).iterator(chunk_size=self.chunk_size)
+
+        renderer = request.accepted_renderer
+        header = [column.replace('author__name', 'author_name') for column in self.columns]
+        response = StreamingHttpResponse(
+            renderer.stream(header, rows), content_type=request.accepted_media_type
+        )
+        response['Content-Disposition'] = f'attachment; filename="books.{renderer.format}"'
+        return response
+
+
 # DetailView
-class BookDetailView(generics.RetrieveAPIView):
+class BookDetailView(BookFieldsMixin, ConditionalRetrieveMixin, generics.RetrieveAPIView):
     '''
     returns a single book by ID/pk.
     also read-only for general access.
+    answers If-None-Match / If-Modified-Since with 304.
+    takes ?fields= and ?expand=author like the list.
     '''
     queryset = Book.objects.all()
+    required_columns = ['updated_at']
     serializer_class = BookSerializer
     permission_classes = [permissions.AllowAny] #everyone can read
 
+    def get_last_modified(self, instance):
+        # renaming an expanded author changes the response too
+        if self.expands_author():
+            return max(instance.updated_at, instance.author.updated_at)
+        return instance.updated_at
+
 
 class BookCreateView(generics.CreateAPIView):
     """
@@ -64,15 +228,14 @@ class BookCreateView(generics.CreateAPIView):
     queryset = Book.objects.all()
     serializer_class = BookSerializer
     permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = 'write'
 
     def perform_create(self, serializer):
         '''
         Hook to modify creation behavior if needed.
-        For now, it just saves the serializer.
+        duplicate titles are rejected by the unique index on Book.title:
+        BookSerializer turns the IntegrityError into the usual 400.
         '''
-        title = serializer.validated_data['title']
-        if Book.objects.filter(title=title).exists():
-            raise ValidationError('A book with this title already exists.')
         serializer.save()
 
 
@@ -86,6 +249,7 @@ class BookUpdateView(generics.UpdateAPIView):
     queryset = Book.objects.all()
     serializer_class = BookSerializer
     permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = 'write'
 
     def perform_update(self, serializer):
         '''
@@ -103,5 +267,190 @@ class BookDeleteView(generics.DestroyAPIView):
     queryset = Book.objects.all()
     serializer_class = BookSerializer
     permission_classes = [permissions.IsAuthenticated]
-    
+    throttle_scope = 'write'
+
+
+class BookListCacheStatsView(APIView):
+    '''
+    hit/miss counters and model versions of the book list cache.
+    admins only.
+    '''
+    permission_classes = [permissions.IsAdminUser]
 
+    def get(self, request):
+        return Response(get_stats())
+
+
+class ThrottleStatsView(APIView):
+    '''
+    allowed / throttled request counts per throttle rate.
+    admins only.
+    '''
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response(throttling.get_stats())
+
+
+# <------------BULK VIEW---------->
+class BookBulkView(generics.GenericAPIView):
+    '''
+    batch create / update / delete for books.
+    accepts a JSON array or an NDJSON stream (application/x-ndjson).
+
+    POST:   [{"title", "publication_year", "author"}, ...]
+    PATCH:  [{"id", ...fields to change}, ...]
+    DELETE: [id, ...]
+
+    items are processed `batch_size` at a time; an invalid item is reported
+    under "errors" with its index and does not stop the rest of the batch.
+    only authenticated users can use it.
+    '''
+    queryset = Book.objects.all()
+    serializer_class = BookBulkSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = 'write'
+    parser_classes = [JSONParser, NDJSONParser]
+    batch_size = 1000
+
+    def get_batches(self):
+        items = self.request.data
+        if isinstance(items, dict) or isinstance(items, (str, bytes)):
+            raise ValidationError('Expected a list of items.')
+        items = iter(items)
+        offset = 0
+        while True:
+            batch = list(islice(items, self.batch_size))
+            if not batch:
+                return
+            yield offset, batch
+            offset += len(batch)
+
+    def bulk_response(self, done_key, done_count, errors):
+        errors = [{'index': index, 'errors': detail} for index, detail in sorted(errors.items())]
+        if not errors:
+            code = status.HTTP_201_CREATED if done_key == 'created' else status.HTTP_200_OK
+        elif done_count:
+            code = status.HTTP_207_MULTI_STATUS
+        else:
+            code = status.HTTP_400_BAD_REQUEST
+        return Response({done_key: done_count, 'errors': errors}, status=code)
+
+    def save_batches(self, done_key, get_instances):
+        using = router.db_for_write(Book)
+        done, errors = 0, {}
+        for offset, batch in self.get_batches():
+            instances = get_instances(batch)
+            serializer = self.get_serializer(instances, data=batch, many=True, partial=instances is not None)
+            serializer.is_valid()
+            books = serializer.save()
+            done += len(books)
+            for index, detail in serializer.item_errors.items():
+                errors[offset + index] = detail
+            books_bulk_saved.send(sender=Book, books=books, book_ids=[book.pk for book in books], using=using)
+        return self.bulk_response(done_key, done, errors)
+
+    def post(self, request, *args, **kwargs):
+        return self.save_batches('created', lambda batch: None)
+
+    def patch(self, request, *args, **kwargs):
+        def get_instances(batch):
+            ids = [item.get('id') for item in batch if isinstance(item, dict)]
+            return Book.objects.in_bulk([pk for pk in ids if isinstance(pk, int)])
+        return self.save_batches('updated', get_instances)
+
+    def delete(self, request, *args, **kwargs):
+        deleted, errors = 0, {}
+        for offset, batch in self.get_batches():
+            ids = {pk for pk in batch if isinstance(pk, int) and not isinstance(pk, bool)}
+            found = set(Book.objects.filter(id__in=ids).values_list('id', flat=True))
+            for index, pk in enumerate(batch):
+                if pk not in found:
+                    errors[offset + index] = {'id': ['Book not found.']}
+            if found:
+                # a regular delete, so post_delete receivers still run per book
+                Book.objects.filter(id__in=found).delete()
+            deleted += len(found)
+        return self.bulk_response('deleted', deleted, errors)
+
+
+# <------------AUTHOR VIEWS---------->
+class AuthorQuerysetMixin(SparseFieldsMixin):
+    '''
+    builds the author queryset with the nested books loaded in one extra query,
+    so serializing N authors costs 2 queries instead of N+1.
+    ?books_year=YYYY only nests the books published that year.
+    ?fields= trims the authors; without `books` nothing is prefetched.
+    '''
+
+    def get_queryset(self):
+        authors = Author.objects.order_by('id')
+        fields = self.get_field_options()['fields']
+        if fields is not None:
+            authors = authors.only(*[name for name in fields if name != 'books'])
+            if 'books' not in fields:
+                return authors
+
+        # (author, id) order walks the author FK index, no sort needed
+        books = Book.objects.order_by('author', 'id')
+        year = self.request.query_params.get('books_year')
+        if year:
+            try:
+                books = books.filter(publication_year=int(year))
+            except ValueError:
+                raise ValidationError({'books_year': 'Must be a year, e.g. 2020.'})
+        return authors.prefetch_related(Prefetch('books', queryset=books))
+
+
+class AuthorListView(AuthorQuerysetMixin, generics.ListAPIView):
+    '''
+    returns all authors with their books nested.
+    read-only, anyone can access it.
+    '''
+    serializer_class = AuthorSerializer
+    permission_classes = [permissions.AllowAny]
+
+
+class AuthorDetailView(AuthorQuerysetMixin, generics.RetrieveAPIView):
+    '''
+    returns a single author with their books nested.
+    '''
+    serializer_class = AuthorSerializer
+    permission_classes = [permissions.AllowAny]
+
+
+# <------------STATS VIEWS---------->
+class AuthorStatsListView(generics.ListAPIView):
+    '''
+    books per author, most books first. read from the AuthorStats summary
+    table (kept in sync by signals), so it never scans the books.
+    authors without books are left out.
+    '''
+    queryset = AuthorStats.objects.filter(book_count__gt=0).select_related('author').order_by('-book_count', 'author_id')
+    serializer_class = AuthorStatsSerializer
+    permission_classes = [permissions.AllowAny]
+
+
+class AuthorStatsDetailView(generics.RetrieveAPIView):
+    '''
+    one author's book count: a primary key lookup.
+    '''
+    serializer_class = AuthorStatsSerializer
+    permission_classes = [permissions.AllowAny]
+
+    def get_object(self):
+        pk = self.kwargs['pk']
+        stats = AuthorStats.objects.select_related('author').filter(author_id=pk).first()
+        if stats is None:
+            # an author who never had a book has no row yet
+            stats = AuthorStats(author=generics.get_object_or_404(Author, pk=pk), book_count=0)
+        return stats
+
+
+class YearStatsView(generics.ListAPIView):
+    '''
+    books per publication year, oldest first, from the YearStats summary table.
+    '''
+    queryset = YearStats.objects.filter(book_count__gt=0).order_by('year')
+    serializer_class = YearStatsSerializer
+    permission_classes = [permissions.AllowAny]
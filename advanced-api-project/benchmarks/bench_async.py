@@ -0,0 +1,93 @@
+'''
+async vs sync book list under uvicorn.
+
+seeds a throwaway database, starts uvicorn on the project's ASGI
+application and hits the sync BookListView (/api/books/?page_size=N) and
+the async list (/api/books/async/?limit=N) with more and more concurrent
+keep-alive connections, reporting requests per second and p95 latency:
+
+    python benchmarks/bench_async.py --books 100000 --concurrency 1 16 64 256
+'''
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from common import PROJECT_DIR, Timer, percentile, seed_books, setup_django
+from loadtest import Client, run_scenario
+
+BENCH_DIR = Path(__file__).resolve().parent
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_uvicorn(db_path, port, workers):
+    env = dict(
+        os.environ,
+        BENCH_DB=db_path,
+        DJANGO_SETTINGS_MODULE='bench_settings',
+        PYTHONPATH=os.pathsep.join([str(BENCH_DIR), str(PROJECT_DIR)]),
+    )
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'advanced_api_project.asgi:application',
+         '--port', str(port), '--workers', str(workers), '--log-level', 'warning', '--no-access-log'],
+        cwd=PROJECT_DIR, env=env,
+    )
+    for _ in range(100):
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise SystemExit('uvicorn did not start')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--books', type=int, default=100_000)
+    parser.add_argument('--page-size', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=1000, help='requests per run')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 16, 64, 256])
+    parser.add_argument('--workers', type=int, default=1, help='uvicorn worker processes')
+    args = parser.parse_args()
+
+    db_path = setup_django()
+    with Timer() as t:
+        seed_books(args.books)
+    print(f'seeded {args.books} books in {t.ms / 1000:.1f}s')
+
+    from django.db import connections
+    connections.close_all()
+
+    port = free_port()
+    server = start_uvicorn(db_path, port, args.workers)
+    endpoints = {
+        'sync': f'/api/books/?page_size={args.page_size}',
+        'async': f'/api/books/async/?limit={args.page_size}',
+    }
+    try:
+        print(f'{"concurrency":>11} {"view":>6} {"req/s":>8} {"p50 ms":>8} {"p95 ms":>8}  statuses')
+        for concurrency in args.concurrency:
+            for name, path in endpoints.items():
+                client = Client(f'http://127.0.0.1:{port}')
+                latencies, statuses, wall_ms = run_scenario(
+                    client, lambda: ('GET', path, None, None), args.requests, concurrency
+                )
+                rps = args.requests / (wall_ms / 1000)
+                print(f'{concurrency:>11} {name:>6} {rps:>8.0f} {percentile(latencies, 50):>8.1f} '
+                      f'{percentile(latencies, 95):>8.1f}  {statuses}')
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+'''
+inserts the same books through POST /api/books/create/ one at a time and
+through POST /api/books/bulk/ in batches, and reports books per second.
+
+    python benchmarks/bench_bulk.py --books 5000
+'''
+import argparse
+
+from common import Timer, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--books', type=int, default=5000)
+    parser.add_argument('--batch', type=int, default=1000, help='items per bulk request')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth.models import User
+    from rest_framework.test import APIClient
+    from api.models import Author, Book
+
+    author = Author.objects.create(name='Bench Author')
+    client = APIClient()
+    client.force_authenticate(User.objects.create_user('bench', password='bench'))
+
+    def items(prefix):
+        return [
+            {'title': f'{prefix} {i:08d}', 'publication_year': 2000, 'author': author.id}
+            for i in range(args.books)
+        ]
+
+    with Timer() as single:
+        for item in items('Single'):
+            client.post('/api/books/create/', item, format='json')
+
+    with Timer() as bulk:
+        batch = items('Bulk')
+        for start in range(0, len(batch), args.batch):
+            client.post('/api/books/bulk/', batch[start:start + args.batch], format='json')
+
+    assert Book.objects.count() == 2 * args.books
+    print(f'{"endpoint":<20} {"seconds":>8} {"books/s":>10}')
+    for name, t in (('books/create/', single), (f'books/bulk/ x{args.batch}', bulk)):
+        print(f'{name:<20} {t.ms / 1000:>8.2f} {args.books / (t.ms / 1000):>10.0f}')
+
+
+if __name__ == '__main__':
+    main()
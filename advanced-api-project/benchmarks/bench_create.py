@@ -0,0 +1,67 @@
+'''
+POST /api/books/create/ throughput, with the duplicate-title check done by
+a SELECT before the INSERT (DRF's UniqueValidator, the old path) and by
+the unique index alone (the current path), from concurrent clients.
+a second run has every client post the same title: exactly one 201 and
+no 500s is the race-free result.
+
+    python benchmarks/bench_create.py --requests 2000 --concurrency 16
+'''
+import argparse
+import itertools
+import logging
+from collections import defaultdict
+from unittest import mock
+
+from common import seed_books, setup_django
+from loadtest import PASSWORD, Client, run_scenario, serve_in_process
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--books', type=int, default=100_000)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    args = parser.parse_args()
+
+    setup_django()
+    seed_books(args.books)
+
+    from django.contrib.auth.models import User
+    from rest_framework.authtoken.models import Token
+    from api.models import Author
+    from api.serializers import BookSerializer
+
+    user = User.objects.create_user(username='bench', password=PASSWORD)
+    token = Token.objects.create(user=user).key
+    author_id = Author.objects.values_list('id', flat=True).first()
+
+    # every duplicate is a 400, which django.request would log
+    logging.getLogger('django.request').setLevel(logging.ERROR)
+    query_counts = defaultdict(list)
+    server, base_url = serve_in_process(query_counts)
+    client = Client(base_url)
+    counter = itertools.count()
+
+    def unique_title():
+        return ('POST', '/api/books/create/', {
+            'title': f'Bench {next(counter)}', 'publication_year': 2000, 'author': author_id,
+        }, token)
+
+    print(f'{"check":>14} {"titles":>8} {"req/s":>8} {"q/req":>6}  statuses')
+    for name, extra_kwargs in (('select+insert', {}), ('unique index', BookSerializer.Meta.extra_kwargs)):
+        with mock.patch.object(BookSerializer.Meta, 'extra_kwargs', extra_kwargs):
+            for titles, make_request in (('unique', unique_title), ('same', lambda: (
+                'POST', '/api/books/create/',
+                {'title': f'Same {name}', 'publication_year': 2000, 'author': author_id}, token,
+            ))):
+                query_counts.clear()
+                _, statuses, wall_ms = run_scenario(client, make_request, args.requests, args.concurrency)
+                queries = query_counts['book-create']
+                print(f'{name:>14} {titles:>8} {args.requests / (wall_ms / 1000):>8.0f} '
+                      f'{sum(queries) / len(queries):>6.1f}  {statuses}')
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
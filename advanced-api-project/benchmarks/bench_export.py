@@ -0,0 +1,45 @@
+'''
+streams GET /api/books/export/ at growing table sizes and reports the
+peak Python memory (tracemalloc) while the response is consumed.
+the peak should stay flat as the row count grows.
+
+    python benchmarks/bench_export.py --sizes 1000 100000 1000000
+'''
+import argparse
+import tracemalloc
+
+from common import Timer, seed_books, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 100_000, 1_000_000])
+    parser.add_argument('--format', default='ndjson', choices=['ndjson', 'csv'])
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection
+    from django.test import Client
+
+    client = Client()
+    print(f'{"rows":>10} {"seconds":>8} {"MB out":>8} {"peak MB":>8}')
+    for size in sorted(args.sizes):
+        # start from an empty table; raw deletes skip the per-row signals
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM api_book')
+            cursor.execute('DELETE FROM api_author')
+        seed_books(size)
+
+        tracemalloc.start()
+        written = 0
+        with Timer() as t:
+            response = client.get('/api/books/export/', {'format': args.format})
+            for chunk in response.streaming_content:
+                written += len(chunk)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f'{size:>10} {t.ms / 1000:>8.2f} {written / 2**20:>8.1f} {peak / 2**20:>8.2f}')
+
+
+if __name__ == '__main__':
+    main()
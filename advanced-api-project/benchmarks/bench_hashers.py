@@ -0,0 +1,46 @@
+'''
+CPU and wall time per POST /api/login/ under each password hasher profile:
+'fast' (MD5, tests and benchmarks), 'prod' (Argon2 with the ARGON2_*
+settings) and Django's stock PBKDF2 for comparison.
+
+    python benchmarks/bench_hashers.py --logins 50
+'''
+import argparse
+import time
+
+from common import setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--logins', type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.contrib.auth.models import User
+    from django.test import Client
+    from django.test.utils import override_settings
+
+    profiles = {
+        'fast': settings.PASSWORD_HASHER_PROFILES['fast'],
+        'pbkdf2': ['django.contrib.auth.hashers.PBKDF2PasswordHasher'],
+        'prod': settings.PASSWORD_HASHER_PROFILES['prod'],
+    }
+    client = Client()
+    print(f'{"profile":>8} {"hasher":>28} {"cpu ms/login":>13} {"wall ms/login":>14}')
+    for name, hashers in profiles.items():
+        with override_settings(PASSWORD_HASHERS=hashers):
+            User.objects.filter(username='bench').delete()
+            User.objects.create_user(username='bench', password='bench-password-1')
+            cpu, wall = time.process_time(), time.perf_counter()
+            for _ in range(args.logins):
+                response = client.post('/api/login/', {'username': 'bench', 'password': 'bench-password-1'})
+                assert response.status_code == 200, response.status_code
+            cpu = (time.process_time() - cpu) * 1000 / args.logins
+            wall = (time.perf_counter() - wall) * 1000 / args.logins
+        print(f'{name:>8} {hashers[0].rsplit(".", 1)[1]:>28} {cpu:>13.2f} {wall:>14.2f}')
+
+
+if __name__ == '__main__':
+    main()
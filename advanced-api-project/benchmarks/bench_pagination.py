@@ -0,0 +1,86 @@
+'''
+walks GET /api/books/ page by page with keyset cursors and reports the
+median latency at a few checkpoint pages: the full keyset request, the
+keyset query alone, and a plain OFFSET query for the same page. keyset
+latency should stay flat; offset latency grows.
+the response cache is off (BOOK_LIST_CACHE_TIMEOUT = 0), so every sample
+runs the page query; counts and ETag state stay cached as in production.
+
+    python benchmarks/bench_pagination.py --books 1000000 --page-size 100
+'''
+import argparse
+
+from common import Timer, percentile, seed_books, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--books', type=int, default=1_000_000)
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=5, help='samples per checkpoint page')
+    parser.add_argument('--ordering', default='publication_year')
+    parser.add_argument('--db', default=None, help='reuse an already seeded sqlite file')
+    args = parser.parse_args()
+
+    db_path = setup_django(args.db)
+    from django.conf import settings
+    # measure the page query, not a cached response
+    settings.BOOK_LIST_CACHE_TIMEOUT = 0
+    from django.test import Client
+    from api.models import Book
+    from api.pagination import BookKeysetPagination
+
+    if not Book.objects.exists():
+        with Timer() as t:
+            seed_books(args.books)
+        print(f'seeded {args.books} books into {db_path} in {t.ms / 1000:.1f}s')
+
+    pages = Book.objects.count() // args.page_size
+    checkpoints = [p for p in (1, 10, 100, 1000, 10000, 100000) if p <= pages]
+    field = args.ordering.lstrip('-')
+    prefix = '-' if args.ordering.startswith('-') else ''
+
+    client = Client()
+    url = f'/api/books/?page_size={args.page_size}&ordering={args.ordering}'
+    client.get(url)  # warm up url resolution and the serializer
+    paginator = BookKeysetPagination()
+    paginator.field = field
+    ordered = Book.objects.order_by(prefix + field, prefix + 'id')
+    print(f'{"page":>8} {"request ms":>11} {"keyset ms":>10} {"offset ms":>10}')
+    page, last = 0, None
+    while url and checkpoints:
+        page += 1
+        page_url = url
+        with Timer() as keyset:
+            response = client.get(page_url)
+        data = response.json()
+        url = data['next']
+        previous_last, last = last, data['results'][-1]
+
+        if page == checkpoints[0]:
+            checkpoints.pop(0)
+            request_samples, keyset_samples, offset_samples = [keyset.ms], [], []
+            offset = (page - 1) * args.page_size
+            # the query the paginator runs for this page, on its own
+            page_query = ordered
+            if previous_last is not None:
+                cursor = {'v': previous_last[field], 'id': previous_last['id']}
+                page_query = ordered.filter(paginator.get_keyset_filter(cursor, bool(prefix)))
+            assert page_query[:1].get().id == data['results'][0]['id']
+            for _ in range(args.repeat):
+                with Timer() as t:
+                    response = client.get(page_url)
+                assert response['X-Cache'] == 'MISS'
+                request_samples.append(t.ms)
+                with Timer() as t:
+                    list(page_query[:args.page_size])
+                keyset_samples.append(t.ms)
+                with Timer() as t:
+                    list(ordered[offset:offset + args.page_size])
+                offset_samples.append(t.ms)
+            print(f'{page:>8} {percentile(request_samples, 50):>11.2f} '
+                  f'{percentile(keyset_samples, 50):>10.2f} {percentile(offset_samples, 50):>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
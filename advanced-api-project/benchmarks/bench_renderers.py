@@ -0,0 +1,47 @@
+'''
+render time and payload size of a 10k-book page for DRF's JSONRenderer,
+OrJSONRenderer and MessagePackRenderer. the "dated" page adds each book's
+updated_at, so the datetime path (handed to DRF's encoder) is measured too.
+
+    python benchmarks/bench_renderers.py --rows 10000
+'''
+import argparse
+
+from common import Timer, seed_books, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    seed_books(args.rows)
+
+    from rest_framework.renderers import JSONRenderer
+    from api.models import Book
+    from api.renderers import MessagePackRenderer, OrJSONRenderer
+    from api.serializers import BookSerializer
+
+    page = BookSerializer(Book.objects.order_by('id')[:args.rows], many=True).data
+    dated = [
+        dict(book, updated_at=updated_at)
+        for book, updated_at in zip(page, Book.objects.order_by('id').values_list('updated_at', flat=True))
+    ]
+
+    renderers = [('json', JSONRenderer()), ('orjson', OrJSONRenderer()), ('msgpack', MessagePackRenderer())]
+    print(f'{"page":>6} {"renderer":>8} {"ms/render":>10} {"KB":>8} {"vs json":>8}')
+    for name, data in (('plain', page), ('dated', dated)):
+        baseline = None
+        for renderer_name, renderer in renderers:
+            with Timer() as t:
+                for _ in range(args.repeat):
+                    body = renderer.render(data)
+            ms = t.ms / args.repeat
+            baseline = baseline or ms
+            print(f'{name:>6} {renderer_name:>8} {ms:>10.2f} {len(body) / 1024:>8.0f} {baseline / ms:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
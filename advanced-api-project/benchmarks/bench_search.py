@@ -0,0 +1,61 @@
+'''
+compares GET /api/books/?search=... through the FTS5 search backend
+against DRF's plain SearchFilter (icontains scans + author join).
+the response cache is off (BOOK_LIST_CACHE_TIMEOUT = 0): switching the
+backend doesn't bump the cache version, so cached responses would make
+both columns measure the same cache hits.
+
+    python benchmarks/bench_search.py --books 200000
+'''
+import argparse
+
+from common import Timer, percentile, seed_books, setup_django
+
+TERMS = ['Book 00012345', '0001234', 'Author 42', 'author 7 book 0009']
+
+
+def run(client, terms, repeat):
+    results = {}
+    for term in terms:
+        samples = []
+        for _ in range(repeat):
+            with Timer() as t:
+                response = client.get('/api/books/', {'search': term, 'page_size': 50})
+            assert response['X-Cache'] == 'MISS'
+            samples.append(t.ms)
+        results[term] = (percentile(samples, 50), len(response.json()['results']))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--books', type=int, default=200_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--db', default=None)
+    args = parser.parse_args()
+
+    setup_django(args.db)
+    from django.conf import settings
+    # measure the search query, not a cached response
+    settings.BOOK_LIST_CACHE_TIMEOUT = 0
+    from django.test import Client
+    from api import search
+    from api.models import Book
+
+    if not Book.objects.exists():
+        seed_books(args.books)
+    # bulk_create skips signals, so index the seeded rows in one go
+    search.get_search_backend().rebuild()
+
+    client = Client()
+    indexed = run(client, TERMS, args.repeat)
+    search._backends['default'] = search.BasicSearchBackend()
+    plain = run(client, TERMS, args.repeat)
+
+    print(f'{"search":<22} {"fts5 ms":>9} {"icontains ms":>13} {"rows":>5}')
+    for term in TERMS:
+        print(f'{term:<22} {indexed[term][0]:>9.2f} {plain[term][0]:>13.2f} {indexed[term][1]:>5}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+'''
+rows serialized per second: BookSerializer over Book instances vs
+BookValuesSerializer over values() rows, for the same queryset.
+each run covers the query, the serializer and JSON rendering, and the
+same page is also fetched end to end through GET /api/books/.
+
+    python benchmarks/bench_serializer.py --books 100000 --page-size 1000
+'''
+import argparse
+from unittest import mock
+
+from common import Timer, seed_books, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--books', type=int, default=100_000)
+    parser.add_argument('--page-size', type=int, nargs='+', default=[100, 1000, 10_000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    seed_books(args.books)
+
+    from django.test import Client
+    from django.test.utils import override_settings
+    from rest_framework.renderers import JSONRenderer
+    from api.models import Book
+    from api.pagination import BookKeysetPagination
+    from api.serializers import BookSerializer, BookValuesSerializer
+    from api.views import BookListView
+
+    renderer = JSONRenderer()
+
+    def slow(queryset):
+        return renderer.render(BookSerializer(queryset, many=True).data)
+
+    def fast(queryset):
+        return renderer.render(BookValuesSerializer(BookValuesSerializer.values(queryset), many=True).data)
+
+    client = Client()
+    dummy_cache = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+
+    print(f'{"rows":>8} {"path":>10} {"model rows/s":>13} {"values rows/s":>14} {"speedup":>8}')
+    for size in args.page_size:
+        queryset = Book.objects.order_by('id')[:size]
+        timings = {}
+        for name, run in (('model', slow), ('values', fast)):
+            with Timer() as t:
+                for _ in range(args.repeat):
+                    run(queryset)
+            timings[name] = t.ms
+        rate = {name: size * args.repeat / (ms / 1000) for name, ms in timings.items()}
+        print(f'{size:>8} {"serializer":>10} {rate["model"]:>13.0f} {rate["values"]:>14.0f} '
+              f'{rate["values"] / rate["model"]:>7.1f}x')
+
+        # the endpoint caps the page at BOOK_LIST_MAX_PAGE_SIZE
+        rows = min(size, BookKeysetPagination.max_page_size)
+        timings = {}
+        with override_settings(CACHES=dummy_cache):
+            for name, fast_read in (('model', False), ('values', True)):
+                with mock.patch.object(BookListView, 'fast_read', fast_read), Timer() as t:
+                    for _ in range(args.repeat):
+                        client.get('/api/books/', {'page_size': size})
+                timings[name] = t.ms
+        rate = {name: rows * args.repeat / (ms / 1000) for name, ms in timings.items()}
+        print(f'{rows:>8} {"endpoint":>10} {rate["model"]:>13.0f} {rate["values"]:>14.0f} '
+              f'{rate["values"] / rate["model"]:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,27 @@
+'''
+settings for benchmarks that run the project in a separate server process
+(e.g. uvicorn). the database is the throwaway file the script seeded,
+passed in BENCH_DB, and the response cache is off so every request
+reaches the view.
+'''
+import os
+
+from advanced_api_project.settings import *  # noqa: F401,F403
+
+DEBUG = False
+ALLOWED_HOSTS = ['127.0.0.1', 'localhost']
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ['BENCH_DB'],
+        'OPTIONS': {'timeout': 30, 'init_command': 'PRAGMA journal_mode=WAL;'},
+    }
+}
+
+PASSWORD_HASHERS = PASSWORD_HASHER_PROFILES['fast']  # noqa: F405
+REST_FRAMEWORK = dict(REST_FRAMEWORK, DEFAULT_THROTTLE_RATES={})  # noqa: F405
+
+CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+}
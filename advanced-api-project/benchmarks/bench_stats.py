@@ -0,0 +1,76 @@
+'''
+books-per-author and books-per-year: a GROUP BY over every book next to
+the summary-table endpoints (GET /api/stats/authors/, /api/stats/years/),
+plus what keeping the tables in sync adds to a single book save.
+
+    python benchmarks/bench_stats.py --books 1000000
+'''
+import argparse
+
+from common import Timer, percentile, seed_books, setup_django
+
+
+def median_ms(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        with Timer() as t:
+            fn()
+        samples.append(t.ms)
+    return percentile(samples, 50)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--books', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db.models import Count
+    from django.db.models.signals import post_save, pre_save
+    from django.test import Client
+    from api.models import Author, AuthorStats, Book, YearStats
+    from api.signals import count_saved_book, load_stats_key
+    from api.stats import rebuild_stats
+
+    seed_books(args.books)
+    # bulk_create skips the signals
+    with Timer() as t:
+        rebuild_stats()
+    print(f'rebuild_book_stats over {args.books} books: {t.ms:.0f} ms')
+
+    books = Book.objects.order_by()
+    client = Client()
+    rows = [
+        ('books per author',
+         lambda: list(books.values_list('author').annotate(count=Count('id'))),
+         lambda: list(AuthorStats.objects.values_list('author', 'book_count')),
+         '/api/stats/authors/'),
+        ('books per year',
+         lambda: list(books.values_list('publication_year').annotate(count=Count('id'))),
+         lambda: list(YearStats.objects.values_list('year', 'book_count')),
+         '/api/stats/years/'),
+    ]
+    print(f'{"":<18} {"GROUP BY ms":>12} {"summary ms":>12} {"endpoint ms":>12}')
+    for label, group_by, summary, url in rows:
+        client.get(url)
+        print(f'{label:<18} {median_ms(group_by, args.repeat):>12.2f} {median_ms(summary, args.repeat):>12.2f} '
+              f'{median_ms(lambda: client.get(url), args.repeat):>12.2f}')
+
+    author = Author.objects.first()
+    book = Book.objects.filter(author=author).first()
+
+    def save():
+        book.publication_year = 1900 + (book.publication_year + 1) % 125
+        book.save()
+
+    repeat = args.repeat * 20
+    with_stats = median_ms(save, repeat)
+    pre_save.disconnect(load_stats_key, sender=Book)
+    post_save.disconnect(count_saved_book, sender=Book)
+    without_stats = median_ms(save, repeat)
+    print(f'book.save(): {with_stats:.2f} ms with the stats tables, {without_stats:.2f} ms without')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+'''
+counts queries and times authenticated PATCH /api/books/update/<pk>/
+requests with and without the token lookup cache.
+
+    python benchmarks/bench_token_auth.py --requests 500
+'''
+import argparse
+
+from common import Timer, setup_django
+
+
+def run(client, url, requests):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    with CaptureQueriesContext(connection) as ctx, Timer() as t:
+        for i in range(requests):
+            response = client.patch(url, {'publication_year': 1900 + i % 100}, format='json')
+            assert response.status_code == 200, response.status_code
+    return len(ctx.captured_queries) / requests, t.ms / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=500)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth.models import User
+    from rest_framework.authtoken.models import Token
+    from rest_framework.test import APIClient
+    from api.authentication import token_cache
+    from api.models import Author, Book
+
+    user = User.objects.create_user('bench', password='bench')
+    token = Token.objects.create(user=user)
+    book = Book.objects.create(title='Bench', publication_year=2000, author=Author.objects.create(name='A'))
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+    url = f'/api/books/update/{book.id}/'
+
+    maxsize = token_cache.maxsize
+    token_cache.maxsize = 0
+    uncached = run(client, url, args.requests)
+    token_cache.maxsize = maxsize
+    cached = run(client, url, args.requests)
+
+    print(f'{"token cache":<12} {"queries/req":>12} {"ms/req":>8}')
+    print(f'{"off":<12} {uncached[0]:>12.2f} {uncached[1]:>8.2f}')
+    print(f'{"on":<12} {cached[0]:>12.2f} {cached[1]:>8.2f}')
+
+
+if __name__ == '__main__':
+    main()
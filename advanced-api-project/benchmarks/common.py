@@ -0,0 +1,99 @@
+'''
+shared helpers for the benchmark scripts in this folder.
+
+every script runs against a throwaway sqlite file (never db.sqlite3),
+so run them from the project root, e.g.:
+
+    python benchmarks/bench_pagination.py --books 1000000
+'''
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup_django(db_path=None):
+    '''
+    point django at a fresh sqlite database and run the migrations.
+    returns the path of the database file.
+    '''
+    if str(PROJECT_DIR) not in sys.path:
+        sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'advanced_api_project.settings')
+    # MD5 hashing: measure the views, not the password hasher
+    # (bench_hashers.py compares the profiles)
+    os.environ.setdefault('PASSWORD_HASHER_PROFILE', 'fast')
+
+    if db_path is None:
+        db_path = os.path.join(tempfile.mkdtemp(prefix='api-bench-'), 'bench.sqlite3')
+
+    from django.conf import settings
+    settings.DATABASES['default']['NAME'] = db_path
+    # concurrent clients: wait for locks instead of failing, and let
+    # readers run alongside a writer
+    settings.DATABASES['default']['OPTIONS'] = {
+        'timeout': 30,
+        'init_command': 'PRAGMA journal_mode=WAL;',
+    }
+
+    # the load generators all come from one IP: measure the views, not the limits
+    settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] = {}
+
+    import django
+    django.setup()
+
+    from django.core.management import call_command
+    from django.test.utils import setup_test_environment
+    setup_test_environment()
+    call_command('migrate', verbosity=0)
+    return db_path
+
+
+def seed_books(total, authors=1000, batch_size=10000):
+    '''
+    bulk insert `total` books spread over `authors` authors.
+    titles are unique and publication years repeat a lot, like a real catalogue.
+    '''
+    from api.models import Author, Book
+
+    Author.objects.bulk_create(
+        [Author(name=f'Author {i}') for i in range(authors)], batch_size=batch_size
+    )
+    author_ids = list(Author.objects.values_list('id', flat=True))
+
+    for start in range(0, total, batch_size):
+        stop = min(start + batch_size, total)
+        Book.objects.bulk_create(
+            [
+                Book(
+                    title=f'Book {i:08d}',
+                    publication_year=1900 + i % 125,
+                    author_id=author_ids[i % len(author_ids)],
+                )
+                for i in range(start, stop)
+            ],
+            batch_size=batch_size,
+        )
+
+
+class Timer:
+    '''
+    context manager that records elapsed wall time in milliseconds.
+    '''
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.ms = (time.perf_counter() - self.start) * 1000
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
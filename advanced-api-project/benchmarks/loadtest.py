@@ -0,0 +1,259 @@
+'''
+load test for the api/urls.py routes.
+
+seeds a dataset with bulk_create, serves the project with a threaded WSGI
+server inside this process (or targets --url, e.g. a runserver/uvicorn you
+started yourself), then hits every endpoint with concurrent clients and
+reports p50/p95/p99 latency, requests per second and, in-process only,
+database queries per request. results are written as JSON so runs on
+different commits can be compared:
+
+    python benchmarks/loadtest.py --books 100000 --requests 500 --concurrency 16
+    python benchmarks/loadtest.py --compare benchmarks/results/<earlier run>.json
+'''
+import argparse
+import json
+import random
+import subprocess
+import threading
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from http.client import HTTPConnection
+from pathlib import Path
+from socketserver import ThreadingMixIn
+from urllib.parse import urlsplit
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+from common import PROJECT_DIR, Timer, percentile, seed_books, setup_django
+
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+PASSWORD = 'load-test-password-1'
+
+
+class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def query_counting(app, query_counts):
+    '''
+    wraps the WSGI app and records queries per request, keyed by url name
+    '''
+    from django.db import connection
+    from django.urls import Resolver404, resolve
+
+    def counting_app(environ, start_response):
+        count = 0
+
+        def count_query(execute, sql, params, many, context):
+            nonlocal count
+            count += 1
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(count_query):
+            body = b''.join(app(environ, start_response))
+        try:
+            name = resolve(environ['PATH_INFO']).url_name
+        except Resolver404:
+            name = None
+        query_counts[name].append(count)
+        return [body]
+
+    return counting_app
+
+
+def serve_in_process(query_counts):
+    from django.conf import settings
+    from django.core.wsgi import get_wsgi_application
+
+    settings.ALLOWED_HOSTS = ['127.0.0.1', 'localhost']
+    app = query_counting(get_wsgi_application(), query_counts)
+    server = make_server('127.0.0.1', 0, app, ThreadingWSGIServer, QuietHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_port}'
+
+
+class Client(threading.local):
+    '''
+    one keep-alive HTTP connection per worker thread
+    '''
+
+    def __init__(self, base_url):
+        parts = urlsplit(base_url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.prefix = parts.path.rstrip('/')
+        self.conn = None
+
+    def request(self, method, path, body=None, token=None):
+        headers = {'Content-Type': 'application/json'}
+        if token:
+            headers['Authorization'] = f'Token {token}'
+        payload = json.dumps(body) if body is not None else None
+        for attempt in range(2):
+            if self.conn is None:
+                self.conn = HTTPConnection(self.host, self.port, timeout=60)
+            try:
+                self.conn.request(method, self.prefix + path, payload, headers)
+                response = self.conn.getresponse()
+                data = response.read()
+                return response.status, data
+            except (ConnectionError, OSError):
+                # the wsgiref server closes idle connections; reconnect once
+                self.conn.close()
+                self.conn = None
+                if attempt:
+                    raise
+
+
+def build_scenarios(token, book_ids, author_ids, requests):
+    '''
+    (name, url name, method, path, body, token) callables, one per endpoint
+    '''
+    deletable = iter(random.sample(book_ids, min(requests, len(book_ids) // 2)))
+    updatable = book_ids[len(book_ids) // 2:]
+
+    def unique():
+        return uuid.uuid4().hex[:12]
+
+    return [
+        ('list', 'book-list', lambda: ('GET', '/api/books/?page_size=50', None, None)),
+        ('list_filtered', 'book-list', lambda: (
+            'GET', f'/api/books/?page_size=50&publication_year={random.randint(1900, 2024)}&ordering=title',
+            None, None)),
+        ('search', 'book-list', lambda: ('GET', f'/api/books/?page_size=50&search={random.randint(0, 99999):05d}', None, None)),
+        ('detail', 'book-detail', lambda: ('GET', f'/api/books/{random.choice(book_ids)}/', None, None)),
+        ('create', 'book-create', lambda: ('POST', '/api/books/create/', {
+            'title': f'Load {unique()}', 'publication_year': 2000, 'author': random.choice(author_ids),
+        }, token)),
+        ('update', 'book-update', lambda: ('PATCH', f'/api/books/update/{random.choice(updatable)}/', {
+            'publication_year': random.randint(1900, 2024),
+        }, token)),
+        ('delete', 'book-delete', lambda: ('DELETE', f'/api/books/delete/{next(deletable)}/', None, token)),
+        ('register', 'register', lambda: ('POST', '/api/register/', {
+            'username': f'user{unique()}', 'password': PASSWORD,
+        }, None)),
+        ('login', 'login', lambda: ('POST', '/api/login/', {'username': 'loadtest', 'password': PASSWORD}, None)),
+    ]
+
+
+def run_scenario(client, make_request, requests, concurrency):
+    latencies, statuses = [], defaultdict(int)
+    lock = threading.Lock()
+
+    def one(_):
+        method, path, body, token = make_request()
+        with Timer() as t:
+            status, _ = client.request(method, path, body, token)
+        with lock:
+            latencies.append(t.ms)
+            statuses[status] += 1
+
+    with Timer() as wall, ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(requests)))
+    return latencies, dict(statuses), wall.ms
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_DIR, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline_path, results):
+    baseline = json.loads(Path(baseline_path).read_text())['endpoints']
+    print(f'\nvs {baseline_path}')
+    print(f'{"endpoint":<14} {"p95 ms":>16} {"req/s":>16}')
+    for name, current in results.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+        print(f'{name:<14} {old["p95_ms"]:>7.1f} -> {current["p95_ms"]:<7.1f} '
+              f'{old["rps"]:>7.0f} -> {current["rps"]:<7.0f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--books', type=int, default=100_000)
+    parser.add_argument('--requests', type=int, default=500, help='requests per endpoint')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--only', nargs='+', help='endpoint names to run')
+    parser.add_argument('--url', help='target an already running server (seeds its database via --db)')
+    parser.add_argument('--db', help='sqlite file to seed/use instead of a throwaway one')
+    parser.add_argument('--output', help='where to write the JSON results')
+    parser.add_argument('--compare', help='earlier results JSON to compare against')
+    args = parser.parse_args()
+
+    setup_django(args.db)
+    from django.contrib.auth.models import User
+    from rest_framework.authtoken.models import Token
+    from api.models import Author, Book
+
+    if not Book.objects.exists():
+        with Timer() as t:
+            seed_books(args.books)
+        print(f'seeded {args.books} books in {t.ms / 1000:.1f}s')
+    user, _ = User.objects.get_or_create(username='loadtest')
+    user.set_password(PASSWORD)
+    user.save()
+    token, _ = Token.objects.get_or_create(user=user)
+    book_ids = list(Book.objects.values_list('id', flat=True))
+    author_ids = list(Author.objects.values_list('id', flat=True))
+
+    query_counts = defaultdict(list)
+    if args.url:
+        base_url, server = args.url, None
+    else:
+        server, base_url = serve_in_process(query_counts)
+
+    client = Client(base_url)
+    started_at = datetime.now(timezone.utc)
+    results = {}
+    print(f'{"endpoint":<14} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"req/s":>8} {"q/req":>6}  statuses')
+    for name, url_name, make_request in build_scenarios(token.key, book_ids, author_ids, args.requests):
+        if args.only and name not in args.only:
+            continue
+        query_counts.clear()
+        latencies, statuses, wall_ms = run_scenario(client, make_request, args.requests, args.concurrency)
+        queries = query_counts.get(url_name)
+        results[name] = {
+            'p50_ms': percentile(latencies, 50),
+            'p95_ms': percentile(latencies, 95),
+            'p99_ms': percentile(latencies, 99),
+            'rps': args.requests / (wall_ms / 1000),
+            'queries_per_request': sum(queries) / len(queries) if queries else None,
+            'statuses': statuses,
+        }
+        r = results[name]
+        q = f'{r["queries_per_request"]:.1f}' if queries else '-'
+        print(f'{name:<14} {r["p50_ms"]:>8.1f} {r["p95_ms"]:>8.1f} {r["p99_ms"]:>8.1f} {r["rps"]:>8.0f} {q:>6}  {statuses}')
+
+    if server is not None:
+        server.shutdown()
+
+    commit = git_commit()
+    output = Path(args.output) if args.output else RESULTS_DIR / (
+        f'loadtest-{commit or "nogit"}-{started_at:%Y%m%dT%H%M%SZ}.json'
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        'commit': commit,
+        'started_at': started_at.isoformat(),
+        'config': {'books': Book.objects.count(), 'requests': args.requests,
+                   'concurrency': args.concurrency, 'target': args.url or 'in-process'},
+        'endpoints': results,
+    }, indent=2))
+    print(f'\nresults written to {output}')
+
+    if args.compare:
+        compare(args.compare, results)
+
+
+if __name__ == '__main__':
+    main()
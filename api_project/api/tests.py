@@ -1,3 +1,33 @@
+import json
+from django.contrib.auth.models import User
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from .models import Book
 
-# Create your tests here.
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class RendererNegotiationTests(TestCase):
+
+    def setUp(self):
+        Book.objects.create(title='Book One', author='Author One')
+        user = User.objects.create_user(username='reader', password='pass1234')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + Token.objects.create(user=user).key)
+
+    def test_json_by_default(self):
+        response = self.client.get(reverse('book-list'))
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(response.content)[0]['title'], 'Book One')
+
+    def test_msgpack_by_accept_header(self):
+        if msgpack is None:
+            self.skipTest('msgpack is not installed')
+        response = self.client.get(reverse('book-list'), HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        self.assertEqual(msgpack.unpackb(response.content)[0]['title'], 'Book One')
@@ -49,6 +49,12 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated'
     ],
+    # picked by the Accept header (or ?format=json|msgpack)
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.OrJSONRenderer',
+        'api.renderers.MessagePackRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
 }
 
 
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class RelationshipAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'LibraryProject.relationship_app'
+
+    def ready(self):
+        # Lets GuardedTemplateResponse catch lazy foreign key loads
+        from .lazy_loads import install
+        install()
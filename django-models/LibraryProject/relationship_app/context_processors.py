@@ -0,0 +1,9 @@
+from .roles import get_user_role
+
+
+def role(request):
+    """
+    Adds `user_role` to template contexts. The template engine calls it
+    only when a template reads it, and it uses the cached role.
+    """
+    return {'user_role': lambda: get_user_role(request.user)}
@@ -0,0 +1,92 @@
+"""
+Guard against lazy relation loads while a template renders.
+
+A template that reads `book.author.name` on a Book fetched without
+select_related('author'), or `library.librarian.name` on a Library fetched
+without select_related('librarian'), runs one query per row (the N+1
+problem).
+Views that render with GuardedTemplateResponse raise LazyRelationLoad
+instead when settings.LAZY_LOAD_GUARD is on (DEBUG and test runs),
+so the missing select_related shows up in development, not production.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db.models.fields.related_descriptors import (
+    ForwardManyToOneDescriptor,
+    ReverseOneToOneDescriptor,
+)
+from django.template.response import TemplateResponse
+
+_guarded = ContextVar('lazy_load_guard', default=False)
+
+
+class LazyRelationLoad(RuntimeError):
+    """Raised when a guarded template loads a foreign key or one-to-one lazily."""
+
+
+def _refuse(instance, name):
+    raise LazyRelationLoad(
+        f'{type(instance).__name__}.{name} was loaded lazily while '
+        f'rendering a template; add select_related("{name}") to the queryset.'
+    )
+
+
+def install():
+    """
+    Wrap the two descriptors that query when a single related object is
+    not cached yet (no select_related):
+    ForwardManyToOneDescriptor.get_object covers ForeignKey and forward
+    OneToOneField access (`book.author`), ReverseOneToOneDescriptor.__get__
+    covers the other side of a OneToOneField (`library.librarian`).
+    Called from RelationshipAppConfig.ready().
+    """
+    original_get_object = ForwardManyToOneDescriptor.get_object
+    if getattr(original_get_object, 'lazy_load_guard', False):
+        return
+
+    def get_object(self, instance, *args, **kwargs):
+        if _guarded.get():
+            _refuse(instance, self.field.name)
+        return original_get_object(self, instance, *args, **kwargs)
+
+    original_get = ReverseOneToOneDescriptor.__get__
+
+    def reverse_get(self, instance, cls=None):
+        if instance is not None and _guarded.get() and not self.related.is_cached(instance):
+            _refuse(instance, self.related.get_accessor_name())
+        return original_get(self, instance, cls)
+
+    get_object.lazy_load_guard = True
+    ForwardManyToOneDescriptor.get_object = get_object
+    ReverseOneToOneDescriptor.__get__ = reverse_get
+
+
+@contextmanager
+def forbid_lazy_loads():
+    """
+    Inside this block, lazy foreign key and one-to-one loads raise
+    LazyRelationLoad.
+    Does nothing unless settings.LAZY_LOAD_GUARD is on.
+    """
+    if not getattr(settings, 'LAZY_LOAD_GUARD', False):
+        yield
+        return
+    token = _guarded.set(True)
+    try:
+        yield
+    finally:
+        _guarded.reset(token)
+
+
+class GuardedTemplateResponse(TemplateResponse):
+    """
+    TemplateResponse that renders inside forbid_lazy_loads().
+    Use it from function views, or as `response_class` on class-based views.
+    """
+
+    @property
+    def rendered_content(self):
+        with forbid_lazy_loads():
+            return super().rendered_content
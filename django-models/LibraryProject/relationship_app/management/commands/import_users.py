@@ -0,0 +1,29 @@
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+from LibraryProject.relationship_app.user_import import import_users
+
+
+class Command(BaseCommand):
+    help = (
+        'Import users from a CSV file with a header row: username, and optionally '
+        'email, password and role (Admin, Librarian or Member). '
+        'Users and profiles are bulk created, so no per-user signals run.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_file')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        with open(options['csv_file'], newline='', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            if 'username' not in (reader.fieldnames or []):
+                raise CommandError('The CSV file needs a "username" column')
+            try:
+                created, skipped = import_users(reader, batch_size=options['batch_size'])
+            except ValueError as exc:
+                raise CommandError(str(exc))
+        if skipped:
+            self.stdout.write(self.style.WARNING(f'Skipped {len(skipped)} existing usernames'))
+        self.stdout.write(self.style.SUCCESS(f'Imported {created} users'))
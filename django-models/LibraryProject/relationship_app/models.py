@@ -1,7 +1,8 @@
 from django.db import models
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
+from .roles import forget_role, remember_role
 
 # Create your models here.
 class Author(models.Model):
@@ -67,7 +68,42 @@ class UserProfile(models.Model):
     
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
     role = models.CharField(max_length=20, choices=ROLE_CHOICES, default='Member')
-    
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        profile = super().from_db(db, field_names, values)
+        profile.mark_clean()
+        return profile
+
+    def mark_clean(self):
+        """
+        Remember the field values as they are in the database,
+        so get_dirty_fields() can tell what changed since.
+        """
+        self._saved_values = {
+            field.attname: self.__dict__[field.attname]
+            for field in self._meta.concrete_fields
+            if not field.primary_key and field.attname in self.__dict__
+        }
+
+    def get_dirty_fields(self):
+        """
+        Names of the fields changed since the profile was loaded or saved.
+        A profile that was never saved has every field dirty.
+        """
+        saved = getattr(self, '_saved_values', None)
+        fields = [field for field in self._meta.concrete_fields if not field.primary_key]
+        if saved is None:
+            return [field.name for field in fields]
+        return [
+            field.name for field in fields
+            if field.attname in self.__dict__ and self.__dict__[field.attname] != saved.get(field.attname)
+        ]
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.mark_clean()
+
     def __str__(self):
         return f'{self.user.username} - {self.role}'
     
@@ -92,7 +128,35 @@ def create_user_profile(sender, instance, created, **kwargs):
 @receiver(post_save, sender=User)
 def save_user_profile(sender, instance, **kwargs):
     """
-    Signal handler to automatically save the UserProfile when a User is saved.
+    Signal handler to save the UserProfile along with its User, e.g. after
+    `user.profile.role = 'Admin'; user.save()`.
+
+    Only a profile that was already loaded and has changed fields is written,
+    so plain user saves (like the last_login update on every login) cost no
+    extra queries.
+    """
+    if not User.profile.is_cached(instance):
+        return
+    try:
+        profile = instance.profile
+    except UserProfile.DoesNotExist:
+        return
+    if profile.pk is None:
+        profile.save()
+        return
+    dirty = profile.get_dirty_fields()
+    if dirty:
+        profile.save(update_fields=dirty)
+
+
+@receiver(post_save, sender=UserProfile)
+def cache_user_role(sender, instance, **kwargs):
     """
-    if hasattr(instance, 'profile'):
-        instance.profile.save()
\ No newline at end of file
+    Signal handler to keep the cached role (see roles.py) in step with the profile.
+    """
+    remember_role(instance.user_id, instance.role)
+
+
+@receiver(post_delete, sender=UserProfile)
+def forget_user_role(sender, instance, **kwargs):
+    forget_role(instance.user_id)
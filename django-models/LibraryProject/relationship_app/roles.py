@@ -0,0 +1,69 @@
+"""
+Role lookups for the role-based views.
+
+A user's role (UserProfile.role) is read once and then cached twice:
+- on the user object, so one request never asks twice
+  (request.user is the same object for the whole request);
+- in Django's cache under the user's id, for ROLE_CACHE_TIMEOUT seconds,
+  so later requests skip the profile query entirely.
+
+The UserProfile signals in models.py rewrite or drop the cached value
+when a profile is saved or deleted. Changes that skip signals
+(queryset.update()) show up once the cache entry expires.
+"""
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.auth.views import redirect_to_login
+from django.core.cache import cache
+
+# stored for users without a profile, since the cache can't hold None
+NO_ROLE = ''
+
+
+def role_cache_key(user_id):
+    return f'relationship_app:role:{user_id}'
+
+
+def remember_role(user_id, role):
+    cache.set(role_cache_key(user_id), role, getattr(settings, 'ROLE_CACHE_TIMEOUT', 300))
+
+
+def forget_role(user_id):
+    cache.delete(role_cache_key(user_id))
+
+
+def get_user_role(user):
+    """
+    Return the user's role ('Admin', 'Librarian', 'Member'),
+    or None for anonymous users and users without a profile.
+    """
+    if not user.is_authenticated:
+        return None
+    if not hasattr(user, '_role'):
+        role = cache.get(role_cache_key(user.pk))
+        if role is None:
+            from .models import UserProfile
+            role = UserProfile.objects.filter(user_id=user.pk).values_list('role', flat=True).first()
+            role = NO_ROLE if role is None else role
+            remember_role(user.pk, role)
+        user._role = role
+    return user._role or None
+
+
+def role_required(*roles, login_url=None):
+    """
+    View decorator: only users with one of `roles` get through,
+    everyone else is redirected to the login page (like user_passes_test).
+
+        @role_required('Admin', 'Librarian')
+        def manage_view(request): ...
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if get_user_role(request.user) in roles:
+                return view_func(request, *args, **kwargs)
+            return redirect_to_login(request.get_full_path(), login_url)
+        return wrapper
+    return decorator
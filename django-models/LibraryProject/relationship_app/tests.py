@@ -1,3 +1,264 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.template import engines
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
 
-# Create your tests here.
+from .lazy_loads import LazyRelationLoad, forbid_lazy_loads
+from .models import Author, Book, Librarian, Library, UserProfile
+from .user_import import import_users
+
+
+def create_books(count):
+    authors = Author.objects.bulk_create(Author(name=f'Author {i}') for i in range(count))
+    Book.objects.bulk_create(Book(title=f'Book {i:04d}', author=author) for i, author in enumerate(authors))
+
+
+class BookListQueryTests(TestCase):
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response
+
+    @override_settings(BOOKS_PER_PAGE=1000)
+    def test_query_count_does_not_grow_with_books(self):
+        create_books(10)
+        small, _ = self.count_queries(reverse('book-list'))
+        Book.objects.all().delete()
+        create_books(1000)
+        large, response = self.count_queries(reverse('book-list'))
+        self.assertEqual(large, small)
+        self.assertContains(response, 'Author 999')
+
+    @override_settings(BOOKS_PER_PAGE=4)
+    def test_paginates(self):
+        create_books(10)
+        response = self.client.get(reverse('book-list') + '?page=3')
+        self.assertEqual([book.title for book in response.context['books']], ['Book 0008', 'Book 0009'])
+        self.assertContains(response, 'Page 3 of 3')
+
+
+class LazyLoadGuardTests(TestCase):
+
+    def setUp(self):
+        create_books(1)
+        self.template = engines['django'].from_string('{{ book.author.name }}')
+
+    def test_lazy_load_raises(self):
+        book = Book.objects.get()
+        with forbid_lazy_loads(), self.assertRaises(LazyRelationLoad):
+            self.template.render({'book': book})
+
+    def test_select_related_passes(self):
+        book = Book.objects.select_related('author').get()
+        with forbid_lazy_loads():
+            self.assertEqual(self.template.render({'book': book}), 'Author 0')
+
+    def test_reverse_one_to_one(self):
+        library = Library.objects.create(name='Main')
+        Librarian.objects.create(name='Ann', library=library)
+        template = engines['django'].from_string('{{ library.librarian.name }}')
+        with forbid_lazy_loads(), self.assertRaises(LazyRelationLoad):
+            template.render({'library': Library.objects.get()})
+        library = Library.objects.select_related('librarian').get()
+        with forbid_lazy_loads():
+            self.assertEqual(template.render({'library': library}), 'Ann')
+
+    @override_settings(LAZY_LOAD_GUARD=False)
+    def test_off_outside_debug(self):
+        book = Book.objects.get()
+        with forbid_lazy_loads():
+            self.assertEqual(self.template.render({'book': book}), 'Author 0')
+
+
+@override_settings(HOLDINGS_PER_PAGE=20)
+class LibraryDetailTests(TestCase):
+
+    def setUp(self):
+        create_books(50)
+        self.library = Library.objects.create(name='Central')
+        self.library.books.set(Book.objects.all())
+        self.url = reverse('library-detail', args=[self.library.pk])
+
+    def test_walks_holdings_by_id(self):
+        ids, url, pages = [], self.url, 0
+        while url:
+            response = self.client.get(url)
+            ids += [book.id for book in response.context['holdings']]
+            after = response.context['next_after']
+            url = f'{self.url}?after={after}' if after else None
+            pages += 1
+        self.assertEqual(ids, list(Book.objects.order_by('id').values_list('id', flat=True)))
+        self.assertEqual(pages, 3)
+
+    def test_previous_page(self):
+        first = self.client.get(self.url)
+        second = self.client.get(f'{self.url}?after={first.context["next_after"]}')
+        back = self.client.get(f'{self.url}?before={second.context["previous_before"]}')
+        self.assertEqual(back.context['holdings'], first.context['holdings'])
+        self.assertIsNone(back.context['previous_before'])
+
+    def test_holdings_count_and_constant_queries(self):
+        with CaptureQueriesContext(connection) as small:
+            response = self.client.get(self.url)
+        self.assertContains(response, 'Books in Library (50)')
+        self.library.books.add(*Book.objects.bulk_create(
+            Book(title=f'Extra {i}', author_id=Author.objects.first().id) for i in range(200)
+        ))
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get(self.url)
+        self.assertContains(response, 'Books in Library (250)')
+        self.assertEqual(len(large.captured_queries), len(small.captured_queries))
+        self.assertEqual(len(small.captured_queries), 2)
+
+
+class LibraryListTests(TestCase):
+
+    def setUp(self):
+        create_books(6)
+        books = list(Book.objects.order_by('id'))
+        for i, size in enumerate([2, 6, 0]):
+            library = Library.objects.create(name=f'Library {i}')
+            library.books.set(books[:size])
+            if size:
+                Librarian.objects.create(name=f'Librarian {i}', library=library)
+
+    def test_one_query(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('library-list'))
+            # the librarian's library is filled in by the join too
+            names = [str(library.librarian) for library in response.context['libraries'][:2]]
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(names, ['Librarian 0 at Library 0', 'Librarian 1 at Library 1'])
+        self.assertContains(response, '(6 books), librarian: Librarian 1')
+        self.assertContains(response, '(0 books)')
+
+    def test_sort_by_holdings(self):
+        response = self.client.get(reverse('library-list') + '?ordering=-holdings')
+        self.assertEqual(
+            [(library.name, library.holdings_count) for library in response.context['libraries']],
+            [('Library 1', 6), ('Library 0', 2), ('Library 2', 0)],
+        )
+
+
+class RoleViewTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.users = {}
+        for role in ('Admin', 'Librarian', 'Member'):
+            user = User.objects.create_user(username=role.lower(), password='testpass')
+            user.profile.role = role
+            user.profile.save()
+            self.users[role] = user
+        cache.clear()
+
+    def login(self, user):
+        # a fresh User: logging in saves it, which saves its cached profile too
+        self.client.force_login(User.objects.get(pk=user.pk))
+
+    def get(self, url):
+        queries = []
+        # counted with a wrapper: each request resets connection.queries
+        with connection.execute_wrapper(lambda execute, *args: queries.append(1) or execute(*args)):
+            response = self.client.get(url)
+        return response, len(queries)
+
+    def test_role_views_query_the_profile_once(self):
+        for role, url in (('Admin', 'admin-view'), ('Librarian', 'librarian-view'), ('Member', 'member-view')):
+            with self.subTest(role=role):
+                self.login(self.users[role])
+                cache.clear()
+                # session + user, plus the profile until its role is cached
+                response, first = self.get(reverse(url))
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.context['role'], role)
+                self.assertEqual(first, 3)
+                response, second = self.get(reverse(url))
+                self.assertEqual(second, 2)
+
+    def test_other_roles_are_redirected(self):
+        self.login(self.users['Member'])
+        self.assertEqual(self.get(reverse('admin-view'))[0].status_code, 302)
+        self.client.logout()
+        self.assertEqual(self.client.get(reverse('member-view')).status_code, 302)
+
+    def test_saving_a_profile_updates_the_cached_role(self):
+        member = self.users['Member']
+        self.login(member)
+        self.assertEqual(self.get(reverse('member-view'))[0].status_code, 200)
+        profile = UserProfile.objects.get(user=member)
+        profile.role = 'Admin'
+        profile.save()
+        self.assertEqual(self.get(reverse('member-view'))[0].status_code, 302)
+        response, queries = self.get(reverse('admin-view'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(queries, 2)
+
+    def test_base_template_uses_the_cached_role(self):
+        self.login(self.users['Admin'])
+        response, _ = self.get(reverse('book-list'))
+        self.assertContains(response, 'Role:</strong> Admin')
+
+
+class ProfileSaveTests(TestCase):
+
+    def setUp(self):
+        User.objects.create_user(username='reader')
+
+    def count_queries(self, fn):
+        queries = []
+        with connection.execute_wrapper(lambda execute, *args: queries.append(args[0]) or execute(*args)):
+            fn()
+        return queries
+
+    def test_user_save_skips_the_profile(self):
+        user = User.objects.get(username='reader')
+        queries = self.count_queries(lambda: user.save(update_fields=['last_login']))
+        self.assertEqual(len(queries), 1)
+        user.profile  # loaded, but unchanged
+        queries = self.count_queries(lambda: user.save(update_fields=['last_login']))
+        self.assertEqual(len(queries), 1)
+
+    def test_changed_profile_is_saved_with_the_user(self):
+        user = User.objects.get(username='reader')
+        user.profile.role = 'Librarian'
+        queries = self.count_queries(user.save)
+        self.assertEqual(len(queries), 2)
+        self.assertIn('"role" = ', queries[1])
+        self.assertNotIn('"user_id" = ', queries[1])
+        self.assertEqual(UserProfile.objects.get(user=user).role, 'Librarian')
+        self.assertEqual(user.profile.get_dirty_fields(), [])
+
+
+class UserImportTests(TestCase):
+
+    def rows(self, count, start=0):
+        return [{'username': f'user{i}', 'email': f'user{i}@example.com', 'role': 'Librarian'}
+                for i in range(start, start + count)]
+
+    def test_import_creates_users_and_profiles(self):
+        created, skipped = import_users(self.rows(3) + [{'username': 'user0'}])
+        self.assertEqual((created, skipped), (3, ['user0']))
+        self.assertEqual(
+            list(UserProfile.objects.order_by('user__username').values_list('user__username', 'role')),
+            [('user0', 'Librarian'), ('user1', 'Librarian'), ('user2', 'Librarian')],
+        )
+        self.assertFalse(User.objects.get(username='user0').has_usable_password())
+
+    def test_query_count_does_not_grow_with_rows(self):
+        with CaptureQueriesContext(connection) as small:
+            import_users(self.rows(5))
+        # 80 users x 11 columns stays under sqlite's 999 parameters per INSERT
+        with CaptureQueriesContext(connection) as large:
+            import_users(self.rows(80, start=100))
+        self.assertEqual(len(large.captured_queries), len(small.captured_queries))
+
+    def test_unknown_role(self):
+        with self.assertRaises(ValueError):
+            import_users([{'username': 'user0', 'role': 'Owner'}])
+        self.assertFalse(User.objects.exists())
@@ -28,7 +28,8 @@ urlpatterns = [
     path('logout/', LogoutView.as_view(template_name='relationship_app/logout.html'), name='logout'),
     
     # Role-based access views
-    path('admin/', admin_view, name='admin-view'),
+    # not admin/, which the project's urls.py gives to the Django admin
+    path('admin-view/', admin_view, name='admin-view'),
     path('librarian/', librarian_view, name='librarian-view'),
     path('member/', member_view, name='member-view'),
     
@@ -0,0 +1,70 @@
+"""
+Bulk user import.
+
+Creating users one by one runs the User post_save signals for every row:
+an INSERT for the user, an INSERT for its profile, and the profile's
+cache update. import_users() instead creates each batch with two
+bulk_create calls, one for the users and one for their profiles, and
+no per-row signals fire.
+"""
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from .models import UserProfile
+
+ROLES = {role for role, _ in UserProfile.ROLE_CHOICES}
+
+
+def build_user(row):
+    """
+    A User for one import row: username, optional email and password.
+    Without a password the account gets an unusable one (set it with a
+    password reset).
+    """
+    return User(
+        username=row['username'],
+        email=row.get('email') or '',
+        password=make_password(row.get('password') or None),
+    )
+
+
+def import_users(rows, batch_size=1000):
+    """
+    Create users and their profiles from an iterable of dicts with
+    'username' and optionally 'email', 'password' and 'role' (default Member).
+
+    Usernames that already exist are skipped. Raises ValueError on an
+    unknown role, before anything in that batch is written.
+    Returns (created, skipped usernames).
+    """
+    rows = iter(rows)
+    created, skipped = 0, []
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return created, skipped
+        for row in batch:
+            role = row.get('role') or 'Member'
+            if role not in ROLES:
+                raise ValueError(f'Unknown role {role!r} for user {row["username"]!r}')
+
+        usernames = [row['username'] for row in batch]
+        taken = set(User.objects.filter(username__in=usernames).values_list('username', flat=True))
+        new_rows, seen = [], set()
+        for row in batch:
+            if row['username'] in taken or row['username'] in seen:
+                skipped.append(row['username'])
+            else:
+                seen.add(row['username'])
+                new_rows.append(row)
+
+        with transaction.atomic():
+            users = User.objects.bulk_create([build_user(row) for row in new_rows])
+            UserProfile.objects.bulk_create([
+                UserProfile(user=user, role=row.get('role') or 'Member')
+                for user, row in zip(users, new_rows)
+            ])
+        created += len(users)
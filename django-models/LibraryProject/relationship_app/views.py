@@ -9,31 +9,118 @@ from django.contrib.auth.views import LoginView as DjangoLoginView, LogoutView a
 from django.views.generic.detail import DetailView
 from django.views.generic.list import ListView
 from django.urls import reverse_lazy
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db.models import Count
 from .models import Library, Book, Author
 from .forms import CustomUserCreationForm
+from .lazy_loads import GuardedTemplateResponse
+from .roles import get_user_role, role_required
 
 # Create your views here.
 def book_list(request):
-    books = Book.objects.all()
-    context = {'books': books}
-    return render(request, 'relationship_app/list_books.html', context)
+    """
+    Paginated book list, ordered by title.
+
+    select_related('author') fetches each book's author in the same query,
+    so a page costs the same number of queries whatever its size
+    (a COUNT for the paginator and one SELECT for the page).
+    The template renders under the lazy load guard, see lazy_loads.py.
+    """
+    books = Book.objects.select_related('author').order_by('title', 'id')
+    paginator = Paginator(books, getattr(settings, 'BOOKS_PER_PAGE', 50))
+    page_obj = paginator.get_page(request.GET.get('page'))
+    context = {'books': page_obj.object_list, 'page_obj': page_obj}
+    return GuardedTemplateResponse(request, 'relationship_app/list_books.html', context)
 
 # backward-compatible alias expected by some exercises/tests
 def list_books(request):
     return book_list(request)
 
 class LibraryListView(ListView):
+    """
+    All libraries with their holdings count and librarian, in one query:
+    Count('books') is annotated and the librarian is joined with
+    select_related('librarian').
+
+    ?ordering= sorts by name (default), -name, holdings or -holdings
+    (largest first).
+    """
     model = Library
     template_name = 'relationship_app/library_list.html'
     context_object_name = 'libraries'
+    response_class = GuardedTemplateResponse
+    orderings = {
+        'name': ('name', 'id'),
+        '-name': ('-name', '-id'),
+        'holdings': ('holdings_count', 'id'),
+        '-holdings': ('-holdings_count', 'id'),
+    }
+
+    def get_ordering(self):
+        return self.orderings.get(self.request.GET.get('ordering'), self.orderings['name'])
+
+    def get_queryset(self):
+        return Library.objects.annotate(holdings_count=Count('books')).select_related('librarian').order_by(
+            *self.get_ordering()
+        )
 
 class LibraryDetailView(DetailView):
+        """
+        A library with one page of its holdings.
+
+        Holdings are paged by book id (keyset): ?after=<id> for the next page,
+        ?before=<id> for the previous one, so any page of a huge branch costs
+        the same. One query loads the library with its holdings count, a
+        second loads the page of books with their authors (LIMIT n + 1).
+        """
         model = Library
         template_name = 'relationship_app/library_detail.html'
         context_object_name = 'library'
+        response_class = GuardedTemplateResponse
+
+        def get_holdings_per_page(self):
+            return getattr(settings, 'HOLDINGS_PER_PAGE', 100)
+
+        def get_cursor(self, name):
+            try:
+                return int(self.request.GET[name])
+            except (KeyError, ValueError):
+                return None
+
+        def get_queryset(self):
+            return Library.objects.annotate(holdings_count=Count('books'))
+
+        def get_holdings_page(self):
+            """
+            One page of books plus one extra row (to tell whether there is
+            another page), read through the through table with a real LIMIT.
+            """
+            books = Book.objects.filter(library=self.object).select_related('author')
+            before = self.get_cursor('before')
+            if before is not None:
+                books = books.filter(id__lt=before).order_by('-id')
+            else:
+                books = books.filter(id__gt=self.get_cursor('after') or 0).order_by('id')
+            return list(books[:self.get_holdings_per_page() + 1])
 
         def get_context_data(self, **kwargs):
             context = super().get_context_data(**kwargs)
+            per_page = self.get_holdings_per_page()
+            holdings = self.get_holdings_page()
+            has_more = len(holdings) > per_page
+            holdings = holdings[:per_page]
+            backwards = self.get_cursor('before') is not None
+            if backwards:
+                holdings.reverse()
+            has_next = backwards or has_more
+            has_previous = has_more if backwards else self.get_cursor('after') is not None
+            context.update({
+                'holdings': holdings,
+                'holdings_count': self.object.holdings_count,
+                'next_after': holdings[-1].id if holdings and has_next else None,
+                'previous_before': holdings[0].id if holdings and has_previous else None,
+            })
             return context
 
 
@@ -78,13 +165,13 @@ class LogoutView(DjangoLogoutView):
 
 # ============ ROLE-BASED ACCESS CONTROL ============
 
-# Helper functions to check user roles
+# Helper functions to check user roles (cached, see roles.py)
 def is_admin(user):
     """
     Check if user is authenticated and has 'Admin' role.
     Returns True if user is an Admin, False otherwise.
     """
-    return user.is_authenticated and hasattr(user, 'profile') and user.profile.role == 'Admin'
+    return get_user_role(user) == 'Admin'
 
 
 def is_librarian(user):
@@ -92,7 +179,7 @@ def is_librarian(user):
     Check if user is authenticated and has 'Librarian' role.
     Returns True if user is a Librarian, False otherwise.
     """
-    return user.is_authenticated and hasattr(user, 'profile') and user.profile.role == 'Librarian'
+    return get_user_role(user) == 'Librarian'
 
 
 def is_member(user):
@@ -100,12 +187,12 @@ def is_member(user):
     Check if user is authenticated and has 'Member' role.
     Returns True if user is a Member, False otherwise.
     """
-    return user.is_authenticated and hasattr(user, 'profile') and user.profile.role == 'Member'
+    return get_user_role(user) == 'Member'
 
 
 # ============ ADMIN VIEW ============
 
-@user_passes_test(is_admin)
+@role_required('Admin')
 def admin_view(request):
     """
     Admin-only view: restricted to users with 'Admin' role.
@@ -115,14 +202,14 @@ def admin_view(request):
     """
     context = {
         'message': 'Welcome Admin! You have full access to all features.',
-        'role': request.user.profile.role,
+        'role': get_user_role(request.user),
     }
     return render(request, 'relationship_app/admin_view.html', context)
 
 
 # ============ LIBRARIAN VIEW ============
 
-@user_passes_test(is_librarian)
+@role_required('Librarian')
 def librarian_view(request):
     """
     Librarian-only view: restricted to users with 'Librarian' role.
@@ -132,14 +219,14 @@ def librarian_view(request):
     """
     context = {
         'message': 'Welcome Librarian! You can manage library and books.',
-        'role': request.user.profile.role,
+        'role': get_user_role(request.user),
     }
     return render(request, 'relationship_app/librarian_view.html', context)
 
 
 # ============ MEMBER VIEW ============
 
-@user_passes_test(is_member)
+@role_required('Member')
 def member_view(request):
     """
     Member-only view: restricted to users with 'Member' role.
@@ -149,7 +236,7 @@ def member_view(request):
     """
     context = {
         'message': 'Welcome Member! You have read-only access to library resources.',
-        'role': request.user.profile.role,
+        'role': get_user_role(request.user),
     }
     return render(request, 'relationship_app/member_view.html', context)
 
@@ -10,11 +10,16 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import sys
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# the shared apps at the repository root (request_metrics)
+if str(BASE_DIR.parent) not in sys.path:
+    sys.path.append(str(BASE_DIR.parent))
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
@@ -28,6 +33,18 @@ DEBUG = True
 ALLOWED_HOSTS = []
 
 
+# Lazy foreign key loads in guarded templates raise instead of running a
+# query per row (relationship_app/lazy_loads.py): on in DEBUG and test runs
+LAZY_LOAD_GUARD = DEBUG or sys.argv[1:2] == ['test']
+
+# Page size of the book list, and of a library's holdings
+BOOKS_PER_PAGE = 50
+HOLDINGS_PER_PAGE = 100
+
+# Seconds a user's role stays cached (relationship_app/roles.py)
+ROLE_CACHE_TIMEOUT = 300
+
+
 # Application definition
 
 INSTALLED_APPS = [
@@ -39,9 +56,12 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'LibraryProject.bookshelf',
     'LibraryProject.relationship_app.apps.RelationshipAppConfig',
+    'request_metrics',
 ]
 
 MIDDLEWARE = [
+    # first, so its timings cover every other middleware too
+    'request_metrics.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -63,6 +83,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'LibraryProject.relationship_app.context_processors.role',
             ],
         },
     },
@@ -19,5 +19,6 @@ from django.urls import path, include
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('metrics/', include('request_metrics.urls')),
     path('', include('LibraryProject.relationship_app.urls')),
 ]
@@ -0,0 +1,81 @@
+'''
+GET /library/ with every library's holdings count and librarian: the
+annotated, select_related list (one query) next to the per-row lookups
+it replaces (1 + 2N queries).
+
+    python benchmarks/bench_library_list.py --libraries 10000 --books-per-library 20
+'''
+import argparse
+
+from common import Timer, median, setup_django
+
+
+def seed(libraries, books_per_library, batch_size=5000):
+    from LibraryProject.relationship_app.models import Author, Book, Librarian, Library
+
+    author = Author.objects.create(name='Author')
+    books = Book.objects.bulk_create(
+        [Book(title=f'Book {i}', author=author) for i in range(books_per_library * 10)], batch_size=batch_size
+    )
+    created = Library.objects.bulk_create(
+        [Library(name=f'Library {i:05d}') for i in range(libraries)], batch_size=batch_size
+    )
+    Librarian.objects.bulk_create(
+        [Librarian(name=f'Librarian {i}', library=library) for i, library in enumerate(created)], batch_size=batch_size
+    )
+    # library i holds a window of the books, so holdings overlap
+    Through = Library.books.through
+    Through.objects.bulk_create(
+        [
+            Through(library_id=library.id, book_id=books[(i + j) % len(books)].id)
+            for i, library in enumerate(created)
+            for j in range(books_per_library)
+        ],
+        batch_size=batch_size,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--libraries', type=int, default=10_000)
+    parser.add_argument('--books-per-library', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection
+    from django.test import Client
+    from LibraryProject.relationship_app.models import Library
+
+    seed(args.libraries, args.books_per_library)
+
+    def per_row():
+        # what the template cost when it asked each library for its count and librarian
+        return [
+            (library.name, library.books.count(), getattr(library, 'librarian', None) and str(library.librarian))
+            for library in Library.objects.all()
+        ]
+
+    client = Client()
+    cases = [
+        ('per-row lookups', per_row),
+        ('GET /library/', lambda: client.get('/library/')),
+        ('GET /library/?ordering=-holdings', lambda: client.get('/library/?ordering=-holdings')),
+    ]
+    print(f'{args.libraries} libraries, {args.books_per_library} books each')
+    print(f'{"":<34} {"queries":>8} {"median ms":>10}')
+    for label, fn in cases:
+        # counted with a wrapper: the query log is capped, and reset by each request
+        queries = []
+        with connection.execute_wrapper(lambda execute, *a: queries.append(1) or execute(*a)):
+            fn()
+        samples = []
+        for _ in range(args.repeat):
+            with Timer() as t:
+                fn()
+            samples.append(t.ms)
+        print(f'{label:<34} {len(queries):>8} {median(samples):>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+'''
+logins per second through POST /login/, with the old save_user_profile
+(re-saves the profile on every User save, so on every last_login update)
+and with the current one (writes the profile only when it changed).
+passwords use the MD5 hasher so the numbers measure the queries, not PBKDF2.
+users are created with import_users(), which also gets timed.
+
+    python benchmarks/bench_logins.py --users 2000 --logins 2000
+'''
+import argparse
+
+from common import Timer, setup_django
+
+PASSWORD = 'bench-pass-123'
+
+
+def legacy_save_user_profile(sender, instance, **kwargs):
+    # the handler before dirty-field tracking
+    if hasattr(instance, 'profile'):
+        instance.profile.save()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=2000)
+    parser.add_argument('--logins', type=int, default=2000)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    settings.PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+    from django.contrib.auth.models import User
+    from django.db import connection
+    from django.db.models.signals import post_save
+    from django.test import Client
+    from LibraryProject.relationship_app.models import save_user_profile
+    from LibraryProject.relationship_app.user_import import import_users
+
+    with Timer() as t:
+        import_users({'username': f'user{i}', 'password': PASSWORD} for i in range(args.users))
+    print(f'import_users: {args.users} users in {t.ms:.0f} ms')
+
+    def run(label):
+        client = Client()
+        queries = []
+        with connection.execute_wrapper(lambda execute, *a: queries.append(1) or execute(*a)):
+            with Timer() as t:
+                for i in range(args.logins):
+                    response = client.post('/login/', {'username': f'user{i % args.users}', 'password': PASSWORD})
+                    assert response.status_code == 302, response.status_code
+        print(f'{label:<28} {args.logins / (t.ms / 1000):>10.0f} {len(queries) / args.logins:>14.1f}')
+
+    print(f'{"":<28} {"logins/s":>10} {"queries/login":>14}')
+    post_save.disconnect(save_user_profile, sender=User)
+    post_save.connect(legacy_save_user_profile, sender=User)
+    run('before (always re-save)')
+    post_save.disconnect(legacy_save_user_profile, sender=User)
+    post_save.connect(save_user_profile, sender=User)
+    run('after (dirty fields only)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+'''
+shared helpers for the benchmark scripts in this folder.
+
+every script runs against a throwaway sqlite file (never db.sqlite3),
+so run them from the django-models folder, e.g.:
+
+    python benchmarks/bench_library_list.py --libraries 10000
+'''
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup_django(db_path=None):
+    '''
+    point django at a fresh sqlite database and run the migrations.
+    returns the path of the database file.
+    '''
+    if str(PROJECT_DIR) not in sys.path:
+        sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'LibraryProject.settings')
+
+    if db_path is None:
+        db_path = os.path.join(tempfile.mkdtemp(prefix='library-bench-'), 'bench.sqlite3')
+
+    from django.conf import settings
+    settings.DATABASES['default']['NAME'] = db_path
+    settings.DEBUG = False
+    settings.LAZY_LOAD_GUARD = False
+    settings.ALLOWED_HOSTS = ['*']
+
+    import django
+    django.setup()
+
+    from django.core.management import call_command
+    from django.test.utils import setup_test_environment
+    setup_test_environment()
+    call_command('migrate', verbosity=0)
+    return db_path
+
+
+class Timer:
+    '''
+    context manager that records elapsed wall time in milliseconds.
+    '''
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.ms = (time.perf_counter() - self.start) * 1000
+
+
+def median(samples):
+    ordered = sorted(samples)
+    return ordered[len(ordered) // 2] if ordered else 0.0
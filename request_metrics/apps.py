@@ -0,0 +1,17 @@
+from django.apps import AppConfig
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+
+class RequestMetricsConfig(AppConfig):
+    name = 'request_metrics'
+    verbose_name = 'Request metrics'
+
+    def ready(self):
+        from .collector import install
+
+        # every database connection, in every thread, reports its queries
+        # to the request that is running (if any)
+        connection_created.connect(install, dispatch_uid='request_metrics_install')
+        for connection in connections.all(initialized_only=True):
+            install(connection=connection)
@@ -0,0 +1,59 @@
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+# the collector of the request being handled; contextvars follow the request
+# into sync_to_async threads, so queries made there are counted too
+current = ContextVar('request_metrics_collector', default=None)
+
+IN_LIST = re.compile(r'\(\s*%s(?:\s*,\s*%s)*\s*\)')
+LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+
+
+def sql_shape(sql):
+    '''
+    the query with its values taken out, so the same query for different
+    rows (or IN lists of different lengths) has one shape
+    '''
+    return LITERAL.sub('?', IN_LIST.sub('(...)', sql))
+
+
+class Collector:
+    '''
+    queries, DB time and SQL shapes for one request
+    '''
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.shapes = Counter()
+
+    def record(self, sql, duration):
+        self.queries += 1
+        self.db_time += duration
+        self.shapes[sql_shape(sql)] += 1
+
+    def repeated(self, threshold):
+        '''
+        (shape, count) for every shape run more than `threshold` times
+        '''
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+
+
+def record_query(execute, sql, params, many, context):
+    collector = current.get()
+    if collector is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        collector.record(sql, time.perf_counter() - start)
+
+
+def install(sender=None, connection=None, **kwargs):
+    # first, not last: the connection may open inside a caller's
+    # `with connection.execute_wrapper(...)`, whose exit pops the last one
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, record_query)
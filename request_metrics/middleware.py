@@ -0,0 +1,92 @@
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .collector import Collector, current
+from .store import store
+
+logger = logging.getLogger('request_metrics')
+
+
+class RequestMetricsMiddleware:
+    '''
+    times each request and counts its queries, then
+
+    - adds a Server-Timing header (db, view, render, total), readable in
+      the browser's network panel
+    - flags N+1 patterns: the same SQL shape run more than
+      REQUEST_METRICS_N_PLUS_ONE_THRESHOLD times (default 5) is logged as
+      a warning and listed in X-N-Plus-One
+    - adds the numbers to the per-URL-name totals served by
+      request_metrics.views.metrics
+
+    "view" is the time until the view returned its response; "render" is
+    the rendering of template/DRF responses after that. put it first in
+    MIDDLEWARE so "total" covers the other middleware too.
+    works for sync and async views.
+    '''
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.threshold = getattr(settings, 'REQUEST_METRICS_N_PLUS_ONE_THRESHOLD', 5)
+        self.server_timing = getattr(settings, 'REQUEST_METRICS_SERVER_TIMING', True)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        collector, token, start = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            current.reset(token)
+        return self.finish(request, response, collector, start)
+
+    async def __acall__(self, request):
+        collector, token, start = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current.reset(token)
+        return self.finish(request, response, collector, start)
+
+    def start(self, request):
+        collector = Collector()
+        request._metrics_view_end = None
+        return collector, current.set(collector), time.perf_counter()
+
+    def process_template_response(self, request, response):
+        # the view has returned; what follows until we get the response back is rendering
+        request._metrics_view_end = time.perf_counter()
+        return response
+
+    def finish(self, request, response, collector, start):
+        end = time.perf_counter()
+        view_end = request._metrics_view_end or end
+        total_ms = (end - start) * 1000
+        view_ms = (view_end - start) * 1000
+        render_ms = (end - view_end) * 1000
+        db_ms = collector.db_time * 1000
+        repeated = collector.repeated(self.threshold)
+
+        match = getattr(request, 'resolver_match', None)
+        url_name = (match.view_name if match else None) or '<unresolved>'
+        store.add(url_name, collector.queries, db_ms, view_ms, render_ms, total_ms, repeated)
+
+        if repeated:
+            logger.warning(
+                'possible N+1 in %s: %s', url_name,
+                '; '.join(f'{count}x {shape[:200]}' for shape, count in repeated),
+            )
+            response['X-N-Plus-One'] = ', '.join(str(count) for _, count in repeated)
+        if self.server_timing:
+            response['Server-Timing'] = (
+                f'db;dur={db_ms:.1f};desc="{collector.queries} queries", '
+                f'view;dur={view_ms:.1f}, render;dur={render_ms:.1f}, total;dur={total_ms:.1f}'
+            )
+        return response
@@ -0,0 +1,59 @@
+import threading
+from collections import defaultdict, deque
+
+FIELDS = ('requests', 'queries', 'db_ms', 'view_ms', 'render_ms', 'total_ms', 'n_plus_one')
+
+
+class MetricsStore:
+    '''
+    running totals per URL name, in process memory (each worker process
+    has its own), plus the last few N+1 shapes seen for each
+    '''
+    samples = 5
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self.lock:
+            self.totals = defaultdict(lambda: dict.fromkeys(FIELDS, 0))
+            self.max_total_ms = defaultdict(float)
+            self.n_plus_one_samples = defaultdict(lambda: deque(maxlen=self.samples))
+
+    def add(self, url_name, queries, db_ms, view_ms, render_ms, total_ms, repeated):
+        with self.lock:
+            totals = self.totals[url_name]
+            totals['requests'] += 1
+            totals['queries'] += queries
+            totals['db_ms'] += db_ms
+            totals['view_ms'] += view_ms
+            totals['render_ms'] += render_ms
+            totals['total_ms'] += total_ms
+            self.max_total_ms[url_name] = max(self.max_total_ms[url_name], total_ms)
+            if repeated:
+                totals['n_plus_one'] += 1
+                self.n_plus_one_samples[url_name].extend(
+                    {'sql': shape, 'count': count} for shape, count in repeated
+                )
+
+    def snapshot(self):
+        '''
+        {url name: totals, per-request averages, max time and N+1 samples}
+        '''
+        with self.lock:
+            result = {}
+            for url_name, totals in self.totals.items():
+                requests = totals['requests']
+                result[url_name] = dict(
+                    totals,
+                    avg_queries=totals['queries'] / requests,
+                    avg_db_ms=totals['db_ms'] / requests,
+                    avg_total_ms=totals['total_ms'] / requests,
+                    max_total_ms=self.max_total_ms[url_name],
+                    n_plus_one_samples=list(self.n_plus_one_samples[url_name]),
+                )
+            return result
+
+
+store = MetricsStore()
@@ -0,0 +1,115 @@
+import json
+import threading
+from django.contrib.auth.models import Group, User
+from django.http import HttpResponse
+from django.template import engines
+from django.template.response import TemplateResponse
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import path, include
+from .collector import record_query, sql_shape
+from .store import store
+
+
+def n_plus_one(request):
+    groups = [list(user.groups.all()) for user in User.objects.all()]
+    return HttpResponse(str(len(groups)))
+
+
+def one_query(request):
+    return HttpResponse(str(User.objects.count()))
+
+
+def rendered(request):
+    # the queryset is only evaluated while the template renders
+    template = engines['django'].from_string('{% for user in users %}{{ user.username }} {% endfor %}')
+    return TemplateResponse(request, template, {'users': User.objects.all()})
+
+
+async def async_view(request):
+    return HttpResponse(str(await User.objects.acount()))
+
+
+urlpatterns = [
+    path('n-plus-one/', n_plus_one, name='n-plus-one'),
+    path('one-query/', one_query, name='one-query'),
+    path('rendered/', rendered, name='rendered'),
+    path('async/', async_view, name='async'),
+    path('metrics/', include('request_metrics.urls')),
+]
+
+
+@override_settings(ROOT_URLCONF='request_metrics.tests', REQUEST_METRICS_N_PLUS_ONE_THRESHOLD=3)
+class RequestMetricsTests(TestCase):
+
+    def setUp(self):
+        store.clear()
+        group = Group.objects.create(name='readers')
+        for i in range(5):
+            User.objects.create(username=f'user{i}').groups.add(group)
+
+    def test_server_timing_and_totals(self):
+        response = self.client.get('/one-query/')
+        self.assertIn('db;dur=', response['Server-Timing'])
+        self.assertIn('desc="1 queries"', response['Server-Timing'])
+        self.assertNotIn('X-N-Plus-One', response)
+        self.client.get('/one-query/')
+        metrics = store.snapshot()['one-query']
+        self.assertEqual((metrics['requests'], metrics['queries'], metrics['n_plus_one']), (2, 2, 0))
+
+    def test_flags_n_plus_one(self):
+        with self.assertLogs('request_metrics', 'WARNING') as logs:
+            response = self.client.get('/n-plus-one/')
+        self.assertEqual(response['X-N-Plus-One'], '5')
+        self.assertIn('n-plus-one', logs.output[0])
+        metrics = store.snapshot()['n-plus-one']
+        self.assertEqual((metrics['queries'], metrics['n_plus_one']), (6, 1))
+        self.assertEqual(metrics['n_plus_one_samples'][0]['count'], 5)
+
+    def test_render_time_is_separate(self):
+        response = self.client.get('/rendered/')
+        self.assertIn('render;dur=', response['Server-Timing'])
+        self.assertGreater(store.snapshot()['rendered']['render_ms'], 0)
+
+    def test_async_view_queries_are_counted(self):
+        self.client.get('/async/')
+        self.assertEqual(store.snapshot()['async']['queries'], 1)
+
+    def test_json_and_prometheus_endpoint(self):
+        self.client.get('/one-query/')
+        data = json.loads(self.client.get('/metrics/').content)
+        self.assertEqual(data['one-query']['requests'], 1)
+        text = self.client.get('/metrics/?format=prometheus').content.decode()
+        self.assertIn('request_metrics_queries_total{url_name="one-query"} 1', text)
+        self.assertIn('# TYPE request_metrics_duration_seconds_total counter', text)
+
+    def test_endpoint_is_local_only(self):
+        self.assertEqual(self.client.get('/metrics/', REMOTE_ADDR='10.1.2.3').status_code, 403)
+
+    def test_connection_opened_inside_execute_wrapper(self):
+        # a thread's connection opens inside the block; leaving it must
+        # remove the caller's wrapper, not the collector's
+        def mine(execute, *args):
+            return execute(*args)
+
+        wrappers = []
+
+        def run():
+            try:
+                # no table: the test's transaction may hold a lock on them
+                with connection.execute_wrapper(mine), connection.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+                wrappers.extend(connection.execute_wrappers)
+            finally:
+                connection.close()
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join()
+        self.assertEqual(wrappers, [record_query])
+
+    def test_sql_shape(self):
+        self.assertEqual(
+            sql_shape("SELECT * FROM t WHERE id IN (%s, %s, %s) AND name = 'x' LIMIT 21"),
+            sql_shape("SELECT * FROM t WHERE id IN (%s) AND name = 'y' LIMIT 21"),
+        )
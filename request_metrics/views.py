@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden, JsonResponse
+
+from .store import store
+
+# prometheus name, help text, totals key, scale (ms -> s)
+PROMETHEUS_COUNTERS = [
+    ('requests_total', 'Requests handled.', 'requests', 1),
+    ('queries_total', 'Database queries run.', 'queries', 1),
+    ('db_seconds_total', 'Time spent in database queries.', 'db_ms', 1000),
+    ('view_seconds_total', 'Time until the view returned.', 'view_ms', 1000),
+    ('render_seconds_total', 'Time rendering template/DRF responses.', 'render_ms', 1000),
+    ('duration_seconds_total', 'Total request time.', 'total_ms', 1000),
+    ('n_plus_one_total', 'Requests with a repeated SQL shape (possible N+1).', 'n_plus_one', 1),
+]
+
+
+def prometheus_text(snapshot):
+    lines = []
+    for name, help_text, key, scale in PROMETHEUS_COUNTERS:
+        lines.append(f'# HELP request_metrics_{name} {help_text}')
+        lines.append(f'# TYPE request_metrics_{name} counter')
+        for url_name, metrics in sorted(snapshot.items()):
+            label = url_name.replace('\\', '\\\\').replace('"', '\\"')
+            lines.append(f'request_metrics_{name}{{url_name="{label}"}} {metrics[key] / scale:g}')
+    return '\n'.join(lines) + '\n'
+
+
+def metrics(request):
+    '''
+    the per-URL-name totals, as JSON or (?format=prometheus, or an Accept
+    header asking for text/plain) Prometheus text.
+    only answers REQUEST_METRICS_ALLOWED_IPS (loopback by default).
+    '''
+    allowed = getattr(settings, 'REQUEST_METRICS_ALLOWED_IPS', ['127.0.0.1', '::1'])
+    if request.META.get('REMOTE_ADDR') not in allowed:
+        return HttpResponseForbidden()
+
+    snapshot = store.snapshot()
+    wants_text = 'text/plain' in request.headers.get('Accept', '')
+    if request.GET.get('format') == 'prometheus' or wants_text:
+        return HttpResponse(prometheus_text(snapshot), content_type='text/plain; version=0.0.4')
+    return JsonResponse(snapshot)